@@ -0,0 +1,256 @@
+"""Microbenchmarks of the orchestrator hot path, from request validation to the response, at up to 100k rows.
+
+The model is replaced by an in-process stub provider, and the MLflow provider sends its requests to an in-memory
+transport, so only the work of the orchestrator is measured. Each benchmark is repeated for at least `--min-time`
+seconds per batch size. The report gives its median latency and throughput, and the median number of memory blocks
+one call allocated and did not free, its result and its cyclic garbage included, counted by comparing tracemalloc
+snapshots taken before and after the call with the garbage collector disabled. Run from the orchestrator directory:
+
+Usage: python perf/bench_hot_path.py [--batch-sizes 1 10 100 1000 10000 100000] [--min-time 0.5]
+    [--benchmarks request_validation predict_price ...] [--output results.json]
+"""
+
+import argparse
+import asyncio
+from dataclasses import asdict, dataclass
+import gc
+import json
+import pathlib
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Optional, Sequence
+import httpx
+import pandas as pd
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+from provider.mlflow_model_provider import AsyncMLFlowModelProvider
+from provider.model_provider import AsyncModelProvider
+from service.pricing_service import AsyncPricingService
+from shared.view.mlflow_view import DataFrameSplit, MLFlowPredictionsView
+from shared.view.request_view import PricePredictionBatchRequest, PricePredictionRequest
+from shared.view.response_view import PricePredictionBatchResponseView, PricePredictionResponseView
+
+PAYLOAD = pathlib.Path(__file__).parent / 'payloads' / 'price_prediction_request.json'
+DEFAULT_BATCH_SIZES = (1, 10, 100, 1_000, 10_000, 100_000)
+PREDICTED_PRICE = 181_500.0
+MIN_ROUNDS = 5
+ALLOCATION_ROUNDS = 5
+
+Call = Callable[[], Awaitable[object]]
+
+
+class StubModelProvider:
+    """In-process stand-in for the pricing model, predicting the same price for every row without any I/O."""
+
+    model_version: Optional[str] = None
+
+    async def health(self) -> bool:
+        return True
+
+    async def predict(self, data: pd.DataFrame | DataFrameSplit) -> MLFlowPredictionsView:
+        return MLFlowPredictionsView(predictions=[PREDICTED_PRICE] * len(data))
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings and allocations of a benchmark at a batch size."""
+
+    name: str
+    rows: int
+    timings: list[float]
+    """Duration of every timed call, in seconds."""
+
+    allocations: int
+    """Median number of memory blocks allocated by one call and not freed once it returned."""
+
+    @property
+    def median_ms(self) -> float:
+        return statistics.median(self.timings) * 1000
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / statistics.median(self.timings)
+
+
+def sample_requests(batch_size: int) -> list[PricePredictionRequest]:
+    """Builds `batch_size` copies of the sample request, with distinct ids."""
+
+    request = PricePredictionRequest.model_validate_json(PAYLOAD.read_text())
+    return [request.model_copy(update={'id': id}) for id in range(1, batch_size + 1)]
+
+
+def _mock_model_client(batch_size: int) -> httpx.AsyncClient:
+    """Builds an HTTP client answering every model call with `batch_size` predictions, without any network I/O."""
+
+    body = json.dumps({'predictions': [PREDICTED_PRICE] * batch_size}).encode()
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    return httpx.AsyncClient(transport=transport)
+
+
+async def request_validation(batch_size: int, provider: AsyncModelProvider) -> Call:
+    """Validates the JSON body of a batch request, as the batch endpoint does."""
+
+    body = PricePredictionBatchRequest(data=sample_requests(batch_size)).model_dump_json().encode()
+
+    async def call() -> object:
+        return PricePredictionBatchRequest.model_validate_json(body)
+
+    return call
+
+
+async def predict_price(batch_size: int, provider: AsyncModelProvider) -> Call:
+    """Predicts `batch_size` concurrent single requests with `PricingService.predict_price`."""
+
+    service = AsyncPricingService(provider)
+    requests = sample_requests(batch_size)
+
+    async def call() -> object:
+        return await asyncio.gather(*(service.predict_price(request) for request in requests))
+
+    return call
+
+
+async def predict_price_batch(batch_size: int, provider: AsyncModelProvider) -> Call:
+    """Predicts a batch request with `PricingService.predict_price_batch`."""
+
+    service = AsyncPricingService(provider)
+    batch_request = PricePredictionBatchRequest(data=sample_requests(batch_size))
+
+    async def call() -> object:
+        return await service.predict_price_batch(batch_request)
+
+    return call
+
+
+async def mlflow_provider(batch_size: int, provider: AsyncModelProvider) -> Call:
+    """Encodes a batch into an MLflow `dataframe_split` payload and decodes its predictions with
+    `MLFlowModelProvider.predict`."""
+
+    mlflow = AsyncMLFlowModelProvider('http://model', _mock_model_client(batch_size))
+    input_data = DataFrameSplit.from_views(sample_requests(batch_size))
+
+    async def call() -> object:
+        return await mlflow.predict(input_data)
+
+    return call
+
+
+async def response_view(batch_size: int, provider: AsyncModelProvider) -> Call:
+    """Builds and serializes the response of the batch endpoint."""
+
+    predictions = [(id, PREDICTED_PRICE) for id in range(1, batch_size + 1)]
+
+    async def call() -> object:
+        view = PricePredictionBatchResponseView(
+            predictions=[PricePredictionResponseView(id=id, predicted_price=price) for id, price in predictions]
+        )
+        return view.model_dump_json(by_alias=True)
+
+    return call
+
+
+BENCHMARKS: dict[str, Callable[[int, AsyncModelProvider], Awaitable[Call]]] = {
+    'request_validation': request_validation,
+    'predict_price': predict_price,
+    'predict_price_batch': predict_price_batch,
+    'mlflow_provider': mlflow_provider,
+    'response_view': response_view,
+}
+
+
+async def _time_calls(call: Call, min_time: float) -> list[float]:
+    """Times calls, after a warm up call, for at least `min_time` seconds and `MIN_ROUNDS` calls."""
+
+    await call()
+    timings = []
+    deadline = time.perf_counter() + min_time
+    while len(timings) < MIN_ROUNDS or time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await call()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def _measure_allocations(call: Call) -> int:
+    """Counts the memory blocks allocated by a call and not freed once it returned, its result included, as the
+    median of `ALLOCATION_ROUNDS` calls."""
+
+    counts = []
+    # Collections would free the garbage of earlier calls while a call runs, and offset its own blocks
+    gc.disable()
+    tracemalloc.start()
+    try:
+        for _ in range(ALLOCATION_ROUNDS):
+            gc.collect()
+            before = tracemalloc.take_snapshot()
+            result = await call()
+            after = tracemalloc.take_snapshot()
+            counts.append(sum(stat.count_diff for stat in after.compare_to(before, 'filename')))
+            del result
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    return int(statistics.median(counts))
+
+
+async def run_benchmarks(
+    names: Sequence[str],
+    batch_sizes: Sequence[int],
+    min_time: float,
+    provider: Optional[AsyncModelProvider] = None,
+    measure_allocations: bool = True,
+) -> list[BenchmarkResult]:
+    """Runs benchmarks at every batch size.
+
+    Args:
+        names: The names of the benchmarks to run, keys of `BENCHMARKS`.
+        batch_sizes: The batch sizes to run every benchmark at.
+        min_time: The minimum number of seconds to repeat every benchmark for, per batch size.
+        provider: The provider called by the pricing service benchmarks, an in-process stub provider by default.
+        measure_allocations: Whether to measure the allocations of every benchmark.
+
+    Returns:
+        The result of every benchmark at every batch size.
+    """
+
+    provider = provider or StubModelProvider()
+    results = []
+    for name in names:
+        for batch_size in batch_sizes:
+            call = await BENCHMARKS[name](batch_size, provider)
+            timings = await _time_calls(call, min_time)
+            allocations = await _measure_allocations(call) if measure_allocations else 0
+            results.append(BenchmarkResult(name, batch_size, timings, allocations))
+    return results
+
+
+def print_results(results: Sequence[BenchmarkResult]) -> None:
+    """Prints a summary table of benchmark results."""
+
+    print(f'{"benchmark":<22}{"rows":>8}{"calls":>7}{"p50 ms":>12}{"rows/s":>14}{"allocs/call":>13}')
+    for result in results:
+        print(
+            f'{result.name:<22}{result.rows:>8}{len(result.timings):>7}{result.median_ms:>12.3f}'
+            f'{result.rows_per_second:>14.0f}{result.allocations:>13}'
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=list(DEFAULT_BATCH_SIZES))
+    parser.add_argument('--min-time', type=float, default=0.5)
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument('--output', type=pathlib.Path, help='Optional JSON file to write the results to.')
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmarks(args.benchmarks, args.batch_sizes, args.min_time))
+    print_results(results)
+    if args.output is not None:
+        args.output.write_text(json.dumps([asdict(result) for result in results], indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Compares the latency of scoring batches with the MLflow JSON protocol and the V2 REST and gRPC protocols.
+
+The stub model server is started in a separate process, so encoding and decoding costs are measured on both sides of
+each call. Run from the orchestrator directory:
+
+Usage: python perf/bench_v2_protocol.py [--batch-sizes 10 100 1000 10000] [--iterations 20]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import pathlib
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Sequence
+import httpx
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+from provider.mlflow_model_provider import AsyncMLFlowModelProvider
+from provider.model_provider import AsyncModelProvider
+from provider.v2_model_provider import AsyncV2GrpcModelProvider, AsyncV2ModelProvider
+from shared.view.mlflow_view import DataFrameSplit
+from shared.view.request_view import PricePredictionRequest
+from shared.view.v2_view import v2_datatypes
+
+PAYLOAD = pathlib.Path(__file__).parent / 'payloads' / 'price_prediction_request.json'
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _input_data(batch_size: int) -> DataFrameSplit:
+    """Builds a model input of `batch_size` copies of the sample request, with distinct ids."""
+
+    request = PricePredictionRequest.model_validate(json.loads(PAYLOAD.read_text()))
+    return DataFrameSplit.from_views([request.model_copy(update={'id': id}) for id in range(1, batch_size + 1)])
+
+
+async def _time_calls(provider: AsyncModelProvider, input_data: DataFrameSplit, iterations: int) -> list[float]:
+    """Times sequential predictions, after a warm up call, in milliseconds."""
+
+    await provider.predict(input_data)
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await provider.predict(input_data)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def run(batch_sizes: Sequence[int], iterations: int, http_port: int, grpc_port: int) -> None:
+    """Runs the benchmark against a stub server listening on the given ports and prints a summary table."""
+
+    datatypes = v2_datatypes(PricePredictionRequest)
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        base_url = f'http://127.0.0.1:{http_port}'
+        grpc_provider = AsyncV2GrpcModelProvider(f'127.0.0.1:{grpc_port}', 'mlflow-model', datatypes=datatypes)
+        providers: dict[str, Any] = {
+            'mlflow-json': AsyncMLFlowModelProvider(base_url, client),
+            'v2-rest-json': AsyncV2ModelProvider(base_url, 'mlflow-model', client, datatypes=datatypes),
+            'v2-rest-binary': AsyncV2ModelProvider(
+                base_url, 'mlflow-model', client, datatypes=datatypes, binary_data=True
+            ),
+            'v2-grpc': grpc_provider,
+        }
+
+        for _ in range(50):
+            if await providers['mlflow-json'].health() and await grpc_provider.health():
+                break
+            await asyncio.sleep(0.1)
+
+        print(f'{"protocol":<16}{"rows":>8}{"p50 ms":>10}{"mean ms":>10}{"rows/s":>12}')
+        for batch_size in batch_sizes:
+            input_data = _input_data(batch_size)
+            for name, provider in providers.items():
+                timings = await _time_calls(provider, input_data, iterations)
+                mean = statistics.fmean(timings)
+                print(
+                    f'{name:<16}{batch_size:>8}{statistics.median(timings):>10.2f}{mean:>10.2f}'
+                    f'{batch_size / mean * 1000:>12.0f}'
+                )
+        await grpc_provider.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    http_port, grpc_port = _free_port(), _free_port()
+    stub_server = pathlib.Path(__file__).parent / 'v2_stub_server.py'
+    env = os.environ | {'PYTHONPATH': str(pathlib.Path(__file__).resolve().parents[1] / 'src')}
+    server = subprocess.Popen(
+        [sys.executable, str(stub_server), '--http-port', str(http_port), '--grpc-port', str(grpc_port)], env=env
+    )
+    try:
+        asyncio.run(run(args.batch_sizes, args.iterations, http_port, grpc_port))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+"""Load generator driving the single or batch prediction endpoint of a running orchestrator.
+
+Requests are built from recorded payloads: a JSON file holding one PricePredictionRequest or a list of them, or a JSON
+lines file with one per line, the sample payload by default. Payloads are replayed in order, looping over the file, and
+with `--mutate` their areas are scaled by a random factor and their ids made unique, so that repeated payloads are not
+answered from the prediction cache. A batch request takes the next `--batch-size` payloads.
+
+With `--concurrency` alone, the load is closed-loop: each of the concurrent clients sends its next request as soon as
+the previous one is answered. With `--rate`, requests are started at a fixed rate, at most `--concurrency` at a time,
+and their latency is measured from the time they were due, so a slow server is not hidden by requests sent late.
+Requests of the first `--warmup` seconds are not reported. The report gives the latency percentiles, the throughput
+and the errors, by status code or exception, and `--output` writes it to a JSON file for comparison between runs.
+
+Usage: python perf/load_test.py [--url http://localhost:8000] [--endpoint single|batch] [--batch-size 100]
+    [--concurrency 10] [--rate 200] [--duration 30] [--warmup 5] [--payloads requests.jsonl] [--mutate] [--seed N]
+    [--timeout 10] [--output results.json]
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import itertools
+import json
+import math
+import pathlib
+import random
+import time
+from typing import Any, Iterator, Optional, Sequence
+import httpx
+
+PAYLOAD = pathlib.Path(__file__).parent / 'payloads' / 'price_prediction_request.json'
+ENDPOINTS = {'single': '/api/v1/price/predict', 'batch': '/api/v1/price/predict/batch'}
+PERCENTILES = {'p50': 50.0, 'p90': 90.0, 'p99': 99.0, 'p99.9': 99.9}
+
+MUTATED_FIELDS = (
+    'lot_frontage',
+    'lot_area',
+    'bsmt_fin_sf_1',
+    'bsmt_fin_sf_2',
+    'bsmt_unf_sf',
+    'total_bsmt_sf',
+    'first_flr_sf',
+    'second_flr_sf',
+    'gr_liv_area',
+    'garage_area',
+    'wood_deck_sf',
+    'open_porch_sf',
+)
+"""Fields without an upper bound, which can be scaled without making the request invalid."""
+
+
+@dataclass
+class LoadTestResult:
+    """Outcome of the requests sent during the measured part of a load test."""
+
+    duration_seconds: float
+    latencies_ms: list[float] = field(default_factory=list)
+    """Latency of every successful request, in milliseconds."""
+
+    rows: int = 0
+    """Number of housing units predicted by the successful requests."""
+
+    errors: dict[str, int] = field(default_factory=dict)
+    """Number of failed requests, by status code or exception name."""
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies_ms) + sum(self.errors.values())
+
+    def percentile_ms(self, percent: float) -> Optional[float]:
+        """Computes a latency percentile with the nearest-rank method, or None if no request succeeded."""
+
+        if not self.latencies_ms:
+            return None
+        latencies = sorted(self.latencies_ms)
+        return latencies[max(math.ceil(percent / 100 * len(latencies)) - 1, 0)]
+
+    def summary(self) -> dict[str, Any]:
+        """Summarizes the result as a JSON-serializable dict."""
+
+        return {
+            'duration_seconds': round(self.duration_seconds, 3),
+            'requests': self.requests,
+            'errors': dict(sorted(self.errors.items())),
+            'error_ratio': sum(self.errors.values()) / self.requests if self.requests else 0.0,
+            'throughput_rps': len(self.latencies_ms) / self.duration_seconds,
+            'rows_per_second': self.rows / self.duration_seconds,
+            'latency_ms': {name: self.percentile_ms(percent) for name, percent in PERCENTILES.items()}
+            | {'max': max(self.latencies_ms, default=None)},
+        }
+
+
+def load_payloads(path: pathlib.Path) -> list[dict[str, Any]]:
+    """Reads the payloads of a JSON file holding one payload or a list of them, or of a JSON lines file."""
+
+    text = path.read_text()
+    if path.suffix == '.jsonl':
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    payloads = json.loads(text)
+    return payloads if isinstance(payloads, list) else [payloads]
+
+
+def generate_payloads(payloads: Sequence[dict[str, Any]], mutate: bool, rng: random.Random) -> Iterator[dict[str, Any]]:
+    """Replays payloads in a loop, mutating their areas and ids if `mutate` is set."""
+
+    for id, payload in enumerate(itertools.cycle(payloads), start=1):
+        if not mutate:
+            yield payload
+            continue
+        mutated = payload | {'id': id}
+        for name in MUTATED_FIELDS:
+            value = payload.get(name)
+            if value is not None:
+                scaled = value * rng.uniform(0.8, 1.2)
+                mutated[name] = round(scaled) if isinstance(value, int) else round(scaled, 1)
+        yield mutated
+
+
+def _request_bodies(endpoint: str, batch_size: int, payloads: Iterator[dict[str, Any]]) -> Iterator[tuple[bytes, int]]:
+    """Encodes the bodies of the requests to send, with their number of rows."""
+
+    while True:
+        if endpoint == 'single':
+            yield json.dumps(next(payloads)).encode(), 1
+        else:
+            batch = list(itertools.islice(payloads, batch_size))
+            yield json.dumps({'data': batch}).encode(), batch_size
+
+
+async def run_load_test(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    payloads: Iterator[dict[str, Any]],
+    duration: float,
+    concurrency: int,
+    rate: Optional[float] = None,
+    warmup: float = 0.0,
+    batch_size: int = 1,
+) -> LoadTestResult:
+    """Sends requests to an endpoint of the orchestrator for `warmup` plus `duration` seconds.
+
+    Args:
+        client: The HTTP client sending the requests, with the base URL of the orchestrator.
+        endpoint: The endpoint to call, a key of `ENDPOINTS`.
+        payloads: The PricePredictionRequest payloads to send, in order.
+        duration: The number of seconds to measure the requests for, after the warm up.
+        concurrency: The number of concurrent clients, or the maximum number of requests in flight with `rate`.
+        rate: An optional number of requests to start per second. The load is closed-loop if not set.
+        warmup: The number of seconds of requests to leave out of the result.
+        batch_size: The number of payloads sent per batch request.
+
+    Returns:
+        The outcome of the requests started after the warm up.
+    """
+
+    bodies = _request_bodies(endpoint, batch_size, payloads)
+    started = time.perf_counter()
+    measured_from = started + warmup
+    deadline = measured_from + duration
+    result = LoadTestResult(duration_seconds=duration)
+    in_flight = asyncio.Semaphore(concurrency)
+
+    async def send(due: float) -> None:
+        body, rows = next(bodies)
+        try:
+            response = await client.post(
+                ENDPOINTS[endpoint], content=body, headers={'content-type': 'application/json'}
+            )
+            error = None if response.is_success else str(response.status_code)
+        except httpx.HTTPError as e:
+            error = type(e).__name__
+        if due < measured_from:
+            return
+        if error is not None:
+            result.errors[error] = result.errors.get(error, 0) + 1
+        else:
+            result.latencies_ms.append((time.perf_counter() - due) * 1000)
+            result.rows += rows
+
+    async def closed_loop_client() -> None:
+        while (due := time.perf_counter()) < deadline:
+            await send(due)
+
+    async def send_limited(due: float) -> None:
+        async with in_flight:
+            await send(due)
+
+    if rate is None:
+        await asyncio.gather(*(closed_loop_client() for _ in range(concurrency)))
+        return result
+
+    tasks = set()
+    for index in itertools.count():
+        due = started + index / rate
+        if due >= deadline:
+            break
+        await asyncio.sleep(max(due - time.perf_counter(), 0))
+        task = asyncio.create_task(send_limited(due))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    await asyncio.gather(*tasks)
+    return result
+
+
+def print_result(result: LoadTestResult) -> None:
+    """Prints a summary of a load test result."""
+
+    summary = result.summary()
+    print(
+        f'{summary["requests"]} requests in {summary["duration_seconds"]}s, {summary["throughput_rps"]:.1f} req/s, '
+        f'{summary["rows_per_second"]:.1f} rows/s, {sum(result.errors.values())} errors {summary["errors"] or ""}'
+    )
+    print('  '.join(f'{name} {ms:.2f} ms' for name, ms in summary['latency_ms'].items() if ms is not None))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:8000', help='Base URL of the orchestrator.')
+    parser.add_argument('--endpoint', choices=list(ENDPOINTS), default='single')
+    parser.add_argument('--batch-size', type=int, default=100, help='Number of payloads per batch request.')
+    parser.add_argument('--concurrency', type=int, default=10, help='Concurrent clients, or requests in flight.')
+    parser.add_argument('--rate', type=float, help='Requests started per second, closed-loop load if not set.')
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds of measured load.')
+    parser.add_argument('--warmup', type=float, default=5.0, help='Seconds of load before the measure starts.')
+    parser.add_argument('--payloads', type=pathlib.Path, default=PAYLOAD, help='JSON or JSON lines payloads.')
+    parser.add_argument('--mutate', action='store_true', help='Scale the areas and renumber the ids of payloads.')
+    parser.add_argument('--seed', type=int, help='Seed of the payload mutations, for reproducible runs.')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Seconds before a request fails.')
+    parser.add_argument('--output', type=pathlib.Path, help='Optional JSON file to write the result to.')
+    args = parser.parse_args()
+
+    payloads = generate_payloads(load_payloads(args.payloads), args.mutate, random.Random(args.seed))
+
+    async def run() -> LoadTestResult:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+            return await run_load_test(
+                client,
+                args.endpoint,
+                payloads,
+                args.duration,
+                args.concurrency,
+                args.rate,
+                args.warmup,
+                args.batch_size,
+            )
+
+    result = asyncio.run(run())
+    print_result(result)
+    if args.output is not None:
+        config = {name: str(value) if isinstance(value, pathlib.Path) else value for name, value in vars(args).items()}
+        args.output.write_text(json.dumps({'config': config} | result.summary(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
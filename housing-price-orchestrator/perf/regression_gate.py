@@ -0,0 +1,286 @@
+"""Performance regression gate of the PricingService and MLFlowModelProvider hot paths.
+
+`record` runs the gated benchmarks of bench_hot_path.py and stores their latencies in a baseline file, versioned in
+the repository. `check` runs them again and compares every scenario with its baseline. The pricing service scenarios
+call the MLflow provider against the stub model server, started in a separate process: their timings include the HTTP
+round trip to the stub server, which answers at once, but no model work. The MLflow provider scenario encodes and
+decodes a batch without any network I/O.
+
+Timings of consecutive calls are correlated, as the load of the machine drifts slower than a call, so they are not
+compared one by one. Every scenario is instead run in `--rounds` independent rounds, interleaved with the other
+scenarios, and the median latency of every round is kept. A scenario regresses when both:
+
+- the median of its round medians is slower than the baseline one by more than the noise of the baseline, the spread
+  of its round medians relative to their median, and by at least `--min-effect`, so slowdowns within the noise of the
+  machine or too small to matter are ignored,
+- an exact one-sided Mann-Whitney U test finds its round medians slower than the baseline ones with a p-value below
+  `--alpha`, so a single slow round cannot fail the gate. With 7 rounds a side, the smallest p-value is about 0.0003.
+
+`check` exits with status 1 if any scenario regressed. Baselines only compare with runs on the same kind of machine:
+record them again on the machine running the gate, and whenever a slowdown is accepted. Run from the orchestrator
+directory:
+
+Usage: python perf/regression_gate.py record|check [--baseline perf/baselines/hot_path.json] [--batch-sizes 1 100]
+    [--rounds 7] [--min-time 0.2] [--min-effect 0.1] [--alpha 0.01]
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import datetime
+import json
+import math
+import os
+import pathlib
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+from typing import Optional, Sequence
+import httpx
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+from bench_hot_path import run_benchmarks
+from provider.mlflow_model_provider import AsyncMLFlowModelProvider
+
+BASELINE = pathlib.Path(__file__).parent / 'baselines' / 'hot_path.json'
+BASELINE_VERSION = 2
+SCENARIOS = {
+    'predict_price': (1, 10, 100),
+    'predict_price_batch': (1, 100, 1_000),
+    'mlflow_provider': (1, 100, 1_000),
+}
+"""Gated benchmarks of bench_hot_path.py, with their batch sizes. Concurrent single requests each call the model, so
+their batch sizes stay small."""
+
+
+@dataclass
+class ScenarioResult:
+    """Median latencies of the rounds of a scenario at a batch size."""
+
+    name: str
+    rows: int
+    round_medians_ms: list[float]
+    """Median latency of every round, in milliseconds."""
+
+    @property
+    def median_ms(self) -> float:
+        return statistics.median(self.round_medians_ms)
+
+    @property
+    def spread(self) -> float:
+        """Range of the round medians relative to their median, the noise between rounds."""
+        return (max(self.round_medians_ms) - min(self.round_medians_ms)) / self.median_ms
+
+
+@dataclass
+class Comparison:
+    """Comparison of the latency of a scenario with its baseline."""
+
+    name: str
+    rows: int
+    baseline_ms: float
+    current_ms: float
+    threshold: float
+    """Relative slowdown of the median above which the scenario may regress."""
+
+    p_value: float
+    regressed: bool
+
+    @property
+    def change(self) -> float:
+        """Relative change of the median latency."""
+        return self.current_ms / self.baseline_ms - 1
+
+
+def mann_whitney_p_value(baseline: Sequence[float], current: Sequence[float]) -> float:
+    """Computes the exact p-value of a one-sided Mann-Whitney U test that `current` values tend to be larger than
+    `baseline` values, counting ties as half a pair.
+
+    Args:
+        baseline: The round medians of the baseline.
+        current: The round medians of the current run.
+
+    Returns:
+        The probability of a U statistic at least this large if both had the same distribution.
+    """
+
+    n1, n2 = len(baseline), len(current)
+    u = sum(1.0 if y > x else 0.5 if y == x else 0.0 for x in baseline for y in current)
+
+    # counts[i][j][k]: orderings of i baseline and j current values where k pairs have the current value larger
+    counts = [[[0] * (n1 * n2 + 1) for _ in range(n2 + 1)] for _ in range(n1 + 1)]
+    for i in range(n1 + 1):
+        for j in range(n2 + 1):
+            if i == 0 or j == 0:
+                counts[i][j][0] = 1
+                continue
+            for k in range(i * j + 1):
+                # The largest value is either a current one, larger than the i baseline values, or a baseline one
+                counts[i][j][k] = (counts[i][j - 1][k - i] if k >= i else 0) + counts[i - 1][j][k]
+    at_least_u = sum(counts[n1][n2][math.ceil(u) :])
+    return at_least_u / math.comb(n1 + n2, n1)
+
+
+def compare(
+    baseline: Sequence[ScenarioResult], current: Sequence[ScenarioResult], min_effect: float, alpha: float
+) -> list[Comparison]:
+    """Compares every current result with the baseline result of the same scenario and batch size, if any.
+
+    Args:
+        baseline: The results stored in the baseline.
+        current: The results of the current run.
+        min_effect: The smallest relative slowdown of the median that can be a regression, when the baseline rounds
+            spread less.
+        alpha: The p-value below which a slowdown of the round medians is significant.
+
+    Returns:
+        The comparison of every scenario found in both runs.
+    """
+
+    baseline_results = {(result.name, result.rows): result for result in baseline}
+    comparisons = []
+    for result in current:
+        reference = baseline_results.get((result.name, result.rows))
+        if reference is None:
+            continue
+        threshold = max(min_effect, reference.spread)
+        p_value = mann_whitney_p_value(reference.round_medians_ms, result.round_medians_ms)
+        comparisons.append(
+            Comparison(
+                name=result.name,
+                rows=result.rows,
+                baseline_ms=reference.median_ms,
+                current_ms=result.median_ms,
+                threshold=threshold,
+                p_value=p_value,
+                regressed=result.median_ms / reference.median_ms - 1 > threshold and p_value < alpha,
+            )
+        )
+    return comparisons
+
+
+def write_baseline(path: pathlib.Path, results: Sequence[ScenarioResult]) -> None:
+    """Writes scenario results to a baseline file, with the version of its format and the machine that ran them."""
+
+    baseline = {
+        'version': BASELINE_VERSION,
+        'recorded_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': [
+            {
+                'name': result.name,
+                'rows': result.rows,
+                'round_medians_ms': [round(median, 6) for median in result.round_medians_ms],
+            }
+            for result in results
+        ],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baseline, indent=2) + '\n')
+
+
+def read_baseline(path: pathlib.Path) -> list[ScenarioResult]:
+    """Reads the scenario results of a baseline file.
+
+    Raises:
+        ValueError: If the baseline was written in another version of the format.
+    """
+
+    baseline = json.loads(path.read_text())
+    if baseline.get('version') != BASELINE_VERSION:
+        raise ValueError(f'Unsupported baseline version {baseline.get("version")}, record the baseline again.')
+    return [
+        ScenarioResult(result['name'], result['rows'], result['round_medians_ms']) for result in baseline['results']
+    ]
+
+
+async def run_scenarios(
+    batch_sizes: Optional[Sequence[int]], rounds: int, min_time: float, model_url: str
+) -> list[ScenarioResult]:
+    """Runs `rounds` rounds of the gated scenarios, the pricing service calling the MLflow provider against the model
+    server at `model_url`, at the given batch sizes or those of `SCENARIOS`. The rounds are interleaved, so a slower
+    period of the machine affects a round of every scenario rather than every round of one."""
+
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        provider = AsyncMLFlowModelProvider(model_url, client)
+        for _ in range(50):
+            if await provider.health():
+                break
+            await asyncio.sleep(0.1)
+        round_medians: dict[tuple[str, int], list[float]] = {}
+        for _ in range(rounds):
+            for name, default_batch_sizes in SCENARIOS.items():
+                results = await run_benchmarks(
+                    [name], batch_sizes or default_batch_sizes, min_time, provider, measure_allocations=False
+                )
+                for result in results:
+                    round_medians.setdefault((result.name, result.rows), []).append(result.median_ms)
+        return [ScenarioResult(name, rows, medians) for (name, rows), medians in round_medians.items()]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run_with_stub_server(batch_sizes: Optional[Sequence[int]], rounds: int, min_time: float) -> list[ScenarioResult]:
+    """Starts the stub model server in a separate process and runs the gated scenarios against it."""
+
+    http_port, grpc_port = _free_port(), _free_port()
+    stub_server = pathlib.Path(__file__).parent / 'v2_stub_server.py'
+    env = os.environ | {'PYTHONPATH': str(pathlib.Path(__file__).resolve().parents[1] / 'src')}
+    server = subprocess.Popen(
+        [sys.executable, str(stub_server), '--http-port', str(http_port), '--grpc-port', str(grpc_port)], env=env
+    )
+    try:
+        return asyncio.run(run_scenarios(batch_sizes, rounds, min_time, f'http://127.0.0.1:{http_port}'))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def print_comparisons(comparisons: Sequence[Comparison]) -> None:
+    """Prints a table of the comparisons with the baseline."""
+
+    print(f'{"scenario":<22}{"rows":>8}{"base ms":>12}{"now ms":>12}{"change":>9}{"limit":>8}{"p-value":>10}  verdict')
+    for comparison in comparisons:
+        verdict = 'REGRESSION' if comparison.regressed else 'ok'
+        print(
+            f'{comparison.name:<22}{comparison.rows:>8}{comparison.baseline_ms:>12.3f}{comparison.current_ms:>12.3f}'
+            f'{comparison.change:>+9.1%}{comparison.threshold:>+8.0%}{comparison.p_value:>10.4f}  {verdict}'
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('command', choices=['record', 'check'])
+    parser.add_argument('--baseline', type=pathlib.Path, default=BASELINE)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', help='Batch sizes of every scenario.')
+    parser.add_argument('--rounds', type=int, default=7, help='Independent rounds of every scenario.')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Seconds every round of a scenario runs for.')
+    parser.add_argument('--min-effect', type=float, default=0.1, help='Smallest relative slowdown of the median gated.')
+    parser.add_argument('--alpha', type=float, default=0.01, help='Significance level of the slowdowns.')
+    args = parser.parse_args(argv)
+
+    results = run_with_stub_server(args.batch_sizes, args.rounds, args.min_time)
+    if args.command == 'record':
+        write_baseline(args.baseline, results)
+        print(f'Recorded {len(results)} scenarios to {args.baseline}')
+        return 0
+
+    comparisons = compare(read_baseline(args.baseline), results, args.min_effect, args.alpha)
+    print_comparisons(comparisons)
+    regressions = [comparison for comparison in comparisons if comparison.regressed]
+    if regressions:
+        print(f'{len(regressions)} scenarios regressed against {args.baseline}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,340 @@
+"""Stub model server speaking the MLflow `/invocations` protocol and the Open Inference (V2) REST and gRPC protocols.
+
+Every protocol predicts the sum of the numeric values of each row, so the same input gets the same predictions whichever
+protocol scores it. Predictions can be delayed by a fixed latency, a per-row cost and a random jitter, and fail at a
+given rate, to stand in for the real model server in load, batching and resilience tests. Used by the provider tests and
+the benchmarks.
+
+Usage: python v2_stub_server.py [--http-port 8080] [--grpc-port 8081] [--model-name mlflow-model] [--model-version V]
+    [--latency-ms 0] [--per-row-ms 0] [--jitter none|uniform|exponential|lognormal] [--jitter-ms 0] [--error-rate 0]
+    [--seed N]
+"""
+
+import argparse
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import json
+import math
+import random
+import socket
+from typing import Any, AsyncIterator, Literal, Optional, Sequence
+from fastapi import FastAPI, Request, Response
+import numpy as np
+from shared.view.v2_grpc_view import CONTENTS_FIELDS, GRPC_SERVICE, grpc_messages
+from shared.view.v2_view import BINARY_HEADER_LENGTH, V2InferenceRequestView, V2Tensor
+
+DEFAULT_MODEL_NAME = 'mlflow-model'
+OUTPUT_NAME = 'predictions'
+
+
+Jitter = Literal['none', 'uniform', 'exponential', 'lognormal']
+
+
+@dataclass(frozen=True)
+class ModelBehaviour:
+    """Simulated cost and failures of the stub model.
+
+    Every prediction waits `latency_ms` plus `per_row_ms` per row, plus a random jitter: uniform between 0 and
+    `jitter_ms`, exponential with a mean of `jitter_ms`, or log-normal with a median of `jitter_ms`, whose long tail
+    resembles real model servers. A prediction fails with probability `error_rate`, after waiting like a successful one.
+    """
+
+    latency_ms: float = 0.0
+    per_row_ms: float = 0.0
+    jitter: Jitter = 'none'
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    seed: Optional[int] = None
+
+
+class SimulatedModel:
+    """Applies a ModelBehaviour to predictions, drawing jitter and failures from a generator seeded by `seed`.
+
+    Args:
+        behaviour: The simulated cost and failures of the model.
+    """
+
+    def __init__(self, behaviour: ModelBehaviour):
+        self.behaviour = behaviour
+        self.rng = random.Random(behaviour.seed)
+
+    def delay_seconds(self, rows: int) -> float:
+        """Draws the time a prediction of `rows` rows takes."""
+
+        behaviour = self.behaviour
+        delay_ms = behaviour.latency_ms + behaviour.per_row_ms * rows
+        if behaviour.jitter_ms > 0:
+            if behaviour.jitter == 'uniform':
+                delay_ms += self.rng.uniform(0, behaviour.jitter_ms)
+            elif behaviour.jitter == 'exponential':
+                delay_ms += self.rng.expovariate(1 / behaviour.jitter_ms)
+            elif behaviour.jitter == 'lognormal':
+                delay_ms += self.rng.lognormvariate(math.log(behaviour.jitter_ms), 1.0)
+        return delay_ms / 1000
+
+    async def predict(self, rows: int) -> bool:
+        """Waits for the simulated duration of a prediction of `rows` rows.
+
+        Returns:
+            True if the prediction succeeds, False if it fails.
+        """
+
+        delay = self.delay_seconds(rows)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self.rng.random() >= self.behaviour.error_rate
+
+
+def score_tensors(tensors: Sequence[V2Tensor]) -> np.ndarray:
+    """Sums the numeric tensors of a request element-wise, ignoring missing values."""
+
+    numeric = [np.nan_to_num(tensor.values.astype(float)) for tensor in tensors if tensor.datatype != 'BYTES']
+    return np.sum(numeric, axis=0) if numeric else np.zeros(len(tensors[0].values) if tensors else 0)
+
+
+def score_rows(rows: Sequence[Sequence[Any]]) -> list[float]:
+    """Sums the numeric values of each row, ignoring missing values."""
+
+    return [
+        float(sum(value for value in row if isinstance(value, (int, float)) and not isinstance(value, bool)))
+        for row in rows
+    ]
+
+
+def _unavailable() -> Response:
+    """Builds the response of a failed prediction, as MLflow answers when the model cannot serve it."""
+
+    content = json.dumps({'error_code': 'TEMPORARILY_UNAVAILABLE', 'message': 'Simulated model failure.'})
+    return Response(content=content, status_code=503, media_type='application/json')
+
+
+def create_app(
+    model_name: str = DEFAULT_MODEL_NAME,
+    behaviour: Optional[ModelBehaviour] = None,
+    model_version: Optional[str] = None,
+) -> FastAPI:
+    """Creates the REST application of the stub server.
+
+    Args:
+        model_name: The name the V2 model is served under.
+        behaviour: The simulated cost and failures of predictions, instant and successful by default.
+        model_version: An optional version the V2 model metadata reports.
+
+    Returns:
+        A FastAPI application serving `/ping`, `/invocations` and the V2 health, metadata and inference endpoints.
+    """
+
+    app = FastAPI()
+    model = SimulatedModel(behaviour or ModelBehaviour())
+
+    @app.get('/ping')
+    @app.get('/v2/health/ready')
+    async def ready() -> dict[str, bool]:
+        return {'ready': True}
+
+    @app.get(f'/v2/models/{model_name}')
+    async def metadata() -> dict[str, Any]:
+        return {'name': model_name, 'versions': [model_version] if model_version else [], 'platform': 'stub'}
+
+    @app.post('/invocations', response_model=None)
+    async def invocations(request: Request) -> dict[str, list[float]] | Response:
+        split = json.loads(await request.body())['dataframe_split']
+        if not await model.predict(len(split['data'])):
+            return _unavailable()
+        return {'predictions': score_rows(split['data'])}
+
+    @app.post(f'/v2/models/{model_name}/infer')
+    async def infer(request: Request) -> Response:
+        body = await request.body()
+        header_length = int(request.headers.get(BINARY_HEADER_LENGTH, len(body)))
+        inference_request = V2InferenceRequestView.model_validate_json(body[:header_length])
+
+        tensors, offset = [], header_length
+        for tensor_input in inference_request.inputs:
+            if tensor_input.data is not None:
+                tensors.append(V2Tensor.from_json(tensor_input.name, tensor_input.datatype, tensor_input.data))
+                continue
+            size = tensor_input.parameters['binary_data_size']
+            tensors.append(V2Tensor.from_raw(tensor_input.name, tensor_input.datatype, body[offset : offset + size]))
+            offset += size
+
+        output = V2Tensor(name=OUTPUT_NAME, datatype='FP64', values=score_tensors(tensors))
+        if not await model.predict(len(output.values)):
+            return _unavailable()
+        output_view = {'name': output.name, 'shape': [len(output.values)], 'datatype': output.datatype}
+        if not (inference_request.parameters or {}).get('binary_data_output'):
+            return Response(
+                content=json.dumps({'model_name': model_name, 'outputs': [output_view | {'data': output.to_json()}]}),
+                media_type='application/json',
+            )
+
+        raw = output.to_raw()
+        header = json.dumps(
+            {'model_name': model_name, 'outputs': [output_view | {'parameters': {'binary_data_size': len(raw)}}]}
+        ).encode()
+        return Response(
+            content=header + raw,
+            media_type='application/octet-stream',
+            headers={BINARY_HEADER_LENGTH: str(len(header))},
+        )
+
+    return app
+
+
+@asynccontextmanager
+async def run_http_server(
+    port: int = 0, model_name: str = DEFAULT_MODEL_NAME, behaviour: Optional[ModelBehaviour] = None
+) -> AsyncIterator[str]:
+    """Serves the REST protocols of the stub server on the loopback interface until the context exits, e.g. in tests.
+
+    Args:
+        port: The port to listen on, 0 picks a free port.
+        model_name: The name the V2 model is served under.
+        behaviour: The simulated cost and failures of predictions, instant and successful by default.
+
+    Yields:
+        The base URL of the server.
+    """
+
+    import uvicorn
+
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', port))
+    server = uvicorn.Server(uvicorn.Config(create_app(model_name, behaviour), log_level='warning'))
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+    try:
+        while not server.started and not task.done():
+            await asyncio.sleep(0.01)
+        yield f'http://127.0.0.1:{sock.getsockname()[1]}'
+    finally:
+        server.should_exit = True
+        await task
+        sock.close()
+
+
+async def start_grpc_server(
+    port: int = 0,
+    model_name: str = DEFAULT_MODEL_NAME,
+    behaviour: Optional[ModelBehaviour] = None,
+    model_version: Optional[str] = None,
+) -> tuple[Any, int]:
+    """Starts the gRPC server of the stub server on the loopback interface.
+
+    Args:
+        port: The port to listen on, 0 picks a free port.
+        model_name: The name the V2 model is served under.
+        behaviour: The simulated cost and failures of predictions, instant and successful by default.
+        model_version: An optional version the V2 model metadata reports.
+
+    Returns:
+        The started `grpc.aio.Server` and the port it listens on.
+    """
+
+    import grpc.aio
+
+    messages = grpc_messages()
+    model = SimulatedModel(behaviour or ModelBehaviour())
+
+    async def server_ready(request: Any, context: Any) -> Any:
+        return messages.ServerReadyResponse(ready=True)
+
+    async def model_metadata(request: Any, context: Any) -> Any:
+        if request.name != model_name:
+            await context.abort(grpc.StatusCode.NOT_FOUND, f'Model {request.name} not found.')
+        return messages.ModelMetadataResponse(
+            name=model_name, versions=[model_version] if model_version else [], platform='stub'
+        )
+
+    async def model_infer(request: Any, context: Any) -> Any:
+        if request.model_name != model_name:
+            await context.abort(grpc.StatusCode.NOT_FOUND, f'Model {request.model_name} not found.')
+
+        tensors = []
+        for index, tensor_input in enumerate(request.inputs):
+            if request.raw_input_contents:
+                raw = request.raw_input_contents[index]
+                tensors.append(V2Tensor.from_raw(tensor_input.name, tensor_input.datatype, raw))
+            else:
+                values = getattr(tensor_input.contents, CONTENTS_FIELDS[tensor_input.datatype])
+                tensors.append(
+                    V2Tensor(name=tensor_input.name, datatype=tensor_input.datatype, values=np.array(values))
+                )
+
+        output = V2Tensor(name=OUTPUT_NAME, datatype='FP64', values=score_tensors(tensors))
+        if not await model.predict(len(output.values)):
+            await context.abort(grpc.StatusCode.UNAVAILABLE, 'Simulated model failure.')
+        response = messages.ModelInferResponse(model_name=model_name)
+        response.outputs.add(name=output.name, datatype=output.datatype, shape=[len(output.values)])
+        response.raw_output_contents.append(output.to_raw())
+        return response
+
+    handler = grpc.method_handlers_generic_handler(
+        GRPC_SERVICE,
+        {
+            'ServerReady': grpc.unary_unary_rpc_method_handler(
+                server_ready,
+                request_deserializer=messages.ServerReadyRequest.FromString,
+                response_serializer=messages.ServerReadyResponse.SerializeToString,
+            ),
+            'ModelMetadata': grpc.unary_unary_rpc_method_handler(
+                model_metadata,
+                request_deserializer=messages.ModelMetadataRequest.FromString,
+                response_serializer=messages.ModelMetadataResponse.SerializeToString,
+            ),
+            'ModelInfer': grpc.unary_unary_rpc_method_handler(
+                model_infer,
+                request_deserializer=messages.ModelInferRequest.FromString,
+                response_serializer=messages.ModelInferResponse.SerializeToString,
+            ),
+        },
+    )
+    server = grpc.aio.server(options=[('grpc.max_send_message_length', -1), ('grpc.max_receive_message_length', -1)])
+    server.add_generic_rpc_handlers((handler,))
+    port = server.add_insecure_port(f'127.0.0.1:{port}')
+    await server.start()
+    return server, port
+
+
+async def serve(
+    http_port: int,
+    grpc_port: int,
+    model_name: str,
+    behaviour: Optional[ModelBehaviour] = None,
+    model_version: Optional[str] = None,
+) -> None:
+    """Serves the REST and gRPC protocols until interrupted."""
+
+    import uvicorn
+
+    grpc_server, _ = await start_grpc_server(grpc_port, model_name, behaviour, model_version)
+    app = create_app(model_name, behaviour, model_version)
+    config = uvicorn.Config(app, host='127.0.0.1', port=http_port, log_level='warning')
+    try:
+        await uvicorn.Server(config).serve()
+    finally:
+        await grpc_server.stop(grace=None)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--http-port', type=int, default=8080)
+    parser.add_argument('--grpc-port', type=int, default=8081)
+    parser.add_argument('--model-name', default=DEFAULT_MODEL_NAME)
+    parser.add_argument('--model-version', help='Version reported in the V2 model metadata.')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Fixed latency of every prediction.')
+    parser.add_argument('--per-row-ms', type=float, default=0.0, help='Additional latency per predicted row.')
+    parser.add_argument('--jitter', choices=['none', 'uniform', 'exponential', 'lognormal'], default='none')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Scale of the random jitter added to the latency.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probability that a prediction fails.')
+    parser.add_argument('--seed', type=int, help='Seed of the jitter and failures, for reproducible runs.')
+    args = parser.parse_args()
+    behaviour = ModelBehaviour(
+        latency_ms=args.latency_ms,
+        per_row_ms=args.per_row_ms,
+        jitter=args.jitter,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    asyncio.run(serve(args.http_port, args.grpc_port, args.model_name, behaviour, args.model_version))
@@ -0,0 +1,116 @@
+"""Scores a JSONL, CSV or Parquet file of housing units offline, without going through the web tier.
+
+Usage: python bulk_score.py <input> <output> [--chunk-size 1000] [--workers 4] [--null-values NA '']
+"""
+
+import argparse
+import logging
+import os
+import pathlib
+import sys
+import time
+from typing import Optional, Sequence
+import httpx
+from provider.in_process_model_provider import InProcessModelProvider
+from provider.mlflow_model_provider import MLFlowModelProvider
+from provider.model_provider import ModelProvider
+from provider.record_file_provider import CSV_NULL_VALUES, PredictionFileWriter, read_records
+from service.bulk_scoring_service import BulkScoringService
+from service.pricing_service import PricingService
+from shared.config.config_loader import Settings, load_config_settings
+from shared.dto.bulk_scoring_summary import BulkScoringSummary
+
+logger = logging.getLogger('bulk_score')
+
+
+def build_pricing_model_provider(settings: Settings, workers: int) -> ModelProvider:
+    """Builds the synchronous model provider selected by the `pricing_model_provider` setting.
+
+    Args:
+        settings: The application settings.
+        workers: The number of worker threads sharing the provider, used to size the connection pool.
+
+    Returns:
+        Either a provider calling the model server over HTTP or one scoring the model in-process.
+    """
+
+    if settings.pricing_model_provider == 'in_process':
+        return InProcessModelProvider(settings.pricing_model_uri)
+    client = httpx.Client(timeout=httpx.Timeout(60.0), limits=httpx.Limits(max_connections=workers))
+    # Offline scoring calls the first replica configured
+    return MLFlowModelProvider(settings.pricing_model_urls[0], client, settings.pricing_model_version)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parses the command line arguments.
+
+    Args:
+        argv: The arguments to parse, defaults to the process arguments.
+
+    Returns:
+        The parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('input', type=pathlib.Path, help='JSONL, CSV or Parquet file of records to score.')
+    parser.add_argument('output', type=pathlib.Path, help='JSONL or Parquet file to write the predictions to.')
+    parser.add_argument('--input-format', choices=['jsonl', 'csv', 'parquet'], help='Defaults to the input suffix.')
+    parser.add_argument('--output-format', choices=['jsonl', 'parquet'], help='Defaults to the output suffix.')
+    parser.add_argument(
+        '--null-values', nargs='*', help='CSV values read as missing, defaults to those pandas reads as NaN, e.g. NA.'
+    )
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Number of records per model call.')
+    parser.add_argument('--workers', type=int, default=4, help='Number of chunks scored concurrently.')
+    parser.add_argument('--progress-interval', type=float, default=5.0, help='Seconds between progress reports.')
+    parser.add_argument('--env', default=os.getenv('ENV', 'dev'), help='Configuration environment to use.')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Runs a bulk scoring job.
+
+    Args:
+        argv: The command line arguments, defaults to the process arguments.
+
+    Returns:
+        The process exit code.
+    """
+
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s', stream=sys.stderr)
+
+    settings = load_config_settings(args.env)
+    pricing_service = PricingService(build_pricing_model_provider(settings, args.workers))
+    bulk_scoring_service = BulkScoringService(pricing_service, chunk_size=args.chunk_size, workers=args.workers)
+
+    last_report = time.perf_counter()
+
+    def report_progress(summary: BulkScoringSummary) -> None:
+        nonlocal last_report
+        if time.perf_counter() - last_report >= args.progress_interval:
+            last_report = time.perf_counter()
+            logger.info(
+                'Scored %d of %d records read (%d invalid), %.0f records/s',
+                summary.records_scored,
+                summary.records_read,
+                summary.records_invalid,
+                summary.throughput,
+            )
+
+    null_values = args.null_values if args.null_values is not None else CSV_NULL_VALUES
+    records = read_records(args.input, args.input_format, batch_size=args.chunk_size, null_values=null_values)
+    with PredictionFileWriter(args.output, args.output_format) as writer:
+        summary = bulk_scoring_service.score(records, writer.write, report_progress)
+
+    logger.info(
+        'Done: scored %d records (%d invalid) in %.1fs, %.0f records/s',
+        summary.records_scored,
+        summary.records_invalid,
+        summary.elapsed_seconds,
+        summary.throughput,
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
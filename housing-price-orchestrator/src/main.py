@@ -1,56 +1,655 @@
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, nullcontext
+import math
 import os
-from fastapi import FastAPI, HTTPException
+import secrets
+from typing import Any, AsyncIterator, Optional
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 import httpx
-from service.pricing_service import PricingService
-from provider.mlflow_model_provider import MLFlowModelProvider
-from shared.config.config_loader import load_config_settings
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+import pyarrow as pa
+from pydantic import BaseModel, ValidationError
+import provider
+import service
+from service.concurrency_limiter import AdaptiveConcurrencyLimiter
+from service.health_monitor import HealthMonitor
+from service.metrics_collector import OrchestratorCollector
+from service.micro_batcher import MicroBatcher
+from service.prediction_cache import PredictionCache
+from service.pricing_service import AsyncPricingService
+from provider.circuit_breaker_model_provider import AsyncCircuitBreakerModelProvider
+from provider.hedging_model_provider import AsyncHedgingModelProvider
+from provider.http_client import InstrumentedAsyncTransport
+from provider.in_process_model_provider import AsyncInProcessModelProvider, InProcessModelProvider
+from provider.mlflow_model_provider import AsyncMLFlowModelProvider
+from provider.model_provider import AsyncModelProvider, is_model_failure
+from provider.replica_pool_model_provider import AsyncReplicaPoolModelProvider
+from provider.v2_model_provider import AsyncV2GrpcModelProvider, AsyncV2ModelProvider
+from shared.config.config_loader import HttpClientSettings, Settings, load_config_settings
+from shared.exceptions import ServiceUnavailableError, UnsupportedInputError
+from shared.instrumentation import (
+    MetricsMiddleware,
+    ServerTimingMiddleware,
+    observe_stage_since_request_started,
+    time_stage,
+)
+from shared.profiling import ProfilerBusyError, RequestProfilingMiddleware, SamplingProfiler
+from shared.tracing import TracingMiddleware, configure_tracing, inject_trace_context
+from shared.view.arrow_view import (
+    ARROW_STREAM_MEDIA_TYPE,
+    PARQUET_MEDIA_TYPE,
+    read_table,
+    table_media_type,
+    to_prediction_table,
+    write_table,
+)
+from shared.view.columnar_view import validate_columns
+from shared.view.ndjson_view import (
+    NDJSON_MEDIA_TYPE,
+    NDJSONLineTooLongError,
+    NDJSONStreamingResponse,
+    iter_ndjson_lines,
+    to_ndjson_line,
+)
+from shared.view.health_view import ConnectionPoolView, HealthView
 from shared.view.request_view import PricePredictionBatchRequest, PricePredictionRequest
 from shared.view.response_view import PricePredictionBatchResponseView, PricePredictionResponseView
+from shared.view.v2_view import v2_datatypes
+
+
+def build_pricing_model_provider(settings: Settings, client: httpx.AsyncClient) -> AsyncModelProvider:
+    """Builds the model provider selected by the `pricing_model_provider` setting.
+
+    Args:
+        settings: The application settings.
+        client: The shared HTTP client, used when the model is served over HTTP.
+
+    Returns:
+        A provider calling the model server with the MLFlow or the V2 protocol, balancing predictions across replicas
+        when several are configured, hedging slow predictions and failing fast behind a circuit breaker when enabled, or
+        one scoring the model in-process.
+    """
+
+    if settings.pricing_model_provider == 'in_process':
+        return AsyncInProcessModelProvider(InProcessModelProvider(settings.pricing_model_uri))
+    if settings.pricing_model_provider == 'v2':
+        v2_protocol = settings.v2_protocol
+        datatypes = v2_datatypes(PricePredictionRequest)
+        if v2_protocol.transport == 'grpc':
+            replicas = [
+                AsyncV2GrpcModelProvider(target, v2_protocol.model_name, settings.pricing_model_version, datatypes)
+                for target in v2_protocol.grpc_targets
+            ]
+        else:
+            replicas = [
+                AsyncV2ModelProvider(
+                    url,
+                    v2_protocol.model_name,
+                    client,
+                    settings.pricing_model_version,
+                    datatypes,
+                    binary_data=v2_protocol.binary_data,
+                )
+                for url in settings.pricing_model_urls
+            ]
+    else:
+        replicas = [
+            AsyncMLFlowModelProvider(url, client, settings.pricing_model_version, settings.v2_protocol.model_name)
+            for url in settings.pricing_model_urls
+        ]
+
+    provider = (
+        replicas[0]
+        if len(replicas) == 1
+        else AsyncReplicaPoolModelProvider(
+            replicas,
+            settings.pricing_model_version,
+            max_failures=settings.load_balancing.max_failures,
+            ejection_seconds=settings.load_balancing.ejection_seconds,
+        )
+    )
+    if settings.hedging.enabled:
+        provider = AsyncHedgingModelProvider(
+            provider,
+            percentile=settings.hedging.percentile,
+            max_hedge_ratio=settings.hedging.max_hedge_ratio,
+            max_hedge_burst=settings.hedging.max_hedge_burst,
+            window_size=settings.hedging.window_size,
+            min_samples=settings.hedging.min_samples,
+        )
+    if settings.circuit_breaker.enabled:
+        provider = AsyncCircuitBreakerModelProvider(
+            provider,
+            failure_rate_threshold=settings.circuit_breaker.failure_rate_threshold,
+            slow_call_seconds=settings.circuit_breaker.slow_call_seconds,
+            window_size=settings.circuit_breaker.window_size,
+            min_calls=settings.circuit_breaker.min_calls,
+            open_seconds=settings.circuit_breaker.open_seconds,
+            half_open_max_calls=settings.circuit_breaker.half_open_max_calls,
+        )
+    return provider
+
+
+def build_http_transport(settings: HttpClientSettings) -> InstrumentedAsyncTransport:
+    """Builds the transport of the HTTP client calling the model, with the configured connection pool and protocol.
+
+    Args:
+        settings: The HTTP client settings.
+
+    Returns:
+        A transport recording how requests obtain their connections.
+    """
+
+    limits = httpx.Limits(
+        max_connections=settings.max_connections,
+        max_keepalive_connections=settings.max_keepalive_connections,
+        keepalive_expiry=settings.keepalive_expiry,
+    )
+    return InstrumentedAsyncTransport(limits=limits, http2=settings.http2)
+
+
+def build_http_client(settings: HttpClientSettings, transport: httpx.AsyncBaseTransport) -> httpx.AsyncClient:
+    """Builds the HTTP client calling the model, with the configured timeouts, propagating the trace context.
+
+    Args:
+        settings: The HTTP client settings.
+        transport: The transport sending the requests of the client.
+
+    Returns:
+        The HTTP client shared by the model providers.
+    """
+
+    timeout = httpx.Timeout(
+        connect=settings.connect_timeout,
+        read=settings.read_timeout,
+        write=settings.write_timeout,
+        pool=settings.pool_timeout,
+    )
+    return httpx.AsyncClient(transport=transport, timeout=timeout, event_hooks={'request': [inject_trace_context]})
+
 
-app = FastAPI()
 app_settings = load_config_settings(os.getenv('ENV', 'dev'))
+tracer_provider = configure_tracing(app_settings.tracing)
+
+# Initialize HTTP client, its pooled connections are released when the application shuts down
+http_transport = build_http_transport(app_settings.http_client)
+client = build_http_client(app_settings.http_client, http_transport)
+pricing_model_provider = build_pricing_model_provider(app_settings, client)
+
+# Optionally coalesce concurrent single predictions into batched model calls
+micro_batcher = (
+    MicroBatcher(
+        pricing_model_provider,
+        max_batch_size=app_settings.micro_batching.max_batch_size,
+        max_wait_ms=app_settings.micro_batching.max_wait_ms,
+        max_queue_size=app_settings.micro_batching.max_queue_size,
+    )
+    if app_settings.micro_batching.enabled
+    else None
+)
+
+# Optionally answer repeated property features from a bounded cache
+prediction_cache = (
+    PredictionCache(
+        max_size=app_settings.prediction_cache.max_size, ttl_seconds=app_settings.prediction_cache.ttl_seconds
+    )
+    if app_settings.prediction_cache.enabled
+    else None
+)
+pricing_service = AsyncPricingService(
+    pricing_model_provider,
+    micro_batcher,
+    prediction_cache,
+    batch_chunk_size=app_settings.batch_fan_out.chunk_size,
+    batch_max_concurrency=app_settings.batch_fan_out.max_concurrency,
+)
+
+# Optionally shed predictions beyond a concurrency limit adapted to the latency of the model
+concurrency_limiter = (
+    AdaptiveConcurrencyLimiter(
+        initial_limit=app_settings.concurrency_limit.initial_limit,
+        min_limit=app_settings.concurrency_limit.min_limit,
+        max_limit=app_settings.concurrency_limit.max_limit,
+        max_queue_size=app_settings.concurrency_limit.max_queue_size,
+        max_queue_wait_ms=app_settings.concurrency_limit.max_queue_wait_ms,
+        latency_tolerance=app_settings.concurrency_limit.latency_tolerance,
+        backoff_ratio=app_settings.concurrency_limit.backoff_ratio,
+        window_size=app_settings.concurrency_limit.window_size,
+    )
+    if app_settings.concurrency_limit.enabled
+    else None
+)
+
+# Profile the pricing service and model providers on demand, admin endpoints are disabled without a token
+profiler = SamplingProfiler(
+    interval_seconds=app_settings.profiling.sample_interval_ms / 1000,
+    include_paths=[os.path.dirname(service.__file__), os.path.dirname(provider.__file__)],
+)
+admin_token = os.getenv('ADMIN_TOKEN')
+
+# Probe the model in the background, so health checks answer from the last probe
+health_monitor = HealthMonitor(
+    pricing_model_provider,
+    interval_seconds=app_settings.health_check.interval_seconds,
+    timeout_seconds=app_settings.health_check.timeout_seconds,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Manages the lifecycle of the shared HTTP client, and gRPC channels, used to call the model, and of the
+    background health probes of the model.
+
+    Args:
+        app: The FastAPI application.
+    """
+
+    async with client:
+        health_monitor.start()
+        try:
+            yield
+        finally:
+            await health_monitor.stop()
+
+    # Providers holding connections of their own, e.g. gRPC channels, or wrapping one, are closed with the client
+    close = getattr(pricing_model_provider, 'close', None)
+    if close is not None:
+        await close()
+
+    # Export the spans still buffered
+    if tracer_provider is not None:
+        tracer_provider.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
+if app_settings.server_timing.enabled:
+    app.add_middleware(ServerTimingMiddleware)
+if app_settings.profiling.enabled or app_settings.profiling.slow_request_ms is not None:
+    app.add_middleware(
+        RequestProfilingMiddleware,
+        profiler=profiler if app_settings.profiling.enabled else None,
+        slow_request_seconds=app_settings.profiling.slow_request_ms / 1000
+        if app_settings.profiling.slow_request_ms is not None
+        else None,
+        sample_ratio=app_settings.profiling.slow_request_sample_ratio,
+    )
+
+# Export the counters of the providers, HTTP client and cache when metrics are scraped
+REGISTRY.register(
+    OrchestratorCollector(pricing_model_provider, http_transport.stats, prediction_cache, concurrency_limiter)
+)
+
+
+@app.exception_handler(ServiceUnavailableError)
+async def service_unavailable_handler(request: Request, exc: ServiceUnavailableError) -> JSONResponse:
+    """Translates a ServiceUnavailableError into a 503 response, with a Retry-After header when one is known.
+
+    Args:
+        request: The request that could not be served.
+        exc: The raised ServiceUnavailableError.
+
+    Returns:
+        A 503 JSONResponse describing why the request was rejected.
+    """
+
+    headers = {'Retry-After': str(max(1, math.ceil(exc.retry_after)))} if exc.retry_after is not None else None
+    return JSONResponse(status_code=503, content={'detail': str(exc)}, headers=headers)
+
+
+@app.exception_handler(UnsupportedInputError)
+async def unsupported_input_handler(request: Request, exc: UnsupportedInputError) -> JSONResponse:
+    """Translates an UnsupportedInputError into a 422 response, as the request cannot be scored as sent.
+
+    Args:
+        request: The request that could not be scored.
+        exc: The raised UnsupportedInputError.
+
+    Returns:
+        A 422 JSONResponse describing why the request cannot be scored.
+    """
+
+    return JSONResponse(status_code=422, content={'detail': str(exc)})
+
+
+def _health_view() -> HealthView:
+    """Describes the health of the orchestrator from the last health probe of the model, and the usage of the
+    connection pool calling it."""
+
+    circuit_state = (
+        pricing_model_provider.state if isinstance(pricing_model_provider, AsyncCircuitBreakerModelProvider) else None
+    )
+    pool_stats = http_transport.stats
+    return HealthView(
+        status='ok' if health_monitor.healthy and circuit_state != 'open' else 'unavailable',
+        model_healthy=health_monitor.healthy,
+        checked_at=health_monitor.checked_at,
+        circuit_state=circuit_state,
+        connection_pool=ConnectionPoolView(
+            requests=pool_stats.requests,
+            new_connections=pool_stats.new_connections,
+            reused_connections=pool_stats.reused_connections,
+            reuse_ratio=pool_stats.reuse_ratio,
+            mean_pool_wait_ms=pool_stats.mean_pool_wait_seconds * 1000,
+            max_pool_wait_ms=pool_stats.max_pool_wait_seconds * 1000,
+            pool_timeouts=pool_stats.pool_timeouts,
+        ),
+    )
+
+
+@app.get('/health')
+async def health() -> HealthView:
+    """Liveness endpoint, answering as long as the orchestrator runs.
+
+    Returns:
+        A HealthView describing the health of the orchestrator and of the pricing model, from the last health probe,
+        and the usage of the connection pool calling the model.
+    """
+    return _health_view()
 
-# Initialize HTTP client
-client = httpx.Client()
-pricing_service = PricingService(MLFlowModelProvider(app_settings.pricing_model_url, client))
 
+@app.get('/ready', response_model=HealthView, responses={503: {'model': HealthView}})
+async def ready() -> JSONResponse:
+    """Readiness endpoint, answering 503 while the pricing model cannot serve predictions.
 
-@app.post('/api/v1/price/predict')
-def predict(price_prediction_request: PricePredictionRequest) -> PricePredictionResponseView:
+    Returns:
+        A JSONResponse holding a HealthView, with a 200 status if the orchestrator can serve predictions and a 503
+        status otherwise.
+    """
+
+    view = _health_view()
+    return JSONResponse(
+        status_code=200 if view.status == 'ok' else 503, content=view.model_dump(mode='json', by_alias=True)
+    )
+
+
+@app.get('/metrics', include_in_schema=False)
+async def metrics() -> Response:
+    """Endpoint exposing the metrics of the orchestrator in the Prometheus text format.
+
+    Returns:
+        A Response holding the latest value of every metric.
+    """
+    return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """Dependency restricting admin endpoints to callers sending the admin token in the `X-Admin-Token` header.
+
+    Raises:
+        HTTPException: 404 if profiling is disabled or no admin token is configured, 403 if the token is wrong.
+    """
+
+    if not app_settings.profiling.enabled or not admin_token:
+        raise HTTPException(status_code=404, detail='Not Found')
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=403, detail='Forbidden')
+
+
+@app.post('/admin/profile', include_in_schema=False, dependencies=[Depends(require_admin)])
+async def profile(
+    seconds: float = Query(default=10.0, gt=0, le=app_settings.profiling.max_seconds),
+    requests: Optional[int] = Query(default=None, ge=1),
+) -> PlainTextResponse:
+    """Endpoint profiling the pricing service and model providers for a number of seconds or prediction requests.
+
+    Args:
+        seconds: The maximum number of seconds to profile for.
+        requests: An optional number of prediction requests after which profiling stops.
+
+    Returns:
+        A PlainTextResponse holding the sampled stacks in the folded format read by flame graph tools.
+    """
+
+    try:
+        return PlainTextResponse(await profiler.profile(seconds, requests))
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+def _admit(rows: int) -> AbstractAsyncContextManager[None]:
+    """Holds a slot of the concurrency limiter, when enabled, while the pricing service predicts `rows` rows.
+
+    Raises:
+        ConcurrencyLimitExceededError: If the prediction is shed.
+    """
+    return concurrency_limiter.acquire(rows) if concurrency_limiter is not None else nullcontext()
+
+
+def _json_response(view: BaseModel) -> Response:
+    """Serializes a response view to JSON, like FastAPI would, so that the serialization is timed with its stage."""
+    return Response(content=view.model_dump_json(by_alias=True), media_type='application/json')
+
+
+@app.post('/api/v1/price/predict', response_model=PricePredictionResponseView)
+async def predict(price_prediction_request: PricePredictionRequest) -> Response:
     """Endpoint to predict the price of a housing unit.
 
     Args:
         price_prediction_request: The request containing the input data for the prediction.
 
     Returns:
-        A PricePredictionResponseView containing the predicted price.
+        A JSON response holding a PricePredictionResponseView with the predicted price.
     """
 
+    # The body was read and validated by FastAPI before the endpoint was called
+    observe_stage_since_request_started('validation')
     try:
-        price_prediction = pricing_service.predict_price(price_prediction_request)
-        return PricePredictionResponseView(id=price_prediction.id, predicted_price=price_prediction.predicted_price)
+        async with _admit(1):
+            price_prediction = await pricing_service.predict_price(price_prediction_request)
     except ValueError:
         raise HTTPException(status_code=404, detail='No results found.')
 
+    with time_stage('response'):
+        return _json_response(
+            PricePredictionResponseView(id=price_prediction.id, predicted_price=price_prediction.predicted_price)
+        )
+
+
+def _request_validation_error(error: ValidationError) -> RequestValidationError:
+    """Locates the errors of a request body validated by hand in the body, like FastAPI does for body parameters."""
+    return RequestValidationError([{**e, 'loc': ('body', *e['loc'])} for e in error.errors(include_url=False)])
+
+
+# The batch request schema refers to the PricePredictionRequest component registered by the single prediction endpoint
+_BATCH_REQUEST_SCHEMA = {
+    key: value
+    for key, value in PricePredictionBatchRequest.model_json_schema(
+        by_alias=False, ref_template='#/components/schemas/{model}'
+    ).items()
+    if key != '$defs'
+}
+_TABLE_CONTENT = {
+    ARROW_STREAM_MEDIA_TYPE: {'schema': {'type': 'string', 'format': 'binary'}},
+    PARQUET_MEDIA_TYPE: {'schema': {'type': 'string', 'format': 'binary'}},
+}
+
 
-@app.post('/api/v1/price/predict/batch')
-def batch_predict(price_prediction_requests: PricePredictionBatchRequest) -> PricePredictionBatchResponseView:
+@app.post(
+    '/api/v1/price/predict/batch',
+    response_model=PricePredictionBatchResponseView,
+    responses={200: {'content': _TABLE_CONTENT}},
+    openapi_extra={
+        'requestBody': {
+            'required': True,
+            'content': {
+                'application/json': {'schema': _BATCH_REQUEST_SCHEMA},
+                **_TABLE_CONTENT,
+            },
+        }
+    },
+)
+async def batch_predict(request: Request) -> Response:
     """Endpoint to predict the price of multiple housing units.
 
+    The body is either a JSON PricePredictionBatchRequest or a table with one column per PricePredictionRequest
+    field, named after their serialization aliases, sent as an Arrow IPC stream or a Parquet file. Tables are
+    validated column-wise and converted to the model input without a view per housing unit. Predictions are returned
+    as an Arrow IPC stream or a Parquet file when the Accept header asks for one, and as JSON otherwise.
+
     Args:
-        price_prediction_requests: A list of requests containing the input data for the predictions.
+        request: The incoming request, whose body is decoded according to its Content-Type.
 
     Returns:
-        A list of PricePredictionResponseView containing the predicted prices.
+        A JSON response holding a PricePredictionBatchResponseView, or a response holding a table of predictions.
     """
 
+    body = await request.body()
+    content_type = table_media_type(request.headers.get('Content-Type'))
     try:
-        price_predictions = pricing_service.predict_price_batch(price_prediction_requests)
-        return PricePredictionBatchResponseView(
-            predictions=[
-                PricePredictionResponseView(id=pred.id, predicted_price=pred.predicted_price)
-                for pred in price_predictions
-            ]
+        with time_stage('validation'):
+            if content_type is None:
+                price_prediction_requests = PricePredictionBatchRequest.model_validate_json(body)
+            else:
+                table = read_table(body, content_type)
+                input_data = validate_columns(dict(zip(table.column_names, table.columns)))
+    except ValidationError as e:
+        raise _request_validation_error(e)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        raise HTTPException(status_code=400, detail=f'Invalid {content_type} body: {e}')
+
+    try:
+        if content_type is None:
+            async with _admit(len(price_prediction_requests.data)):
+                price_predictions = await pricing_service.predict_price_batch(price_prediction_requests)
+        else:
+            async with _admit(len(input_data)):
+                price_predictions = await pricing_service.predict_price_columnar(input_data)
+    except ValueError:
+        raise HTTPException(status_code=404, detail='No results found.')
+
+    accept = table_media_type(request.headers.get('Accept'))
+    with time_stage('response'):
+        if accept is not None:
+            return Response(content=write_table(to_prediction_table(price_predictions), accept), media_type=accept)
+        return _json_response(
+            PricePredictionBatchResponseView(
+                predictions=[
+                    PricePredictionResponseView(id=pred.id, predicted_price=pred.predicted_price)
+                    for pred in price_predictions
+                ]
+            )
         )
+
+
+@app.post('/api/v1/price/predict/columnar', response_model=PricePredictionBatchResponseView)
+async def columnar_predict(columns: dict[str, list[Any]]) -> Response:
+    """Endpoint to predict the price of multiple housing units sent as one array per field.
+
+    The body maps PricePredictionRequest field names, or their aliases, to arrays holding the value of every housing
+    unit. Columns are validated as a whole instead of building one request view per housing unit, which keeps large
+    batches cheap to validate. Validation errors are reported like those of the batch endpoint.
+
+    Args:
+        columns: The column arrays, all of the same length.
+
+    Returns:
+        A JSON response holding a PricePredictionBatchResponseView with the predicted prices.
+    """
+
+    try:
+        input_data = validate_columns(columns)
+    except ValidationError as e:
+        raise _request_validation_error(e)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        raise HTTPException(status_code=422, detail=f'Invalid columns: {e}')
+    # Includes the decoding of the body by FastAPI before the endpoint was called
+    observe_stage_since_request_started('validation')
+
+    try:
+        async with _admit(len(input_data)):
+            price_predictions = await pricing_service.predict_price_columnar(input_data)
     except ValueError:
         raise HTTPException(status_code=404, detail='No results found.')
+
+    with time_stage('response'):
+        return _json_response(
+            PricePredictionBatchResponseView(
+                predictions=[
+                    PricePredictionResponseView(id=pred.id, predicted_price=pred.predicted_price)
+                    for pred in price_predictions
+                ]
+            )
+        )
+
+
+@app.post(
+    '/api/v1/price/predict/stream',
+    response_class=NDJSONStreamingResponse,
+    openapi_extra={
+        'requestBody': {
+            'required': True,
+            'content': {NDJSON_MEDIA_TYPE: {'schema': PricePredictionRequest.model_json_schema(by_alias=False)}},
+        }
+    },
+)
+async def stream_predict(request: Request) -> NDJSONStreamingResponse:
+    """Endpoint to predict the price of a stream of housing units.
+
+    The body is read as NDJSON, one PricePredictionRequest per line, and parsed as it arrives. Lines are scored in
+    rolling chunks and one PricePredictionResponseView per line is streamed back as NDJSON as soon as its chunk
+    completes, so memory use is bounded by the chunk size rather than the upload size. Lines failing validation, and
+    chunks the model cannot score or that are rejected while the model is unavailable, are reported inline as
+    `{"line": ..., "detail": ...}` objects.
+
+    Args:
+        request: The incoming request, whose body is streamed.
+
+    Returns:
+        An NDJSONStreamingResponse of predictions.
+    """
+
+    chunk_size = app_settings.streaming.chunk_size
+
+    async def score(chunk: list[tuple[int, PricePredictionRequest]]) -> AsyncIterator[bytes]:
+        try:
+            async with _admit(len(chunk)):
+                price_predictions = await pricing_service.predict_price_batch(
+                    PricePredictionBatchRequest(
+                        data=[price_prediction_request for _, price_prediction_request in chunk]
+                    )
+                )
+        except Exception as e:
+            # The response has already started, so failures are reported per line rather than as an error status. Model
+            # failures are not only HTTP errors: gRPC and in-process models raise errors of their own
+            if isinstance(e, (ServiceUnavailableError, UnsupportedInputError)):
+                detail = str(e)
+            elif isinstance(e, ValueError):
+                detail = 'No results found.'
+            elif is_model_failure(e) or isinstance(e, httpx.HTTPError):
+                detail = 'The pricing model failed to score these lines, please retry later.'
+            else:
+                raise
+            for line_number, _ in chunk:
+                yield to_ndjson_line({'line': line_number, 'detail': detail})
+            return
+
+        for pred in price_predictions:
+            yield to_ndjson_line(PricePredictionResponseView(id=pred.id, predicted_price=pred.predicted_price))
+
+    async def predictions() -> AsyncIterator[bytes]:
+        chunk: list[tuple[int, PricePredictionRequest]] = []
+        try:
+            async for line_number, line in iter_ndjson_lines(request.stream(), app_settings.streaming.max_line_bytes):
+                try:
+                    with time_stage('validation'):
+                        chunk.append((line_number, PricePredictionRequest.model_validate_json(line)))
+                except ValidationError as e:
+                    yield to_ndjson_line({'line': line_number, 'detail': e.errors(include_url=False)})
+                    continue
+
+                if len(chunk) >= chunk_size:
+                    async for output in score(chunk):
+                        yield output
+                    chunk = []
+        except NDJSONLineTooLongError as e:
+            yield to_ndjson_line({'detail': str(e)})
+            return
+
+        if chunk:
+            async for output in score(chunk):
+                yield output
+
+    return NDJSONStreamingResponse(predictions())
@@ -0,0 +1,183 @@
+from collections import deque
+import time
+from typing import Callable, Literal, Optional
+import pandas as pd
+from provider.model_provider import AsyncModelProvider, is_model_failure
+from shared.exceptions import ServiceUnavailableError
+from shared.view.mlflow_view import DataFrameSplit, MLFlowPredictionsView
+
+CircuitState = Literal['closed', 'open', 'half_open']
+
+HALF_OPEN_RETRY_AFTER_SECONDS = 1.0
+"""Seconds after which predictions rejected while the trial predictions are in flight may be retried."""
+
+
+class CircuitOpenError(ServiceUnavailableError):
+    """Raised when a prediction is rejected because the circuit breaker of the model is open."""
+
+
+class AsyncCircuitBreakerModelProvider:
+    """Asynchronous provider failing predictions fast while the model server is failing or slow.
+
+    The breaker starts closed and records the outcome of the last `window_size` predictions, a prediction failing
+    because of the model server or taking longer than `slow_call_seconds` counting as a failure. Once at least
+    `min_calls` outcomes are recorded and `failure_rate_threshold` of them are failures, the breaker opens: predictions
+    are rejected without calling the model for `open_seconds`. The breaker is then half-open and lets
+    `half_open_max_calls` trial predictions through, closing again if they all succeed and reopening on the first
+    failure. Trial predictions ending without telling anything about the model server, rejected because of the request
+    or cancelled, give their trial slot back.
+
+    Args:
+        pricing_model_provider: The async provider used to call the pricing model.
+        failure_rate_threshold: The ratio of failed predictions at which the breaker opens.
+        slow_call_seconds: An optional number of seconds after which a successful prediction counts as a failure.
+        window_size: The number of recent predictions the failure rate is computed from.
+        min_calls: The number of predictions to record before the breaker can open.
+        open_seconds: The number of seconds predictions are rejected for once the breaker opens.
+        half_open_max_calls: The number of trial predictions let through while the breaker is half-open.
+        clock: The monotonic clock used to time predictions and the open state.
+    """
+
+    def __init__(
+        self,
+        pricing_model_provider: AsyncModelProvider,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: Optional[float] = None,
+        window_size: int = 20,
+        min_calls: int = 10,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.pricing_model_provider = pricing_model_provider
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+        self.opened = 0
+        self.rejected = 0
+        self._outcomes: deque[bool] = deque(maxlen=window_size)
+        self._opened_at: Optional[float] = None
+        self._trial_calls = 0
+        self._trial_successes = 0
+
+    @property
+    def model_version(self) -> Optional[str]:
+        """Version of the model serving predictions, if known."""
+        return self.pricing_model_provider.model_version
+
+    @property
+    def state(self) -> CircuitState:
+        """The current state of the breaker."""
+
+        if self._opened_at is None:
+            return 'closed'
+        if self.clock() - self._opened_at < self.open_seconds:
+            return 'open'
+        return 'half_open'
+
+    @property
+    def failure_rate(self) -> float:
+        """The ratio of failures among the recorded predictions."""
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    async def health(self) -> bool:
+        """Checks whether predictions are let through and the model is healthy.
+
+        Returns:
+            False while the breaker is open, the health of the wrapped provider otherwise.
+        """
+
+        if self.state == 'open':
+            return False
+        return await self.pricing_model_provider.health()
+
+    async def fetch_model_version(self) -> Optional[str]:
+        """Reads the version of the model from the wrapped provider, if it can report it.
+
+        Returns:
+            The version of the model serving predictions, if known.
+        """
+
+        fetch = getattr(self.pricing_model_provider, 'fetch_model_version', None)
+        return await fetch() if fetch is not None else self.model_version
+
+    async def close(self) -> None:
+        """Closes the wrapped provider, if it holds connections of its own."""
+
+        close = getattr(self.pricing_model_provider, 'close', None)
+        if close is not None:
+            await close()
+
+    async def predict(self, data: pd.DataFrame | DataFrameSplit) -> MLFlowPredictionsView:
+        """Makes a prediction, unless the breaker is open.
+
+        Args:
+            data: The input data for the prediction, either as a DataFrame or as a DataFrameSplit of validated rows.
+
+        Returns:
+            A ModelPredictionsView containing the predictions.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with all its trial predictions in flight.
+        """
+
+        state = self.state
+        if state == 'open' or (state == 'half_open' and self._trial_calls >= self.half_open_max_calls):
+            self.rejected += 1
+            if state == 'open':
+                retry_after = self._opened_at + self.open_seconds - self.clock()
+            else:
+                retry_after = HALF_OPEN_RETRY_AFTER_SECONDS
+            raise CircuitOpenError('The pricing model is unavailable, please retry later.', retry_after)
+        if state == 'half_open':
+            self._trial_calls += 1
+
+        opened = self.opened
+        recorded = False
+        started = self.clock()
+        try:
+            predictions = await self.pricing_model_provider.predict(data)
+            slow = self.slow_call_seconds is not None and self.clock() - started > self.slow_call_seconds
+            self._record(state, failed=slow)
+            recorded = True
+            return predictions
+        except Exception as e:
+            if is_model_failure(e):
+                self._record(state, failed=True)
+                recorded = True
+            raise
+        finally:
+            if state == 'half_open' and not recorded and self.opened == opened:
+                # The outcome says nothing about the model server, let another trial prediction through instead
+                self._trial_calls -= 1
+
+    def _record(self, state: CircuitState, failed: bool) -> None:
+        """Records the outcome of a prediction made in the given state, opening or closing the breaker."""
+
+        if state == 'half_open':
+            if failed:
+                self._open()
+                return
+            self._trial_successes += 1
+            if self._trial_successes >= self.half_open_max_calls:
+                self._opened_at = None
+                self._outcomes.clear()
+            return
+
+        if self._opened_at is not None:
+            # The breaker opened while this prediction was in flight
+            return
+        self._outcomes.append(failed)
+        if len(self._outcomes) >= self.min_calls and self.failure_rate >= self.failure_rate_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        """Opens the breaker, rejecting predictions for `open_seconds`."""
+
+        self.opened += 1
+        self._opened_at = self.clock()
+        self._trial_calls = 0
+        self._trial_successes = 0
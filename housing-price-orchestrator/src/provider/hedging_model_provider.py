@@ -0,0 +1,159 @@
+import asyncio
+import bisect
+from collections import deque
+import math
+import time
+from typing import Callable, Optional
+import pandas as pd
+from provider.model_provider import AsyncModelProvider
+from shared.view.mlflow_view import DataFrameSplit, MLFlowPredictionsView
+
+
+class AsyncHedgingModelProvider:
+    """Asynchronous provider hedging slow predictions with a duplicate call.
+
+    When a prediction has not returned after the `percentile` of recent prediction latencies, the same prediction is
+    sent a second time, the first response wins and the other call is cancelled. Sent through a replica pool, the
+    duplicate goes to another replica than the slow one. Each prediction earns `max_hedge_ratio` of a hedge, up to a
+    burst of `max_hedge_burst` hedges, so hedging adds at most that ratio of calls to the model server load.
+
+    Args:
+        pricing_model_provider: The async provider used to call the pricing model.
+        percentile: The percentile of recent latencies after which a prediction is hedged.
+        max_hedge_ratio: The maximum ratio of hedged predictions, at most 1 so that hedging never doubles the load.
+        max_hedge_burst: The maximum number of hedges saved up while predictions are fast.
+        window_size: The number of recent latencies the hedging delay is computed from.
+        min_samples: The number of latencies to observe before predictions are hedged.
+        clock: The monotonic clock used to measure latencies.
+    """
+
+    def __init__(
+        self,
+        pricing_model_provider: AsyncModelProvider,
+        percentile: float = 95.0,
+        max_hedge_ratio: float = 0.1,
+        max_hedge_burst: float = 10.0,
+        window_size: int = 1000,
+        min_samples: int = 20,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 0 < max_hedge_ratio <= 1:
+            raise ValueError('max_hedge_ratio must be in (0, 1].')
+        self.pricing_model_provider = pricing_model_provider
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.max_hedge_burst = max_hedge_burst
+        self.min_samples = min_samples
+        self.clock = clock
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._latencies: deque[float] = deque(maxlen=window_size)
+        # The same latencies in increasing order, so the hedging delay is read without sorting the window every call
+        self._sorted_latencies: list[float] = []
+        self._budget = 0.0
+
+    @property
+    def model_version(self) -> Optional[str]:
+        """Version of the model serving predictions, if known."""
+        return self.pricing_model_provider.model_version
+
+    @property
+    def hedge_rate(self) -> float:
+        """The ratio of predictions that were hedged."""
+        return self.hedges / self.requests if self.requests else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        """The ratio of hedges that returned before the call they duplicated."""
+        return self.hedge_wins / self.hedges if self.hedges else 0.0
+
+    @property
+    def hedge_delay(self) -> Optional[float]:
+        """The number of seconds after which a prediction is hedged, None until enough latencies are observed."""
+
+        if len(self._latencies) < self.min_samples:
+            return None
+        latencies = self._sorted_latencies
+        return latencies[min(len(latencies) - 1, math.ceil(len(latencies) * self.percentile / 100) - 1)]
+
+    def _observe(self, latency: float) -> None:
+        """Adds a latency to the window, evicting the oldest one when the window is full."""
+
+        if len(self._latencies) == self._latencies.maxlen:
+            del self._sorted_latencies[bisect.bisect_left(self._sorted_latencies, self._latencies[0])]
+        self._latencies.append(latency)
+        bisect.insort(self._sorted_latencies, latency)
+
+    async def health(self) -> bool:
+        """Checks the health of the wrapped provider.
+
+        Returns:
+            True if the model can serve predictions, False otherwise.
+        """
+        return await self.pricing_model_provider.health()
+
+    async def fetch_model_version(self) -> Optional[str]:
+        """Reads the version of the model from the wrapped provider, if it can report it.
+
+        Returns:
+            The version of the model serving predictions, if known.
+        """
+
+        fetch = getattr(self.pricing_model_provider, 'fetch_model_version', None)
+        return await fetch() if fetch is not None else self.model_version
+
+    async def close(self) -> None:
+        """Closes the wrapped provider, if it holds connections of its own."""
+
+        close = getattr(self.pricing_model_provider, 'close', None)
+        if close is not None:
+            await close()
+
+    async def predict(self, data: pd.DataFrame | DataFrameSplit) -> MLFlowPredictionsView:
+        """Makes a prediction, hedging it with a duplicate call when it is slower than usual.
+
+        Args:
+            data: The input data for the prediction, either as a DataFrame or as a DataFrameSplit of validated rows.
+
+        Returns:
+            A ModelPredictionsView containing the predictions of the first call to succeed.
+        """
+
+        self.requests += 1
+        self._budget = min(self._budget + self.max_hedge_ratio, self.max_hedge_burst)
+
+        started = self.clock()
+        delay = self.hedge_delay
+        calls = [asyncio.ensure_future(self.pricing_model_provider.predict(data))]
+        try:
+            if delay is not None:
+                await asyncio.wait(calls, timeout=delay)
+            if not calls[0].done() and delay is not None and self._budget >= 1:
+                self._budget -= 1
+                self.hedges += 1
+                calls.append(asyncio.ensure_future(self.pricing_model_provider.predict(data)))
+            winner = await self._first_success(*calls)
+        finally:
+            # Cancels the slower call, or both calls when the caller gave up
+            for call in calls:
+                call.cancel()
+
+        predictions = winner.result()
+        self._observe(self.clock() - started)
+        if winner is not calls[0]:
+            self.hedge_wins += 1
+        return predictions
+
+    @staticmethod
+    async def _first_success(*calls: asyncio.Future[MLFlowPredictionsView]) -> asyncio.Future[MLFlowPredictionsView]:
+        """Waits for the first call to succeed, or for the last call to fail when none succeeds."""
+
+        pending = set(calls)
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            succeeded = [call for call in done if call.exception() is None]
+            if succeeded:
+                return succeeded[0]
+            if not pending:
+                return done.pop()
@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+import time
+from typing import Any
+import httpx
+
+
+@dataclass(slots=True)
+class ConnectionPoolStats:
+    """Counters describing how requests obtain a connection from the pool of an HTTP client."""
+
+    requests: int = 0
+    """Number of requests that obtained a connection."""
+
+    new_connections: int = 0
+    """Number of requests that had to open a new connection."""
+
+    reused_connections: int = 0
+    """Number of requests sent on a connection kept alive by an earlier request."""
+
+    pool_wait_seconds: float = 0.0
+    """Total time requests waited for a connection from the pool, excluding the time spent opening connections."""
+
+    max_pool_wait_seconds: float = 0.0
+    """Longest time a request waited for a connection from the pool."""
+
+    pool_timeouts: int = 0
+    """Number of requests that gave up waiting for a connection from the pool."""
+
+    @property
+    def reuse_ratio(self) -> float:
+        """The ratio of requests sent on a reused connection."""
+        return self.reused_connections / self.requests if self.requests else 0.0
+
+    @property
+    def mean_pool_wait_seconds(self) -> float:
+        """The average time requests waited for a connection from the pool."""
+        return self.pool_wait_seconds / self.requests if self.requests else 0.0
+
+
+class InstrumentedAsyncTransport(httpx.AsyncHTTPTransport):
+    """Asynchronous HTTP transport recording how long requests wait for a pooled connection and how often connections
+    are reused.
+
+    The connection pool does not report when it hands out a connection, so the wait is measured with the `trace`
+    request extension, up to the first event of the request on its connection: opening a new connection, or sending
+    the request headers on a reused one.
+
+    Args:
+        **kwargs: The arguments of `httpx.AsyncHTTPTransport`, e.g. its `limits` and `http2` support.
+    """
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.stats = ConnectionPoolStats()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        acquired = False
+        outer_trace = request.extensions.get('trace')
+
+        async def trace(event: str, info: dict[str, Any]) -> None:
+            nonlocal acquired
+            if not acquired and (
+                event == 'connection.connect_tcp.started' or event.endswith('.send_request_headers.started')
+            ):
+                acquired = True
+                self._record(time.perf_counter() - started, new_connection=event.startswith('connection.'))
+            if outer_trace is not None:
+                await outer_trace(event, info)
+
+        request.extensions['trace'] = trace
+        try:
+            return await super().handle_async_request(request)
+        except httpx.PoolTimeout:
+            self.stats.pool_timeouts += 1
+            raise
+
+    def _record(self, wait_seconds: float, new_connection: bool) -> None:
+        """Records the connection obtained by a request."""
+
+        stats = self.stats
+        stats.requests += 1
+        if new_connection:
+            stats.new_connections += 1
+        else:
+            stats.reused_connections += 1
+        stats.pool_wait_seconds += wait_seconds
+        stats.max_pool_wait_seconds = max(stats.max_pool_wait_seconds, wait_seconds)
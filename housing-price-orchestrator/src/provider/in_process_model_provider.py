@@ -0,0 +1,112 @@
+import asyncio
+from typing import Any, Optional
+import pandas as pd
+from shared.instrumentation import time_stage
+from shared.view.mlflow_view import DataFrameSplit, MLFlowPredictionsView
+
+
+def _load_model(model_uri: str) -> Any:
+    """Loads an MLFlow pyfunc model, importing MLFlow only when the in-process provider is used.
+
+    Args:
+        model_uri: The MLFlow URI of the model to load.
+
+    Returns:
+        The loaded pyfunc model.
+
+    Raises:
+        ImportError: If MLFlow is not installed.
+    """
+
+    try:
+        import mlflow.pyfunc
+    except ImportError as e:
+        raise ImportError(
+            'The in-process model provider requires MLFlow, install the "in-process" extra to use it.'
+        ) from e
+
+    return mlflow.pyfunc.load_model(model_uri)
+
+
+class InProcessModelProvider:
+    """Provider that scores an MLFlow pyfunc model inside the orchestrator process, without a network hop.
+
+    Args:
+        model_uri: The MLFlow URI of the model, e.g. `models:/<name>/<version>` or `runs:/<run_id>/model`.
+        model: An optional already loaded pyfunc model. If not provided, the model is loaded from `model_uri`.
+    """
+
+    def __init__(self, model_uri: str, model: Optional[Any] = None):
+        self.model_uri = model_uri
+        self.model = model if model is not None else _load_model(model_uri)
+
+    @property
+    def model_version(self) -> Optional[str]:
+        """Identifier of the loaded model, its MLFlow model UUID when available, otherwise its URI."""
+        metadata = getattr(self.model, 'metadata', None)
+        return getattr(metadata, 'model_uuid', None) or self.model_uri
+
+    def health(self) -> bool:
+        """Checks the health of the in-process model.
+
+        Returns:
+            True once the model has been loaded.
+        """
+        return self.model is not None
+
+    def predict(self, data: pd.DataFrame | DataFrameSplit) -> MLFlowPredictionsView:
+        """Makes a prediction using the in-process MLFlow model.
+
+        Args:
+            data: The input data for the prediction, either as a DataFrame or as a DataFrameSplit of validated rows.
+
+        Returns:
+            A ModelPredictionsView containing the predictions.
+        """
+
+        if isinstance(data, DataFrameSplit):
+            table = data.table
+            data = table.to_pandas() if table is not None else pd.DataFrame(data.data, columns=data.columns)
+
+        predictions = self.model.predict(data)
+        if hasattr(predictions, 'tolist'):
+            predictions = predictions.tolist()
+        return MLFlowPredictionsView(predictions=list(predictions))
+
+
+class AsyncInProcessModelProvider:
+    """Asynchronous wrapper around an InProcessModelProvider.
+
+    Scoring is CPU bound, so predictions run in a worker thread to keep the event loop responsive.
+
+    Args:
+        provider: The in-process provider to delegate to.
+    """
+
+    def __init__(self, provider: InProcessModelProvider):
+        self.provider = provider
+
+    @property
+    def model_version(self) -> Optional[str]:
+        """Identifier of the loaded model."""
+        return self.provider.model_version
+
+    async def health(self) -> bool:
+        """Checks the health of the in-process model.
+
+        Returns:
+            True once the model has been loaded.
+        """
+        return self.provider.health()
+
+    async def predict(self, data: pd.DataFrame | DataFrameSplit) -> MLFlowPredictionsView:
+        """Makes a prediction using the in-process MLFlow model in a worker thread.
+
+        Args:
+            data: The input data for the prediction, either as a DataFrame or as a DataFrameSplit of validated rows.
+
+        Returns:
+            A ModelPredictionsView containing the predictions.
+        """
+        with time_stage('model'):
+            return await asyncio.to_thread(self.provider.predict, data)
@@ -1,8 +1,26 @@
 from typing import Optional
 import httpx
 import pandas as pd
-from shared.view.mlflow_view import MLFlowPredictionsView
-import json
+from provider.v2_model_provider import fetch_v2_model_version
+from shared.instrumentation import time_stage
+from shared.view.mlflow_view import DataFrameSplit, MLFlowPredictionsView
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+def _encode_payload(data: pd.DataFrame | DataFrameSplit) -> bytes:
+    """Encodes the MLFlow `dataframe_split` request body for the given input data.
+
+    Args:
+        data: The input data for the prediction, either as a DataFrame or as already validated rows.
+
+    Returns:
+        The request body expected by the MLFlow `/invocations` endpoint.
+    """
+
+    if isinstance(data, pd.DataFrame):
+        data = DataFrameSplit.from_frame(data)
+    return data.to_json_bytes()
 
 
 class MLFlowModelProvider:
@@ -11,29 +29,31 @@ class MLFlowModelProvider:
     Args:
         model_uri: The URI of the MLFlow model.
         client: An optional httpx client for making requests. If not provided, a new client will be created.
+        model_version: An optional version of the model deployed behind the base URL.
     """
 
-    def __init__(self, base_url: str, client: Optional[httpx.Client] = None):
+    def __init__(self, base_url: str, client: Optional[httpx.Client] = None, model_version: Optional[str] = None):
         self.base_url = base_url
         self.client = client or httpx.Client()
+        self.model_version = model_version
 
     def health(self) -> bool:
         """Checks the health of the MLFlow model provider.
 
         Returns:
-            A string indicating the health status of the model provider.
+            True if the model server responds to `/ping`, False otherwise.
         """
         try:
-            response = httpx.get(f'{self.base_url}/ping')
+            response = self.client.get(f'{self.base_url}/ping')
             return response.status_code == 200
         except httpx.RequestError:
             return False
 
-    def predict(self, data: pd.DataFrame) -> MLFlowPredictionsView:
+    def predict(self, data: pd.DataFrame | DataFrameSplit) -> MLFlowPredictionsView:
         """Makes a prediction using the MLFlow model.
 
         Args:
-            data: The input data for the prediction.
+            data: The input data for the prediction, either as a DataFrame or as a DataFrameSplit of validated rows.
 
         Returns:
             A ModelPredictionsView containing the predictions.
@@ -42,10 +62,87 @@ class MLFlowModelProvider:
             HTTPStatusError: If the prediction request fails.
         """
 
-        payload = {'dataframe_split': json.loads(data.to_json(orient='split'))}
+        payload = _encode_payload(data)
 
-        response = self.client.post(f'{self.base_url}/invocations', json=payload)
+        response = self.client.post(f'{self.base_url}/invocations', content=payload, headers=_JSON_HEADERS)
         response.raise_for_status()
 
         predictions = response.json()
         return MLFlowPredictionsView.model_validate(predictions)
+
+
+class AsyncMLFlowModelProvider:
+    """Asynchronous provider for interacting with MLFlow models.
+
+    Model calls are awaited on the event loop instead of blocking a worker thread, so many in-flight predictions can
+    share a single pooled `httpx.AsyncClient`.
+
+    Args:
+        base_url: The base URL of the MLFlow model server.
+        client: An optional httpx async client for making requests. If not provided, a new client will be created.
+        model_version: An optional version of the model deployed behind the base URL.
+        model_name: An optional name the model is also served under with the V2 protocol, e.g. by MLServer, to read its
+            version from its metadata.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        client: Optional[httpx.AsyncClient] = None,
+        model_version: Optional[str] = None,
+        model_name: Optional[str] = None,
+    ):
+        self.base_url = base_url
+        self.client = client or httpx.AsyncClient()
+        self.model_version = model_version
+        self.model_name = model_name
+
+    async def health(self) -> bool:
+        """Checks the health of the MLFlow model provider.
+
+        Returns:
+            True if the model server responds to `/ping`, False otherwise.
+        """
+        try:
+            response = await self.client.get(f'{self.base_url}/ping')
+            return response.status_code == 200
+        except httpx.RequestError:
+            return False
+
+    async def fetch_model_version(self) -> Optional[str]:
+        """Reads the version of the model from its V2 metadata, when the model server also serves the V2 protocol and
+        reports one. The MLflow scoring protocol itself has no way to report it.
+
+        Returns:
+            The version of the model serving predictions, if known.
+        """
+
+        if self.model_name is not None:
+            version = await fetch_v2_model_version(self.client, self.base_url, self.model_name)
+            if version is not None:
+                self.model_version = version
+        return self.model_version
+
+    async def predict(self, data: pd.DataFrame | DataFrameSplit) -> MLFlowPredictionsView:
+        """Makes a prediction using the MLFlow model.
+
+        Args:
+            data: The input data for the prediction, either as a DataFrame or as a DataFrameSplit of validated rows.
+
+        Returns:
+            A ModelPredictionsView containing the predictions.
+
+        Raises:
+            HTTPStatusError: If the prediction request fails.
+        """
+
+        with time_stage('encode'):
+            payload = _encode_payload(data)
+
+        with time_stage('model'):
+            response = await self.client.post(f'{self.base_url}/invocations', content=payload, headers=_JSON_HEADERS)
+            response.raise_for_status()
+
+        with time_stage('decode'):
+            predictions = response.json()
+            return MLFlowPredictionsView.model_validate(predictions)
@@ -0,0 +1,49 @@
+from typing import Optional, Protocol
+import httpx
+import pandas as pd
+from shared.exceptions import UnsupportedInputError
+from shared.view.mlflow_view import DataFrameSplit, MLFlowPredictionsView
+
+
+def is_model_failure(error: Exception) -> bool:
+    """Tells whether a prediction error is caused by the model server, rather than by the request sent to it.
+
+    Args:
+        error: The error raised by a model provider.
+
+    Returns:
+        False for HTTP client errors and inputs the model cannot be sent, True for any other error.
+    """
+    if isinstance(error, UnsupportedInputError):
+        return False
+    return not (isinstance(error, httpx.HTTPStatusError) and error.response.status_code < 500)
+
+
+class ModelProvider(Protocol):
+    """Contract shared by every provider able to score the pricing model."""
+
+    model_version: Optional[str]
+    """Version of the model serving predictions, if known."""
+
+    def health(self) -> bool:
+        """Checks whether the model can currently serve predictions."""
+        ...
+
+    def predict(self, data: pd.DataFrame | DataFrameSplit) -> MLFlowPredictionsView:
+        """Scores the input data with the model."""
+        ...
+
+
+class AsyncModelProvider(Protocol):
+    """Contract shared by every asynchronous provider able to score the pricing model."""
+
+    model_version: Optional[str]
+    """Version of the model serving predictions, if known."""
+
+    async def health(self) -> bool:
+        """Checks whether the model can currently serve predictions."""
+        ...
+
+    async def predict(self, data: pd.DataFrame | DataFrameSplit) -> MLFlowPredictionsView:
+        """Scores the input data with the model."""
+        ...
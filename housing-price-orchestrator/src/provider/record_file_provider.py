@@ -0,0 +1,156 @@
+import csv
+import json
+import pathlib
+from types import TracebackType
+from typing import Any, Collection, Iterator, Literal, Optional, Type
+import pyarrow.parquet as pq
+from shared.dto.price_prediction import PricePrediction
+from shared.view.arrow_view import PREDICTION_SCHEMA, to_prediction_table
+from shared.view.response_view import PricePredictionResponseView
+
+RecordFormat = Literal['jsonl', 'csv', 'parquet']
+
+_FORMATS_BY_SUFFIX: dict[str, RecordFormat] = {
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+}
+
+CSV_NULL_VALUES = frozenset(
+    {
+        '',
+        '#N/A',
+        '#N/A N/A',
+        '#NA',
+        '-1.#IND',
+        '-1.#QNAN',
+        '-NaN',
+        '-nan',
+        '1.#IND',
+        '1.#QNAN',
+        '<NA>',
+        'N/A',
+        'NA',
+        'NULL',
+        'NaN',
+        'None',
+        'n/a',
+        'nan',
+        'null',
+    }
+)
+"""CSV values read as missing by default, those pandas reads as NaN, as the model was trained on CSV files read with
+pandas. The Kaggle data set writes missing values as `NA`."""
+
+
+def infer_record_format(path: pathlib.Path) -> RecordFormat:
+    """Infers the format of a record file from its suffix.
+
+    Args:
+        path: The path of the record file.
+
+    Returns:
+        The format of the file.
+
+    Raises:
+        ValueError: If the suffix is not a known record format.
+    """
+
+    try:
+        return _FORMATS_BY_SUFFIX[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f'Cannot infer the record format of {path}, expected one of {sorted(_FORMATS_BY_SUFFIX)}.')
+
+
+def read_records(
+    path: pathlib.Path,
+    record_format: Optional[RecordFormat] = None,
+    batch_size: int = 1000,
+    null_values: Collection[str] = CSV_NULL_VALUES,
+) -> Iterator[dict[str, Any]]:
+    """Streams records from a JSONL, CSV or Parquet file without loading the whole file in memory.
+
+    Args:
+        path: The path of the record file.
+        record_format: The format of the file, inferred from its suffix if not provided.
+        batch_size: The number of rows read from Parquet files at once.
+        null_values: The CSV values read as missing values.
+
+    Returns:
+        An iterator over the records of the file.
+    """
+
+    record_format = record_format or infer_record_format(path)
+
+    if record_format == 'jsonl':
+        with path.open() as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif record_format == 'csv':
+        null_values = frozenset(null_values)
+        with path.open(newline='') as f:
+            for row in csv.DictReader(f):
+                yield {key: value if value not in null_values else None for key, value in row.items()}
+    else:
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield from batch.to_pylist()
+
+
+class PredictionFileWriter:
+    """Incrementally writes predictions to a JSONL or Parquet file.
+
+    Predictions are written with the same field names as the API responses.
+
+    Args:
+        path: The path of the output file.
+        record_format: The format of the file, inferred from its suffix if not provided.
+    """
+
+    def __init__(self, path: pathlib.Path, record_format: Optional[RecordFormat] = None):
+        self.path = path
+        self.record_format = record_format or infer_record_format(path)
+        if self.record_format == 'csv':
+            raise ValueError('Predictions can only be written to JSONL or Parquet files.')
+
+        self._jsonl_file = path.open('w') if self.record_format == 'jsonl' else None
+        self._parquet_writer = pq.ParquetWriter(path, PREDICTION_SCHEMA) if self.record_format == 'parquet' else None
+
+    def __enter__(self) -> 'PredictionFileWriter':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def write(self, price_predictions: list[PricePrediction]) -> None:
+        """Appends predictions to the output file.
+
+        Args:
+            price_predictions: The predictions to write.
+        """
+
+        if self._jsonl_file is not None:
+            self._jsonl_file.writelines(
+                PricePredictionResponseView(id=pred.id, predicted_price=pred.predicted_price).model_dump_json(
+                    by_alias=True
+                )
+                + '\n'
+                for pred in price_predictions
+            )
+        elif self._parquet_writer is not None:
+            self._parquet_writer.write_table(to_prediction_table(price_predictions))
+
+    def close(self) -> None:
+        """Flushes and closes the output file."""
+
+        if self._jsonl_file is not None:
+            self._jsonl_file.close()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
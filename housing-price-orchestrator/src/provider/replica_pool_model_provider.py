@@ -0,0 +1,177 @@
+import asyncio
+from dataclasses import dataclass
+import random
+import time
+from typing import Callable, Optional, Sequence
+import pandas as pd
+from provider.model_provider import AsyncModelProvider, is_model_failure
+from shared.exceptions import ServiceUnavailableError
+from shared.view.mlflow_view import DataFrameSplit, MLFlowPredictionsView
+
+
+class NoHealthyReplicaError(ServiceUnavailableError):
+    """Raised when every model server replica is ejected from the pool."""
+
+
+@dataclass(slots=True)
+class _Replica:
+    """A model server replica and the state used to balance requests across replicas."""
+
+    provider: AsyncModelProvider
+    """Provider calling the replica."""
+
+    outstanding: int = 0
+    """Number of predictions currently awaited from the replica."""
+
+    failures: int = 0
+    """Number of consecutive failed predictions."""
+
+    ejected_until: Optional[float] = None
+    """Time after which an ejected replica is probed again, None while the replica is in the pool."""
+
+    probe: Optional[asyncio.Task[bool]] = None
+    """Health probe of an ejected replica, while it is running."""
+
+
+class AsyncReplicaPoolModelProvider:
+    """Asynchronous provider balancing predictions across replicas of the model server.
+
+    Each prediction goes to the replica with the fewest outstanding predictions of two replicas picked at random (power
+    of two choices), which avoids both the herding of always picking the least loaded replica and the hot spots of
+    picking at random. Replicas failing `max_failures` predictions in a row are ejected from the pool, then probed with
+    `health()` every `ejection_seconds` until they report being healthy again.
+
+    Args:
+        replicas: One provider per replica of the model server.
+        model_version: An optional version of the model deployed on the replicas.
+        max_failures: The number of consecutive failed predictions after which a replica is ejected.
+        ejection_seconds: The number of seconds between health probes of an ejected replica.
+        clock: The monotonic clock used to schedule health probes.
+        rng: The random number generator used to pick replicas.
+    """
+
+    def __init__(
+        self,
+        replicas: Sequence[AsyncModelProvider],
+        model_version: Optional[str] = None,
+        max_failures: int = 3,
+        ejection_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        if not replicas:
+            raise ValueError('At least one replica is required.')
+        self.replicas = [_Replica(provider) for provider in replicas]
+        self.model_version = model_version
+        self.max_failures = max_failures
+        self.ejection_seconds = ejection_seconds
+        self.clock = clock
+        self.rng = rng or random.Random()
+
+    @property
+    def available(self) -> list[AsyncModelProvider]:
+        """The providers of the replicas currently in the pool."""
+        return [replica.provider for replica in self.replicas if replica.ejected_until is None]
+
+    async def health(self) -> bool:
+        """Probes every replica, ejecting unhealthy replicas and bringing healthy ones back into the pool.
+
+        Returns:
+            True if at least one replica is healthy, False otherwise.
+        """
+
+        results = await asyncio.gather(*(self._probe(replica) for replica in self.replicas))
+        return any(results)
+
+    async def fetch_model_version(self) -> Optional[str]:
+        """Reads the version of the model from the replicas in the pool that can report it.
+
+        Replicas reporting different versions, e.g. during a rolling deploy, are reported as the list of their versions,
+        so the version changes both when the deploy starts and when it completes.
+
+        Returns:
+            The version of the model serving predictions, if known.
+        """
+
+        fetches = [fetch() for provider in self.available if (fetch := getattr(provider, 'fetch_model_version', None))]
+        versions = sorted({version for version in await asyncio.gather(*fetches) if version is not None})
+        if versions:
+            self.model_version = ','.join(versions)
+        return self.model_version
+
+    async def predict(self, data: pd.DataFrame | DataFrameSplit) -> MLFlowPredictionsView:
+        """Makes a prediction using one replica of the model server.
+
+        Args:
+            data: The input data for the prediction, either as a DataFrame or as a DataFrameSplit of validated rows.
+
+        Returns:
+            A ModelPredictionsView containing the predictions of the chosen replica.
+
+        Raises:
+            NoHealthyReplicaError: If every replica is ejected from the pool.
+        """
+
+        replica = self._choose()
+        replica.outstanding += 1
+        try:
+            predictions = await replica.provider.predict(data)
+        except Exception as e:
+            if is_model_failure(e):
+                self._record_failure(replica)
+            raise
+        finally:
+            replica.outstanding -= 1
+
+        replica.failures = 0
+        return predictions
+
+    async def close(self) -> None:
+        """Closes the replicas holding connections of their own, e.g. gRPC channels."""
+
+        for replica in self.replicas:
+            if replica.probe is not None:
+                replica.probe.cancel()
+            close = getattr(replica.provider, 'close', None)
+            if close is not None:
+                await close()
+
+    def _choose(self) -> _Replica:
+        """Picks the less loaded of two random replicas of the pool, and starts the probes that are due."""
+
+        now = self.clock()
+        available = []
+        for replica in self.replicas:
+            if replica.ejected_until is None:
+                available.append(replica)
+            elif replica.ejected_until <= now and replica.probe is None:
+                replica.probe = asyncio.create_task(self._probe(replica))
+
+        if not available:
+            retry_after = min(replica.ejected_until for replica in self.replicas) - now
+            raise NoHealthyReplicaError('No model server replica is healthy, please retry later.', max(retry_after, 0))
+        if len(available) == 1:
+            return available[0]
+        first, second = self.rng.sample(available, 2)
+        return first if first.outstanding <= second.outstanding else second
+
+    def _record_failure(self, replica: _Replica) -> None:
+        """Counts a failed prediction, ejecting the replica once it failed `max_failures` predictions in a row."""
+
+        replica.failures += 1
+        if replica.failures >= self.max_failures and replica.ejected_until is None:
+            replica.ejected_until = self.clock() + self.ejection_seconds
+
+    async def _probe(self, replica: _Replica) -> bool:
+        """Checks the health of a replica, updating its membership of the pool."""
+
+        try:
+            healthy = await replica.provider.health()
+        finally:
+            replica.probe = None
+
+        if healthy:
+            replica.failures, replica.ejected_until = 0, None
+        else:
+            replica.ejected_until = self.clock() + self.ejection_seconds
+        return healthy
@@ -0,0 +1,338 @@
+from typing import Any, Mapping, Optional
+import httpx
+import numpy as np
+import pandas as pd
+from shared.instrumentation import time_stage
+from shared.tracing import trace_context_metadata
+from shared.view.mlflow_view import DataFrameSplit, MLFlowPredictionsView
+from shared.view.v2_grpc_view import CONTENTS_FIELDS, GRPC_SERVICE, grpc_messages
+from shared.view.v2_view import (
+    BINARY_HEADER_LENGTH,
+    V2Datatype,
+    V2InferenceRequestView,
+    V2InferenceResponseView,
+    V2ModelMetadataView,
+    V2Tensor,
+    V2TensorView,
+    to_v2_tensors,
+)
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Decode the inputs as a DataFrame with one column per input, and BYTES inputs as strings
+_REQUEST_PARAMETERS = {'content_type': 'pd'}
+_BYTES_PARAMETERS = {'content_type': 'str'}
+
+# Model inputs and outputs of large batches easily exceed the 4MB default limits of gRPC
+_GRPC_OPTIONS = [('grpc.max_send_message_length', -1), ('grpc.max_receive_message_length', -1)]
+
+
+def _to_split(data: pd.DataFrame | DataFrameSplit) -> DataFrameSplit:
+    """Converts DataFrame inputs to a DataFrameSplit."""
+    return DataFrameSplit.from_frame(data) if isinstance(data, pd.DataFrame) else data
+
+
+def _to_predictions(tensor: Optional[V2Tensor]) -> MLFlowPredictionsView:
+    """Maps the first output tensor of a model to its predictions."""
+    return MLFlowPredictionsView(predictions=tensor.to_json() if tensor is not None else [])
+
+
+async def fetch_v2_model_version(client: httpx.AsyncClient, base_url: str, model_name: str) -> Optional[str]:
+    """Reads the version of a model from its metadata on a V2 REST model server.
+
+    Args:
+        client: The httpx async client making the request.
+        base_url: The base URL of the model server.
+        model_name: The name of the model on the server.
+
+    Returns:
+        The last version the server reports for the model, None if it reports none or serves no metadata.
+    """
+
+    try:
+        response = await client.get(f'{base_url}/v2/models/{model_name}')
+    except httpx.RequestError:
+        return None
+    if response.status_code != 200:
+        return None
+    versions = V2ModelMetadataView.model_validate_json(response.content).versions
+    return versions[-1] if versions else None
+
+
+def _import_grpc() -> Any:
+    """Imports gRPC only when the gRPC transport is used.
+
+    Raises:
+        ImportError: If gRPC is not installed.
+    """
+
+    try:
+        import grpc.aio
+    except ImportError as e:
+        raise ImportError(
+            'The V2 gRPC protocol requires grpcio and protobuf, install the "grpc" extra to use it.'
+        ) from e
+    return grpc
+
+
+class AsyncV2ModelProvider:
+    """Asynchronous provider for models served with the Open Inference (V2) REST protocol, e.g. by MLServer.
+
+    Each input column is sent as a typed tensor instead of a row of JSON values. With `binary_data`, tensors are sent
+    and received with the binary tensor data extension, as raw little endian values following a small JSON header, so
+    large batches are not encoded as JSON text. Only enable it for servers implementing the extension. String tensors
+    with missing values are still sent as JSON tensor data, with nulls the model imputes, as the raw format has none.
+
+    Args:
+        base_url: The base URL of the model server.
+        model_name: The name of the model on the server.
+        client: An optional httpx async client for making requests. If not provided, a new client will be created.
+        model_version: An optional version of the model deployed behind the base URL.
+        datatypes: An optional datatype per input column, columns without one are typed from their values.
+        binary_data: Whether to use the binary tensor data extension.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        model_name: str,
+        client: Optional[httpx.AsyncClient] = None,
+        model_version: Optional[str] = None,
+        datatypes: Optional[Mapping[str, V2Datatype]] = None,
+        binary_data: bool = False,
+    ):
+        self.base_url = base_url
+        self.model_name = model_name
+        self.client = client or httpx.AsyncClient()
+        self.model_version = model_version
+        self.datatypes = datatypes
+        self.binary_data = binary_data
+
+    async def health(self) -> bool:
+        """Checks the health of the V2 model server.
+
+        Returns:
+            True if the model server reports being ready, False otherwise.
+        """
+        try:
+            response = await self.client.get(f'{self.base_url}/v2/health/ready')
+            return response.status_code == 200
+        except httpx.RequestError:
+            return False
+
+    async def fetch_model_version(self) -> Optional[str]:
+        """Reads the version of the model from its metadata on the model server, keeping it when one is reported.
+
+        Returns:
+            The version of the model serving predictions, if known.
+        """
+
+        version = await fetch_v2_model_version(self.client, self.base_url, self.model_name)
+        if version is not None:
+            self.model_version = version
+        return self.model_version
+
+    async def predict(self, data: pd.DataFrame | DataFrameSplit) -> MLFlowPredictionsView:
+        """Makes a prediction using the V2 model.
+
+        Args:
+            data: The input data for the prediction, either as a DataFrame or as a DataFrameSplit of validated rows.
+
+        Returns:
+            A ModelPredictionsView containing the values of the first output of the model.
+
+        Raises:
+            HTTPStatusError: If the prediction request fails.
+        """
+
+        with time_stage('encode'):
+            data = _to_split(data)
+            tensors = to_v2_tensors(data, self.datatypes)
+
+            inputs, raw_contents = [], []
+            for tensor in tensors:
+                parameters = _BYTES_PARAMETERS if tensor.datatype == 'BYTES' else {}
+                # The binary tensor data extension applies per tensor, those with nulls are sent as JSON data
+                binary = self.binary_data and not tensor.has_nulls
+                if binary:
+                    raw_contents.append(tensor.to_raw())
+                    parameters = parameters | {'binary_data_size': len(raw_contents[-1])}
+                inputs.append(
+                    # The tensors are built from validated data, so their views are constructed without validation
+                    V2TensorView.model_construct(
+                        name=tensor.name,
+                        shape=[len(data)],
+                        datatype=tensor.datatype,
+                        parameters=parameters or None,
+                        data=None if binary else tensor.to_json(),
+                    )
+                )
+            parameters = _REQUEST_PARAMETERS | ({'binary_data_output': True} if self.binary_data else {})
+            request = V2InferenceRequestView.model_construct(inputs=inputs, parameters=parameters)
+            header = request.model_dump_json(exclude_none=True).encode()
+
+        with time_stage('model'):
+            response = await self.client.post(
+                f'{self.base_url}/v2/models/{self.model_name}/infer',
+                content=header + b''.join(raw_contents),
+                headers={'Content-Type': 'application/octet-stream', BINARY_HEADER_LENGTH: str(len(header))}
+                if self.binary_data
+                else _JSON_HEADERS,
+            )
+            response.raise_for_status()
+
+        with time_stage('decode'):
+            return _to_predictions(self._first_output(response))
+
+    @staticmethod
+    def _first_output(response: httpx.Response) -> Optional[V2Tensor]:
+        """Decodes the first output tensor of a response, whether it holds JSON or binary tensor data."""
+
+        body = response.content
+        header_length = int(response.headers.get(BINARY_HEADER_LENGTH, len(body)))
+        outputs = V2InferenceResponseView.model_validate_json(body[:header_length]).outputs
+        if not outputs:
+            return None
+
+        output = outputs[0]
+        if output.data is not None:
+            return V2Tensor.from_json(output.name, output.datatype, output.data)
+        size = (output.parameters or {})['binary_data_size']
+        return V2Tensor.from_raw(output.name, output.datatype, body[header_length : header_length + size])
+
+
+class AsyncV2GrpcModelProvider:
+    """Asynchronous provider for models served with the Open Inference (V2) gRPC protocol, e.g. by MLServer.
+
+    Each input column is sent as a typed tensor in the raw binary format, so large batches are neither encoded as JSON
+    text nor as one protobuf value per element. The channel is opened on first use, from the event loop serving the
+    application. Neither the raw format nor the typed contents of gRPC tensors can hold missing strings, so inputs
+    with missing categorical values are rejected rather than scored as unknown categories: serve models imputing them
+    with the REST transport.
+
+    Args:
+        target: The host and port of the gRPC server, e.g. `housing-price-model:8081`.
+        model_name: The name of the model on the server.
+        model_version: An optional version of the model deployed behind the target.
+        datatypes: An optional datatype per input column, columns without one are typed from their values.
+        channel: An optional gRPC async channel. If not provided, an insecure channel to the target will be opened.
+    """
+
+    def __init__(
+        self,
+        target: str,
+        model_name: str,
+        model_version: Optional[str] = None,
+        datatypes: Optional[Mapping[str, V2Datatype]] = None,
+        channel: Optional[Any] = None,
+    ):
+        self.target = target
+        self.model_name = model_name
+        self.model_version = model_version
+        self.datatypes = datatypes
+        self.messages = grpc_messages()
+        self.grpc = _import_grpc()
+        self._channel = channel
+
+    @property
+    def channel(self) -> Any:
+        """The gRPC channel to the model server, opened on first use."""
+        if self._channel is None:
+            self._channel = self.grpc.aio.insecure_channel(self.target, options=_GRPC_OPTIONS)
+        return self._channel
+
+    async def close(self) -> None:
+        """Closes the gRPC channel, if it was opened."""
+        if self._channel is not None:
+            await self._channel.close()
+            self._channel = None
+
+    async def health(self) -> bool:
+        """Checks the health of the V2 model server.
+
+        Returns:
+            True if the model server reports being ready, False otherwise.
+        """
+        server_ready = self.channel.unary_unary(
+            f'/{GRPC_SERVICE}/ServerReady',
+            request_serializer=self.messages.ServerReadyRequest.SerializeToString,
+            response_deserializer=self.messages.ServerReadyResponse.FromString,
+        )
+        try:
+            response = await server_ready(self.messages.ServerReadyRequest())
+            return response.ready
+        except self.grpc.RpcError:
+            return False
+
+    async def fetch_model_version(self) -> Optional[str]:
+        """Reads the version of the model from its metadata on the model server, keeping it when one is reported.
+
+        Returns:
+            The version of the model serving predictions, if known.
+        """
+
+        model_metadata = self.channel.unary_unary(
+            f'/{GRPC_SERVICE}/ModelMetadata',
+            request_serializer=self.messages.ModelMetadataRequest.SerializeToString,
+            response_deserializer=self.messages.ModelMetadataResponse.FromString,
+        )
+        try:
+            response = await model_metadata(self.messages.ModelMetadataRequest(name=self.model_name))
+        except self.grpc.RpcError:
+            return self.model_version
+        if response.versions:
+            self.model_version = response.versions[-1]
+        return self.model_version
+
+    async def predict(self, data: pd.DataFrame | DataFrameSplit) -> MLFlowPredictionsView:
+        """Makes a prediction using the V2 model.
+
+        Args:
+            data: The input data for the prediction, either as a DataFrame or as a DataFrameSplit of validated rows.
+
+        Returns:
+            A ModelPredictionsView containing the values of the first output of the model.
+
+        Raises:
+            grpc.RpcError: If the prediction request fails.
+            UnsupportedInputError: If a string column has missing values.
+        """
+
+        with time_stage('encode'):
+            data = _to_split(data)
+            request = self.messages.ModelInferRequest(model_name=self.model_name)
+            for key, value in _REQUEST_PARAMETERS.items():
+                request.parameters[key].string_param = value
+            for tensor in to_v2_tensors(data, self.datatypes):
+                tensor_input = request.inputs.add(name=tensor.name, datatype=tensor.datatype, shape=[len(data)])
+                if tensor.datatype == 'BYTES':
+                    for key, value in _BYTES_PARAMETERS.items():
+                        tensor_input.parameters[key].string_param = value
+                request.raw_input_contents.append(tensor.to_raw())
+
+        model_infer = self.channel.unary_unary(
+            f'/{GRPC_SERVICE}/ModelInfer',
+            request_serializer=self.messages.ModelInferRequest.SerializeToString,
+            response_deserializer=self.messages.ModelInferResponse.FromString,
+        )
+        with time_stage('model'):
+            response = await model_infer(request, metadata=trace_context_metadata())
+
+        with time_stage('decode'):
+            return _to_predictions(self._first_output(response))
+
+    @staticmethod
+    def _first_output(response: Any) -> Optional[V2Tensor]:
+        """Decodes the first output tensor of a response, whether it holds raw or typed contents."""
+
+        if not response.outputs:
+            return None
+
+        output = response.outputs[0]
+        if response.raw_output_contents:
+            return V2Tensor.from_raw(output.name, output.datatype, response.raw_output_contents[0])
+        values = np.array(
+            getattr(output.contents, CONTENTS_FIELDS[output.datatype]),
+            dtype=object if output.datatype == 'BYTES' else None,
+        )
+        return V2Tensor(name=output.name, datatype=output.datatype, values=values)
@@ -0,0 +1,125 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+import logging
+import time
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional
+from pydantic import ValidationError
+from service.pricing_service import PricingService
+from shared.dto.bulk_scoring_summary import BulkScoringSummary
+from shared.dto.price_prediction import PricePrediction
+from shared.view.request_view import PricePredictionBatchRequest, PricePredictionRequest
+
+logger = logging.getLogger(__name__)
+
+# Maps the model column names used by training data files to the request field names
+_FIELD_NAMES_BY_ALIAS = {
+    field.serialization_alias: name
+    for name, field in PricePredictionRequest.model_fields.items()
+    if field.serialization_alias is not None
+}
+
+
+def _normalize_record(record: Mapping[str, Any]) -> dict[str, Any]:
+    """Renames model column names, e.g. `MSSubClass`, to request field names so both naming styles validate."""
+    return {_FIELD_NAMES_BY_ALIAS.get(key, key): value for key, value in record.items()}
+
+
+class BulkScoringService:
+    """Scores large streams of records offline with a PricingService.
+
+    Records are validated and scored in chunks by a pool of worker threads. At most two chunks per worker are held in
+    memory at once and results are written in input order, so memory use stays constant regardless of the input size.
+
+    Args:
+        pricing_service: The service used to score each chunk.
+        chunk_size: The number of records scored per model call.
+        workers: The number of chunks scored concurrently.
+    """
+
+    def __init__(self, pricing_service: PricingService, chunk_size: int = 1000, workers: int = 4):
+        self.pricing_service = pricing_service
+        self.chunk_size = chunk_size
+        self.workers = workers
+
+    def score(
+        self,
+        records: Iterable[Mapping[str, Any]],
+        write: Callable[[list[PricePrediction]], None],
+        on_progress: Optional[Callable[[BulkScoringSummary], None]] = None,
+    ) -> BulkScoringSummary:
+        """Scores every record and writes the predictions in input order.
+
+        Records failing validation are logged and skipped.
+
+        Args:
+            records: The records to score, keyed by request field names or model column names.
+            write: Called with the predictions of each chunk, in input order.
+            on_progress: Optionally called with the running summary after each chunk is written.
+
+        Returns:
+            A summary of the run.
+        """
+
+        summary = BulkScoringSummary()
+        started = time.perf_counter()
+        in_flight: deque[Future[tuple[list[PricePrediction], int]]] = deque()
+
+        def collect(future: Future[tuple[list[PricePrediction], int]]) -> None:
+            price_predictions, invalid = future.result()
+            write(price_predictions)
+            summary.records_scored += len(price_predictions)
+            summary.records_invalid += invalid
+            summary.elapsed_seconds = time.perf_counter() - started
+            if on_progress is not None:
+                on_progress(summary)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                for chunk in self._chunks(records):
+                    summary.records_read += len(chunk)
+                    in_flight.append(executor.submit(self._score_chunk, summary.records_read - len(chunk), chunk))
+                    if len(in_flight) >= 2 * self.workers:
+                        collect(in_flight.popleft())
+                while in_flight:
+                    collect(in_flight.popleft())
+            except BaseException:
+                for future in in_flight:
+                    future.cancel()
+                raise
+
+        summary.elapsed_seconds = time.perf_counter() - started
+        return summary
+
+    def _chunks(self, records: Iterable[Mapping[str, Any]]) -> Iterator[list[Mapping[str, Any]]]:
+        """Splits the records into lists of at most `chunk_size` records."""
+
+        iterator = iter(records)
+        while chunk := list(islice(iterator, self.chunk_size)):
+            yield chunk
+
+    def _score_chunk(self, offset: int, chunk: list[Mapping[str, Any]]) -> tuple[list[PricePrediction], int]:
+        """Validates and scores a chunk of records.
+
+        Args:
+            offset: The position of the chunk's first record in the input, used to report invalid records.
+            chunk: The records to score.
+
+        Returns:
+            The predictions of the valid records and the number of invalid records.
+        """
+
+        price_prediction_requests = []
+        for index, record in enumerate(chunk, start=offset):
+            try:
+                price_prediction_requests.append(PricePredictionRequest.model_validate(_normalize_record(record)))
+            except ValidationError as e:
+                logger.warning('Skipping invalid record %d: %s', index, e.errors(include_url=False))
+
+        if not price_prediction_requests:
+            return [], len(chunk)
+
+        price_predictions = self.pricing_service.predict_price_batch(
+            PricePredictionBatchRequest(data=price_prediction_requests)
+        )
+        return price_predictions, len(chunk) - len(price_prediction_requests)
@@ -0,0 +1,171 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+import time
+from typing import AsyncIterator, Callable, Optional
+from provider.model_provider import is_model_failure
+from shared.exceptions import ServiceUnavailableError
+from shared.instrumentation import count_model_calls
+
+
+class ConcurrencyLimitExceededError(ServiceUnavailableError):
+    """Raised when a prediction is shed because the concurrency limit and its queue are full."""
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limits the number of predictions in flight, adapting the limit to the latency of the model.
+
+    The limit follows an additive increase, multiplicative decrease (AIMD) rule. A prediction slower than
+    `latency_tolerance` times the fastest of the last `window_size` predictions of a similar number of rows, within a
+    power of two, or failing because of the model server, is a sign of congestion: the limit is multiplied by
+    `backoff_ratio`, at most once per round of predictions, as those started before the last decrease are not counted
+    again. Any other prediction made while at least half of the limit was in use increases the limit by `1 / limit`,
+    about one slot per round of predictions. Only the latencies of successful predictions that called the model are
+    recorded: answers from the prediction cache, shed predictions and rejected requests say nothing about congestion.
+
+    Predictions beyond the limit wait in a queue of at most `max_queue_size`, for at most `max_queue_wait_ms`. Once the
+    queue is full, or the wait is over, they are shed with a ConcurrencyLimitExceededError, answered with a 503, rather
+    than piling up in front of the model and slowing every other prediction down.
+
+    Args:
+        initial_limit: The number of predictions allowed in flight at first.
+        min_limit: The lowest the limit can decrease to.
+        max_limit: The highest the limit can increase to.
+        max_queue_size: The maximum number of predictions waiting for a slot.
+        max_queue_wait_ms: An optional maximum number of milliseconds a prediction waits for a slot.
+        latency_tolerance: The ratio of the fastest recent latency above which a prediction signals congestion.
+        backoff_ratio: The ratio the limit is multiplied by on congestion.
+        window_size: The number of recent latencies the fastest latency is taken from, per number of rows.
+        clock: The monotonic clock used to measure latencies.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        max_queue_size: int = 100,
+        max_queue_wait_ms: Optional[float] = 1000.0,
+        latency_tolerance: float = 2.0,
+        backoff_ratio: float = 0.9,
+        window_size: int = 100,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not min_limit <= initial_limit <= max_limit:
+            raise ValueError('initial_limit must be between min_limit and max_limit.')
+        if not 0 < backoff_ratio < 1:
+            raise ValueError('backoff_ratio must be in (0, 1).')
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue_size = max_queue_size
+        self.max_queue_wait = max_queue_wait_ms / 1000 if max_queue_wait_ms is not None else None
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.window_size = window_size
+        self.clock = clock
+        self.shed = 0
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._latencies: dict[int, deque[float]] = {}
+        self._last_decrease_at = float('-inf')
+
+    @property
+    def limit(self) -> int:
+        """The number of predictions currently allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """The number of predictions holding a slot."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """The number of predictions waiting for a slot."""
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def acquire(self, rows: int = 1) -> AsyncIterator[None]:
+        """Holds a slot for the duration of a prediction, waiting in the queue while the limit is reached.
+
+        Args:
+            rows: The number of rows of the prediction, its latency is only compared with predictions of similar size.
+
+        Raises:
+            ConcurrencyLimitExceededError: If the queue is full, or no slot was freed within `max_queue_wait_ms`.
+        """
+
+        if self._in_flight >= self.limit or self._waiters:
+            await self._wait_for_slot()
+        else:
+            self._in_flight += 1
+
+        started = self.clock()
+        in_flight = self._in_flight
+        try:
+            with count_model_calls() as model_calls:
+                yield
+        except Exception as e:
+            congested = is_model_failure(e) and not isinstance(e, (ValueError, ServiceUnavailableError))
+            self._release(rows, started, in_flight, True if congested else None)
+            raise
+        except BaseException:
+            self._release(rows, started, in_flight, None)
+            raise
+        self._release(rows, started, in_flight, False if model_calls.count else None)
+
+    async def _wait_for_slot(self) -> None:
+        """Waits in the queue until a released slot is handed over, or sheds the prediction."""
+
+        if len(self._waiters) >= self.max_queue_size:
+            self.shed += 1
+            raise ConcurrencyLimitExceededError('Too many predictions are in flight, please retry later.')
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.max_queue_wait)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over as the wait ended, pass it on
+                self._in_flight -= 1
+                self._wake_waiters()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(e, TimeoutError):
+                self.shed += 1
+                raise ConcurrencyLimitExceededError('Too many predictions are in flight, please retry later.')
+            raise
+
+    def _release(self, rows: int, started: float, in_flight: int, congested: Optional[bool]) -> None:
+        """Frees the slot of a prediction of `rows` rows, started at `started` with `in_flight` predictions in flight.
+
+        The limit is decreased for a prediction that `congested` the model, and adapted to the latency of a successful
+        one, when `congested` is False, but left as is when its outcome says nothing about congestion. The freed slots
+        are then handed over to the waiting predictions.
+        """
+
+        self._in_flight -= 1
+        if congested is False:
+            latency = self.clock() - started
+            latencies = self._latencies.setdefault(rows.bit_length(), deque(maxlen=self.window_size))
+            latencies.append(latency)
+            congested = latency > self.latency_tolerance * min(latencies)
+            if not congested and in_flight * 2 >= self._limit:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+        if congested and started >= self._last_decrease_at:
+            self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+            self._last_decrease_at = self.clock()
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        """Hands free slots over to the predictions waiting the longest."""
+
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._in_flight += 1
@@ -0,0 +1,91 @@
+import asyncio
+from datetime import datetime, timezone
+import logging
+from typing import Optional
+from provider.model_provider import AsyncModelProvider
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Probes the health of the pricing model in the background and caches the result.
+
+    Health and readiness checks answer from the cached result instead of calling the model server, so frequent probes
+    cost neither a model call nor a new connection. Probes go through the provider, and so through its pooled client,
+    every `interval_seconds`. A probe not answering within `timeout_seconds` counts as unhealthy.
+
+    Healthy probes also read the version of the model again from the model server, when the provider can report it,
+    so predictions cached for a model replaced behind the same URL are invalidated without restarting the application.
+
+    Args:
+        pricing_model_provider: The async provider used to call the pricing model.
+        interval_seconds: The number of seconds between two probes.
+        timeout_seconds: The number of seconds after which a probe is abandoned.
+    """
+
+    def __init__(
+        self, pricing_model_provider: AsyncModelProvider, interval_seconds: float = 5.0, timeout_seconds: float = 2.0
+    ):
+        self.pricing_model_provider = pricing_model_provider
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.healthy = False
+        self.checked_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def probe(self) -> bool:
+        """Probes the health of the pricing model once and caches the result.
+
+        Returns:
+            True if the model is healthy, False otherwise.
+        """
+
+        try:
+            healthy = await asyncio.wait_for(self.pricing_model_provider.health(), self.timeout_seconds)
+        except Exception:
+            logger.exception('The pricing model health probe failed.')
+            healthy = False
+
+        if healthy:
+            await self.refresh_model_version()
+
+        if healthy != self.healthy:
+            logger.info('The pricing model is now %s.', 'healthy' if healthy else 'unhealthy')
+        self.healthy = healthy
+        self.checked_at = datetime.now(timezone.utc)
+        return healthy
+
+    async def refresh_model_version(self) -> None:
+        """Reads the version of the model from the model server, if the provider can report it."""
+
+        fetch_model_version = getattr(self.pricing_model_provider, 'fetch_model_version', None)
+        if fetch_model_version is None:
+            return
+        try:
+            await asyncio.wait_for(fetch_model_version(), self.timeout_seconds)
+        except Exception:
+            logger.exception('Reading the version of the pricing model failed.')
+
+    def start(self) -> None:
+        """Starts probing the pricing model in the background, beginning immediately."""
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops probing the pricing model."""
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Probes the pricing model every `interval_seconds` until stopped."""
+
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.interval_seconds)
@@ -0,0 +1,130 @@
+from typing import Any, Iterator, Optional
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from provider.circuit_breaker_model_provider import AsyncCircuitBreakerModelProvider
+from provider.hedging_model_provider import AsyncHedgingModelProvider
+from provider.http_client import ConnectionPoolStats
+from provider.model_provider import AsyncModelProvider
+from provider.replica_pool_model_provider import AsyncReplicaPoolModelProvider
+from service.concurrency_limiter import AdaptiveConcurrencyLimiter
+from service.prediction_cache import PredictionCache
+
+_CIRCUIT_STATES = ('closed', 'open', 'half_open')
+
+
+class OrchestratorCollector:
+    """Prometheus collector reading the counters kept by the model providers, the HTTP client, the prediction cache and
+    the concurrency limiter.
+
+    The counters are read when metrics are scraped, so the request path only increments plain attributes.
+
+    Args:
+        pricing_model_provider: The async provider used to call the pricing model, possibly wrapping other providers.
+        connection_pool_stats: Optional statistics of the connection pool of the HTTP client calling the model.
+        prediction_cache: An optional PredictionCache.
+        concurrency_limiter: An optional AdaptiveConcurrencyLimiter.
+    """
+
+    def __init__(
+        self,
+        pricing_model_provider: AsyncModelProvider,
+        connection_pool_stats: Optional[ConnectionPoolStats] = None,
+        prediction_cache: Optional[PredictionCache] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    ):
+        self.pricing_model_provider = pricing_model_provider
+        self.connection_pool_stats = connection_pool_stats
+        self.prediction_cache = prediction_cache
+        self.concurrency_limiter = concurrency_limiter
+
+    def collect(self) -> Iterator[Metric]:
+        provider: Any = self.pricing_model_provider
+        while provider is not None:
+            if isinstance(provider, AsyncCircuitBreakerModelProvider):
+                yield from self._circuit_breaker_metrics(provider)
+            elif isinstance(provider, AsyncHedgingModelProvider):
+                yield from self._hedging_metrics(provider)
+            elif isinstance(provider, AsyncReplicaPoolModelProvider):
+                yield GaugeMetricFamily(
+                    'orchestrator_model_replicas_available',
+                    'Model server replicas currently in the pool.',
+                    value=len(provider.available),
+                )
+            provider = getattr(provider, 'pricing_model_provider', None)
+
+        if self.connection_pool_stats is not None:
+            yield from self._connection_pool_metrics(self.connection_pool_stats)
+        if self.prediction_cache is not None:
+            cache_lookups = CounterMetricFamily(
+                'orchestrator_prediction_cache_lookups', 'Prediction cache lookups, by result.', labels=['result']
+            )
+            cache_lookups.add_metric(['hit'], self.prediction_cache.hits)
+            cache_lookups.add_metric(['miss'], self.prediction_cache.misses)
+            yield cache_lookups
+        if self.concurrency_limiter is not None:
+            yield from self._concurrency_limiter_metrics(self.concurrency_limiter)
+
+    @staticmethod
+    def _circuit_breaker_metrics(breaker: AsyncCircuitBreakerModelProvider) -> Iterator[Metric]:
+        state = GaugeMetricFamily(
+            'orchestrator_circuit_breaker_state', 'Current state of the model circuit breaker.', labels=['state']
+        )
+        current_state = breaker.state
+        for circuit_state in _CIRCUIT_STATES:
+            state.add_metric([circuit_state], 1 if circuit_state == current_state else 0)
+        yield state
+        yield CounterMetricFamily(
+            'orchestrator_circuit_breaker_opened', 'Times the model circuit breaker opened.', value=breaker.opened
+        )
+        yield CounterMetricFamily(
+            'orchestrator_circuit_breaker_rejected',
+            'Predictions rejected while the model circuit breaker was open.',
+            value=breaker.rejected,
+        )
+
+    @staticmethod
+    def _hedging_metrics(hedging: AsyncHedgingModelProvider) -> Iterator[Metric]:
+        yield CounterMetricFamily(
+            'orchestrator_hedged_requests', 'Model calls sent through hedging.', value=hedging.requests
+        )
+        yield CounterMetricFamily('orchestrator_hedges', 'Duplicate model calls sent by hedging.', value=hedging.hedges)
+        yield CounterMetricFamily(
+            'orchestrator_hedge_wins', 'Duplicate model calls that returned first.', value=hedging.hedge_wins
+        )
+
+    @staticmethod
+    def _concurrency_limiter_metrics(limiter: AdaptiveConcurrencyLimiter) -> Iterator[Metric]:
+        yield GaugeMetricFamily(
+            'orchestrator_concurrency_limit', 'Predictions currently allowed in flight.', value=limiter.limit
+        )
+        yield GaugeMetricFamily(
+            'orchestrator_concurrency_limit_in_flight',
+            'Predictions holding a concurrency slot.',
+            value=limiter.in_flight,
+        )
+        yield GaugeMetricFamily(
+            'orchestrator_concurrency_limit_queued', 'Predictions waiting for a concurrency slot.', value=limiter.queued
+        )
+        yield CounterMetricFamily(
+            'orchestrator_concurrency_limit_shed', 'Predictions shed by the concurrency limiter.', value=limiter.shed
+        )
+
+    @staticmethod
+    def _connection_pool_metrics(stats: ConnectionPoolStats) -> Iterator[Metric]:
+        connections = CounterMetricFamily(
+            'orchestrator_model_client_connections',
+            'Requests to the model server, by how they obtained their connection.',
+            labels=['connection'],
+        )
+        connections.add_metric(['new'], stats.new_connections)
+        connections.add_metric(['reused'], stats.reused_connections)
+        yield connections
+        yield CounterMetricFamily(
+            'orchestrator_model_client_pool_wait_seconds',
+            'Total time requests to the model server waited for a pooled connection.',
+            value=stats.pool_wait_seconds,
+        )
+        yield CounterMetricFamily(
+            'orchestrator_model_client_pool_timeouts',
+            'Requests to the model server that gave up waiting for a pooled connection.',
+            value=stats.pool_timeouts,
+        )
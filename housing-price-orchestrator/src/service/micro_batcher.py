@@ -0,0 +1,145 @@
+import asyncio
+import contextvars
+import sys
+import time
+from typing import Any, Optional
+from provider.model_provider import AsyncModelProvider
+from shared.exceptions import ServiceUnavailableError
+from shared.instrumentation import current_server_timing, observe_model_call, track_model_call
+from shared.view.mlflow_view import DataFrameSplit
+
+
+class BatchQueueFullError(ServiceUnavailableError):
+    """Raised when the micro-batcher already holds the maximum number of outstanding rows."""
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-row predictions into one model call.
+
+    Rows are collected until either `max_batch_size` rows are pending or the oldest pending row has waited
+    `max_wait_ms`, at which point they are sent to the model in a single request and every caller receives its own
+    prediction back.
+
+    Args:
+        pricing_model_provider: The async provider used to call the pricing model.
+        max_batch_size: The maximum number of rows sent to the model in one call.
+        max_wait_ms: The maximum time in milliseconds a row waits for other rows before its batch is sent.
+        max_queue_size: The maximum number of rows waiting for or being scored by the model at once.
+    """
+
+    def __init__(
+        self,
+        pricing_model_provider: AsyncModelProvider,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        max_queue_size: int = 1024,
+    ):
+        self.pricing_model_provider = pricing_model_provider
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+
+        self._pending: list[tuple[DataFrameSplit, asyncio.Future[Any]]] = []
+        self._outstanding = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batches: set[asyncio.Task[None]] = set()
+
+    @property
+    def outstanding(self) -> int:
+        """The number of rows waiting for or being scored by the model."""
+        return self._outstanding
+
+    async def submit(self, row: DataFrameSplit) -> Any:
+        """Submits a single row for prediction and waits for its result.
+
+        Args:
+            row: The model input for a single housing unit. All rows submitted to a batcher must share their columns.
+
+        Returns:
+            The model prediction for the row.
+
+        Raises:
+            BatchQueueFullError: If the batcher already holds `max_queue_size` outstanding rows.
+            ValueError: If the model did not return a prediction for the row.
+        """
+
+        if self._outstanding >= self.max_queue_size:
+            raise BatchQueueFullError('Too many predictions are queued, please retry later.')
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        self._pending.append((row, future))
+        self._outstanding += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+
+        started = time.perf_counter()
+        try:
+            prediction = await future
+            # The batch is scored in a context of its own, the model call is counted for every caller of the batch
+            observe_model_call()
+            return prediction
+        finally:
+            # The batch is scored outside of the request, so the time spent waiting for it is the model call
+            timing = current_server_timing()
+            if timing is not None:
+                timing.record('model', started, time.perf_counter())
+
+    def _flush(self) -> None:
+        """Sends the currently pending rows to the model as one batch."""
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending[: self.max_batch_size], self._pending[self.max_batch_size :]
+        if self._pending:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        if not batch:
+            return
+
+        # Score the batch in a context of its own, so that it is not attributed to the request that happened to flush it
+        task = asyncio.create_task(self._predict_batch(batch), context=contextvars.Context())
+        self._batches.add(task)
+        task.add_done_callback(self._batch_done)
+
+    def _batch_done(self, task: asyncio.Task[None]) -> None:
+        """Forgets a finished batch task, its error having been handed over to the callers of the batch."""
+
+        self._batches.discard(task)
+        if not task.cancelled():
+            task.exception()
+
+    async def _predict_batch(self, batch: list[tuple[DataFrameSplit, asyncio.Future[Any]]]) -> None:
+        """Scores a batch of rows and resolves the future of every caller in it.
+
+        Whatever ends the batch, every caller is answered: with its prediction, with the error of the model call, or
+        by cancelling its future if the batch itself was cancelled, so that no caller waits for it forever.
+        """
+
+        try:
+            input_data = DataFrameSplit(columns=batch[0][0].columns, data=[row.data[0] for row, _ in batch])
+            with track_model_call(len(input_data)):
+                predictions = await self.pricing_model_provider.predict(input_data)
+            predicted_values = predictions.predictions or []
+
+            for index, (_, future) in enumerate(batch):
+                if future.done():
+                    continue
+                if index < len(predicted_values) and predicted_values[index] is not None:
+                    future.set_result(predicted_values[index])
+                else:
+                    future.set_exception(ValueError('No predictions returned from the model.'))
+        finally:
+            self._outstanding -= len(batch)
+            error = sys.exception()
+            for _, future in batch:
+                if future.done():
+                    continue
+                if isinstance(error, Exception):
+                    future.set_exception(error)
+                else:
+                    future.cancel()
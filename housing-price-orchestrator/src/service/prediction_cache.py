@@ -0,0 +1,110 @@
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
+import time
+from typing import Any, Callable, Hashable, Optional, Sequence
+from shared.view.mlflow_view import DataFrameSplit
+
+_EXCLUDED_COLUMNS = frozenset({'Id'})
+
+
+@lru_cache(maxsize=8)
+def _key_getter(columns: tuple[str, ...]) -> Callable[[Sequence[Any]], Hashable]:
+    """Builds a getter extracting the feature values of a row, skipping identifier columns."""
+
+    indices = [index for index, column in enumerate(columns) if column not in _EXCLUDED_COLUMNS]
+    getter = itemgetter(*indices)
+    if len(indices) == 1:
+        return lambda row: (getter(row),)
+    return getter
+
+
+class PredictionCache:
+    """Bounded cache of model predictions with LRU and TTL eviction.
+
+    Entries are keyed by the tuple of a row's feature values in model column order, excluding the `Id` column, so two
+    requests describing the same property share an entry. The tuple's hash is computed natively by the dictionary
+    lookup and, unlike a digest, cannot produce false hits on collisions.
+
+    Args:
+        max_size: The maximum number of cached predictions, the least recently used entry is evicted beyond it.
+        ttl_seconds: An optional number of seconds after which an entry expires.
+        clock: The monotonic clock used to expire entries.
+    """
+
+    def __init__(
+        self, max_size: int = 10_000, ttl_seconds: Optional[float] = None, clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.model_version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys_for(self, input_data: DataFrameSplit) -> list[Hashable]:
+        """Computes the cache key of every row of the model input.
+
+        Args:
+            input_data: The model input.
+
+        Returns:
+            One key per row, in row order.
+        """
+
+        getter = _key_getter(tuple(input_data.columns))
+        return [getter(row) for row in input_data.data]
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Looks up a cached prediction, counting the lookup as a hit or a miss.
+
+        Args:
+            key: The cache key of the row.
+
+        Returns:
+            The cached prediction, or None if it is missing or expired.
+        """
+
+        entry = self._entries.get(key)
+        if entry is not None and (self.ttl_seconds is None or entry[1] > self.clock()):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, prediction: Any) -> None:
+        """Caches a prediction, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key: The cache key of the row.
+            prediction: The prediction returned by the model.
+        """
+
+        expires_at = self.clock() + self.ttl_seconds if self.ttl_seconds is not None else float('inf')
+        self._entries[key] = (prediction, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def sync_model_version(self, model_version: Optional[str]) -> None:
+        """Invalidates the cache when the model serving predictions has changed.
+
+        Args:
+            model_version: The version of the model currently serving predictions.
+        """
+
+        if model_version != self.model_version:
+            self.invalidate()
+            self.model_version = model_version
+
+    def invalidate(self) -> None:
+        """Drops every cached prediction."""
+        self._entries.clear()
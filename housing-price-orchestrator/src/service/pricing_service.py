@@ -1,15 +1,50 @@
-from provider.mlflow_model_provider import MLFlowModelProvider
+import asyncio
+from typing import Any, Optional, Sequence
+from provider.model_provider import AsyncModelProvider, ModelProvider
+from service.micro_batcher import MicroBatcher
+from service.prediction_cache import PredictionCache
+from shared.instrumentation import current_server_timing, observe_request_rows, time_stage, track_model_call
+from shared.view.mlflow_view import DataFrameSplit
 from shared.view.request_view import PricePredictionRequest, PricePredictionBatchRequest
 from shared.dto.price_prediction import PricePrediction
-import pandas as pd
+
+
+def _to_price_prediction(price_prediction_request: PricePredictionRequest, predictions: list[Any]) -> PricePrediction:
+    """Maps the model output for a single request to a PricePrediction.
+
+    Raises:
+        ValueError: If the model did not return a prediction.
+    """
+
+    predicted_price = predictions[0] if predictions else None
+
+    if predicted_price is None:
+        raise ValueError('No predictions returned from the model.')
+
+    return PricePrediction(id=price_prediction_request.id, predicted_price=predicted_price)
+
+
+def _to_price_predictions(ids: Sequence[int], predictions: list[Any]) -> list[PricePrediction]:
+    """Maps the model output for a batch of housing unit identifiers to a list of PricePredictions.
+
+    Raises:
+        ValueError: If the model did not return any predictions.
+    """
+
+    predicted_prices = predictions if predictions else []
+
+    if not predicted_prices:
+        raise ValueError('No predictions returned from the model.')
+
+    return [PricePrediction(id=id, predicted_price=price) for id, price in zip(ids, predicted_prices)]
 
 
 class PricingService:
-    def __init__(self, pricing_model_provider: MLFlowModelProvider):
+    def __init__(self, pricing_model_provider: ModelProvider):
         self.pricing_model_provider = pricing_model_provider
 
     def predict_price(self, price_prediction_request: PricePredictionRequest) -> PricePrediction:
-        """Predicts the price using the MLFlow model provider.
+        """Predicts the price using the model provider.
 
         Args:
             data: The input data for the prediction.
@@ -18,36 +53,196 @@ class PricingService:
             A view containing the predictions.
         """
 
-        input_data = price_prediction_request.model_dump(by_alias=True)
+        input_data = DataFrameSplit.from_views([price_prediction_request])
+        predictions = self.pricing_model_provider.predict(input_data)
+        return _to_price_prediction(price_prediction_request, predictions.predictions)
 
-        input_df = pd.DataFrame([input_data])
-        predictions = self.pricing_model_provider.predict(input_df)
-        predicted_price = predictions.predictions[0] if predictions.predictions else None
+    def predict_price_batch(self, price_prediction_batch_request: PricePredictionBatchRequest) -> list[PricePrediction]:
+        """Predicts the prices for a batch of requests using the model provider.
 
-        if predicted_price is None:
-            raise ValueError('No predictions returned from the model.')
+        Args:
+            price_prediction_batch_request: The batch request containing multiple price prediction requests.
 
-        return PricePrediction(id=price_prediction_request.id, predicted_price=predicted_price)
+        Returns:
+            A list of views containing the predictions.
+        """
 
-    def predict_price_batch(self, price_prediction_batch_request: PricePredictionBatchRequest) -> list[PricePrediction]:
-        """Predicts the prices for a batch of requests using the MLFlow model provider.
+        input_data = DataFrameSplit.from_views(price_prediction_batch_request.data)
+        predictions = self.pricing_model_provider.predict(input_data)
+        return _to_price_predictions([req.id for req in price_prediction_batch_request.data], predictions.predictions)
+
+
+class AsyncPricingService:
+    """Asynchronous variant of the PricingService, backed by an AsyncModelProvider.
+
+    Args:
+        pricing_model_provider: The async provider used to call the pricing model.
+        micro_batcher: An optional MicroBatcher. When provided, concurrent single predictions are coalesced into
+            batched model calls.
+        prediction_cache: An optional PredictionCache. When provided, rows whose features were recently scored are
+            answered from the cache and only the remaining rows are sent to the model.
+        batch_chunk_size: An optional maximum number of rows per model call. Larger inputs are split into chunks that
+            are sent to the model concurrently.
+        batch_max_concurrency: The maximum number of chunks of a single input in flight at once.
+    """
+
+    def __init__(
+        self,
+        pricing_model_provider: AsyncModelProvider,
+        micro_batcher: Optional[MicroBatcher] = None,
+        prediction_cache: Optional[PredictionCache] = None,
+        batch_chunk_size: Optional[int] = None,
+        batch_max_concurrency: int = 1,
+    ):
+        self.pricing_model_provider = pricing_model_provider
+        self.micro_batcher = micro_batcher
+        self.prediction_cache = prediction_cache
+        self.batch_chunk_size = batch_chunk_size
+        self.batch_max_concurrency = batch_max_concurrency
+
+    async def predict_price(self, price_prediction_request: PricePredictionRequest) -> PricePrediction:
+        """Predicts the price using the async model provider.
+
+        Args:
+            price_prediction_request: The input data for the prediction.
+
+        Returns:
+            The price prediction for the request.
+
+        Raises:
+            ValueError: If the model did not return a prediction.
+            BatchQueueFullError: If micro-batching is enabled and its queue is full.
+        """
+
+        observe_request_rows(1)
+        with time_stage('model_input'):
+            input_data = DataFrameSplit.from_views([price_prediction_request])
+        predictions = await self._predict(input_data)
+        return _to_price_prediction(price_prediction_request, predictions)
+
+    async def predict_price_batch(
+        self, price_prediction_batch_request: PricePredictionBatchRequest
+    ) -> list[PricePrediction]:
+        """Predicts the prices for a batch of requests using the async model provider.
 
         Args:
             price_prediction_batch_request: The batch request containing multiple price prediction requests.
 
         Returns:
-            A list of views containing the predictions.
+            A list of price predictions, in the same order as the requests.
+
+        Raises:
+            ValueError: If the model did not return any predictions.
+        """
+
+        observe_request_rows(len(price_prediction_batch_request.data))
+        with time_stage('model_input'):
+            input_data = DataFrameSplit.from_views(price_prediction_batch_request.data)
+        predictions = await self._predict(input_data)
+        return _to_price_predictions([req.id for req in price_prediction_batch_request.data], predictions)
+
+    async def predict_price_columnar(self, input_data: DataFrameSplit) -> list[PricePrediction]:
+        """Predicts the prices for a batch already validated column-wise into the model input.
+
+        Args:
+            input_data: The model input, with an `Id` column identifying each housing unit.
+
+        Returns:
+            A list of price predictions, in the same order as the rows.
+
+        Raises:
+            ValueError: If the model did not return any predictions.
+        """
+
+        observe_request_rows(len(input_data))
+        id_index = input_data.columns.index('Id')
+        predictions = await self._predict(input_data)
+        table = input_data.table
+        ids = table.column(id_index).to_pylist() if table is not None else [row[id_index] for row in input_data.data]
+        return _to_price_predictions(ids, predictions)
+
+    async def _predict(self, input_data: DataFrameSplit) -> list[Any]:
+        """Predicts every row of the model input, answering from the prediction cache where possible.
+
+        Identical rows missing from the cache are only scored once.
+
+        Raises:
+            ValueError: If the model returned fewer predictions than the rows sent to it.
         """
 
-        input_data = price_prediction_batch_request.model_dump(by_alias=True)
-        input_df = pd.DataFrame(input_data['data'])
-        predictions = self.pricing_model_provider.predict(input_df)
-        predicted_prices = predictions.predictions if predictions.predictions else []
+        if self.prediction_cache is None:
+            return await self._score(input_data)
+
+        self.prediction_cache.sync_model_version(self.pricing_model_provider.model_version)
+        keys = self.prediction_cache.keys_for(input_data)
+        predictions = [self.prediction_cache.get(key) for key in keys]
 
-        if not predicted_prices:
+        missing: dict[Any, int] = {}
+        hits = 0
+        for index, (key, prediction) in enumerate(zip(keys, predictions)):
+            if prediction is not None:
+                hits += 1
+            elif key not in missing:
+                missing[key] = index
+        timing = current_server_timing()
+        if timing is not None:
+            timing.cache = 'hit' if hits == len(keys) else 'miss' if hits == 0 else 'partial'
+        if not missing:
+            return predictions
+
+        missing_data = DataFrameSplit(columns=input_data.columns, data=[input_data.data[i] for i in missing.values()])
+        scored = await self._score(missing_data)
+        if len(scored) < len(missing_data):
             raise ValueError('No predictions returned from the model.')
 
-        return [
-            PricePrediction(id=req.id, predicted_price=price)
-            for req, price in zip(price_prediction_batch_request.data, predicted_prices)
-        ]
+        scored_by_key = dict(zip(missing, scored))
+        for key, prediction in scored_by_key.items():
+            self.prediction_cache.put(key, prediction)
+        return [scored_by_key[key] if prediction is None else prediction for key, prediction in zip(keys, predictions)]
+
+    async def _score(self, input_data: DataFrameSplit) -> list[Any]:
+        """Sends the model input to the model.
+
+        Single rows go through the micro-batcher when it is enabled, and inputs larger than the chunk size are split
+        into chunks scored concurrently.
+        """
+
+        if self.micro_batcher is not None and len(input_data) == 1:
+            return [await self.micro_batcher.submit(input_data)]
+
+        if self.batch_chunk_size is not None and len(input_data) > self.batch_chunk_size:
+            return await self._score_chunks(input_data)
+
+        with track_model_call(len(input_data)):
+            predictions = await self.pricing_model_provider.predict(input_data)
+        return predictions.predictions or []
+
+    async def _score_chunks(self, input_data: DataFrameSplit) -> list[Any]:
+        """Scores the model input in chunks of at most `batch_chunk_size` rows, with bounded parallelism.
+
+        Raises:
+            ValueError: If the model returned fewer predictions than the rows of a chunk.
+        """
+
+        semaphore = asyncio.Semaphore(self.batch_max_concurrency)
+
+        async def score_chunk(start: int) -> list[Any]:
+            chunk = DataFrameSplit(
+                columns=input_data.columns, data=input_data.data[start : start + self.batch_chunk_size]
+            )
+            async with semaphore:
+                with track_model_call(len(chunk)):
+                    predictions = await self.pricing_model_provider.predict(chunk)
+            if len(predictions.predictions or []) < len(chunk):
+                raise ValueError('No predictions returned from the model.')
+            return predictions.predictions
+
+        tasks = [asyncio.create_task(score_chunk(start)) for start in range(0, len(input_data), self.batch_chunk_size)]
+        try:
+            chunk_predictions = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return [prediction for predictions in chunk_predictions for prediction in predictions]
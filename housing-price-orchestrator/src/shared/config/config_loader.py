@@ -1,12 +1,162 @@
 from functools import lru_cache
 import pathlib
-from typing import Tuple, Type
-from pydantic import BaseModel
+from typing import Literal, Optional, Tuple, Type
+from pydantic import BaseModel, Field, model_validator
 from pydantic_settings import BaseSettings, PydanticBaseSettingsSource, SettingsConfigDict, YamlConfigSettingsSource
 
 
+class MicroBatchingSettings(BaseModel):
+    enabled: bool = False
+    max_batch_size: int = Field(default=64, ge=1)
+    max_wait_ms: float = Field(default=5.0, ge=0)
+    max_queue_size: int = Field(default=1024, ge=1)
+
+
+class PredictionCacheSettings(BaseModel):
+    enabled: bool = False
+    max_size: int = Field(default=10_000, ge=1)
+    ttl_seconds: Optional[float] = Field(default=300.0, gt=0)
+
+
+class BatchFanOutSettings(BaseModel):
+    chunk_size: Optional[int] = Field(default=None, ge=1)
+    max_concurrency: int = Field(default=4, ge=1)
+
+
+class StreamingSettings(BaseModel):
+    chunk_size: int = Field(default=500, ge=1)
+    max_line_bytes: int = Field(default=65_536, ge=1)
+
+
+class V2ProtocolSettings(BaseModel):
+    model_name: str = 'mlflow-model'
+    transport: Literal['rest', 'grpc'] = 'grpc'
+    grpc_target: str | list[str] = 'housing-price-model:8081'
+    binary_data: bool = False
+
+    @property
+    def grpc_targets(self) -> list[str]:
+        """The targets of every replica of the gRPC model server."""
+        return [self.grpc_target] if isinstance(self.grpc_target, str) else self.grpc_target
+
+
+class LoadBalancingSettings(BaseModel):
+    max_failures: int = Field(default=3, ge=1)
+    ejection_seconds: float = Field(default=10.0, gt=0)
+
+
+class HedgingSettings(BaseModel):
+    enabled: bool = False
+    percentile: float = Field(default=95.0, gt=0, lt=100)
+    max_hedge_ratio: float = Field(default=0.1, gt=0, le=1)
+    max_hedge_burst: float = Field(default=10.0, ge=1)
+    window_size: int = Field(default=1000, ge=1)
+    min_samples: int = Field(default=20, ge=1)
+
+
+class CircuitBreakerSettings(BaseModel):
+    enabled: bool = False
+    failure_rate_threshold: float = Field(default=0.5, gt=0, le=1)
+    slow_call_seconds: Optional[float] = Field(default=None, gt=0)
+    window_size: int = Field(default=20, ge=1)
+    min_calls: int = Field(default=10, ge=1)
+    open_seconds: float = Field(default=30.0, gt=0)
+    half_open_max_calls: int = Field(default=3, ge=1)
+
+
+class ConcurrencyLimitSettings(BaseModel):
+    enabled: bool = False
+    initial_limit: int = Field(default=20, ge=1)
+    min_limit: int = Field(default=1, ge=1)
+    max_limit: int = Field(default=200, ge=1)
+    max_queue_size: int = Field(default=100, ge=0)
+    max_queue_wait_ms: Optional[float] = Field(default=1000.0, gt=0)
+    latency_tolerance: float = Field(default=2.0, gt=1)
+    backoff_ratio: float = Field(default=0.9, gt=0, lt=1)
+    window_size: int = Field(default=100, ge=1)
+
+    @model_validator(mode='after')
+    def check_limits(self) -> 'ConcurrencyLimitSettings':
+        if not self.min_limit <= self.initial_limit <= self.max_limit:
+            raise ValueError('initial_limit must be between min_limit and max_limit')
+        return self
+
+
+class HealthCheckSettings(BaseModel):
+    interval_seconds: float = Field(default=5.0, gt=0)
+    timeout_seconds: float = Field(default=2.0, gt=0)
+
+
+class HttpClientSettings(BaseModel):
+    max_connections: Optional[int] = Field(default=100, ge=1)
+    max_keepalive_connections: Optional[int] = Field(default=20, ge=0)
+    keepalive_expiry: Optional[float] = Field(default=5.0, ge=0)
+    http2: bool = False
+    connect_timeout: Optional[float] = Field(default=5.0, gt=0)
+    read_timeout: Optional[float] = Field(default=5.0, gt=0)
+    write_timeout: Optional[float] = Field(default=5.0, gt=0)
+    pool_timeout: Optional[float] = Field(default=5.0, gt=0)
+
+
+class TracingSettings(BaseModel):
+    enabled: bool = False
+    sample_ratio: float = Field(default=0.01, ge=0, le=1)
+    exporter: Literal['console', 'file', 'otlp'] = 'console'
+    otlp_endpoint: Optional[str] = None
+    file_path: Optional[str] = None
+    service_name: str = 'housing-price-orchestrator'
+
+    @model_validator(mode='after')
+    def check_file_path(self) -> 'TracingSettings':
+        if self.exporter == 'file' and not self.file_path:
+            raise ValueError('file_path is required when exporter is file')
+        return self
+
+
+class ServerTimingSettings(BaseModel):
+    enabled: bool = False
+
+
+class ProfilingSettings(BaseModel):
+    enabled: bool = False
+    sample_interval_ms: float = Field(default=5.0, gt=0)
+    max_seconds: float = Field(default=60.0, gt=0)
+    slow_request_ms: Optional[float] = Field(default=None, gt=0)
+    slow_request_sample_ratio: float = Field(default=1.0, gt=0, le=1)
+
+
 class Settings(BaseModel):
-    pricing_model_url: str
+    pricing_model_url: str | list[str]
+    pricing_model_provider: Literal['http', 'in_process', 'v2'] = 'http'
+    pricing_model_uri: Optional[str] = None
+    pricing_model_version: Optional[str] = None
+    micro_batching: MicroBatchingSettings = MicroBatchingSettings()
+    prediction_cache: PredictionCacheSettings = PredictionCacheSettings()
+    batch_fan_out: BatchFanOutSettings = BatchFanOutSettings()
+    streaming: StreamingSettings = StreamingSettings()
+    v2_protocol: V2ProtocolSettings = V2ProtocolSettings()
+    load_balancing: LoadBalancingSettings = LoadBalancingSettings()
+    hedging: HedgingSettings = HedgingSettings()
+    circuit_breaker: CircuitBreakerSettings = CircuitBreakerSettings()
+    concurrency_limit: ConcurrencyLimitSettings = ConcurrencyLimitSettings()
+    health_check: HealthCheckSettings = HealthCheckSettings()
+    http_client: HttpClientSettings = HttpClientSettings()
+    tracing: TracingSettings = TracingSettings()
+    server_timing: ServerTimingSettings = ServerTimingSettings()
+    profiling: ProfilingSettings = ProfilingSettings()
+
+    @property
+    def pricing_model_urls(self) -> list[str]:
+        """The URLs of every replica of the model server."""
+        return [self.pricing_model_url] if isinstance(self.pricing_model_url, str) else self.pricing_model_url
+
+    @model_validator(mode='after')
+    def check_pricing_model_uri(self) -> 'Settings':
+        if self.pricing_model_provider == 'in_process' and not self.pricing_model_uri:
+            raise ValueError('pricing_model_uri is required when pricing_model_provider is in_process')
+        if not self.pricing_model_urls:
+            raise ValueError('pricing_model_url must hold at least one URL')
+        return self
 
 
 class Config(BaseSettings):
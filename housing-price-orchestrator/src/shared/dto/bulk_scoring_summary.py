@@ -0,0 +1,23 @@
+from pydantic import Field
+from shared.data_model_base import DTOBase
+
+
+class BulkScoringSummary(DTOBase):
+    """Data Transfer Object describing the progress of a bulk scoring run."""
+
+    records_read: int = Field(default=0, ge=0)
+    """Number of records read from the input."""
+
+    records_scored: int = Field(default=0, ge=0)
+    """Number of records scored and written to the output."""
+
+    records_invalid: int = Field(default=0, ge=0)
+    """Number of records skipped because they failed validation."""
+
+    elapsed_seconds: float = Field(default=0.0, ge=0)
+    """Time elapsed since the run started."""
+
+    @property
+    def throughput(self) -> float:
+        """Number of records scored per second."""
+        return self.records_scored / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
@@ -0,0 +1,18 @@
+from typing import Optional
+
+
+class ServiceUnavailableError(Exception):
+    """Raised when a request cannot be served right now and the client should retry later.
+
+    Args:
+        message: A description of why the request was rejected.
+        retry_after: An optional number of seconds after which the client may retry.
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class UnsupportedInputError(Exception):
+    """Raised when valid input data cannot be sent to the model with the protocol in use, answered with a 422."""
@@ -0,0 +1,308 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import cache
+import time
+from typing import Any, Callable, Iterator, Literal, Optional
+from prometheus_client import Counter, Gauge, Histogram
+from shared.tracing import tracer
+
+Stage = Literal['validation', 'model_input', 'encode', 'model', 'decode', 'response']
+"""Stages of a prediction request: validating the request, building the model input from it, encoding the model
+request, the round trip to the model, decoding the model response, and building the orchestrator response."""
+
+# Buckets from 100us, for in-process stages of single predictions, to 10s, for model calls of large batches
+_SECONDS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+_ROWS_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000)
+
+REQUEST_SECONDS = Histogram(
+    'orchestrator_request_duration_seconds',
+    'Time spent serving a request, by route.',
+    ['route'],
+    buckets=_SECONDS_BUCKETS,
+)
+REQUESTS = Counter('orchestrator_requests_total', 'Requests served, by route and status code.', ['route', 'status'])
+REQUESTS_IN_FLIGHT = Gauge('orchestrator_requests_in_flight', 'Requests currently being served.')
+STAGE_SECONDS = Histogram(
+    'orchestrator_stage_duration_seconds',
+    'Time spent in each stage of a prediction request.',
+    ['stage'],
+    buckets=_SECONDS_BUCKETS,
+)
+STAGE_ERRORS = Counter(
+    'orchestrator_stage_errors_total', 'Errors raised by each stage of a prediction request.', ['stage', 'error']
+)
+REQUEST_ROWS = Histogram('orchestrator_request_rows', 'Housing units per prediction request.', buckets=_ROWS_BUCKETS)
+MODEL_CALL_ROWS = Histogram('orchestrator_model_call_rows', 'Rows sent per model call.', buckets=_ROWS_BUCKETS)
+MODEL_CALLS_IN_FLIGHT = Gauge('orchestrator_model_calls_in_flight', 'Model calls currently awaited.')
+
+CacheStatus = Literal['hit', 'miss', 'partial']
+"""Whether every row of a request was answered from the prediction cache, none of them, or only some."""
+
+
+class ServerTiming:
+    """Durations of the stages of a request, reported to its caller in a `Server-Timing` response header, or in the
+    slow-request log.
+
+    A stage run several times by a request, e.g. the model call of each chunk of a batch, is reported for the wall time
+    during which at least one of its runs was in progress, so that concurrent runs are not counted twice.
+    """
+
+    def __init__(self) -> None:
+        self.cache: Optional[CacheStatus] = None
+        self.rows: Optional[int] = None
+        self._intervals: dict[str, list[tuple[float, float]]] = {}
+
+    def record(self, name: str, started: float, ended: float) -> None:
+        """Records a run of a stage.
+
+        Args:
+            name: The name of the stage.
+            started: The `time.perf_counter()` value at which the run started.
+            ended: The `time.perf_counter()` value at which the run ended.
+        """
+        self._intervals.setdefault(name, []).append((started, ended))
+
+    def durations_ms(self) -> dict[str, float]:
+        """Returns the duration of every recorded stage, in milliseconds."""
+        return {name: _union_seconds(intervals) * 1000 for name, intervals in self._intervals.items()}
+
+    def header(self, total_seconds: float) -> Optional[str]:
+        """Builds the `Server-Timing` header value, with durations in milliseconds.
+
+        Args:
+            total_seconds: The time spent serving the request.
+
+        Returns:
+            The header value, or None if no stage was recorded.
+        """
+
+        if not self._intervals and self.cache is None:
+            return None
+
+        metrics = [f'{name};dur={duration:.3f}' for name, duration in self.durations_ms().items()]
+        if self.cache is not None:
+            metrics.append(f'cache;desc={self.cache}')
+        metrics.append(f'total;dur={total_seconds * 1000:.3f}')
+        return ', '.join(metrics)
+
+
+def _union_seconds(intervals: list[tuple[float, float]]) -> float:
+    """Returns the time covered by at least one of the given intervals."""
+
+    total = 0.0
+    covered_until = float('-inf')
+    for started, ended in sorted(intervals):
+        if ended > covered_until:
+            total += ended - max(started, covered_until)
+            covered_until = ended
+    return total
+
+
+@dataclass
+class ModelCalls:
+    """Number of model calls made on behalf of a prediction, by the task predicting it and the tasks it starts."""
+
+    count: int = 0
+
+
+_request_started: ContextVar[Optional[float]] = ContextVar('request_started', default=None)
+_server_timing: ContextVar[Optional[ServerTiming]] = ContextVar('server_timing', default=None)
+_model_calls: ContextVar[Optional[ModelCalls]] = ContextVar('model_calls', default=None)
+
+
+def current_server_timing() -> Optional[ServerTiming]:
+    """Returns the ServerTiming of the current request, or None if neither Server-Timing headers nor the slow-request
+    log are enabled."""
+    return _server_timing.get()
+
+
+@contextmanager
+def request_timing() -> Iterator[ServerTiming]:
+    """Records the stage timings of the current request, sharing them with any outer middleware already recording them.
+
+    Yields:
+        The ServerTiming of the current request.
+    """
+
+    timing = _server_timing.get() or ServerTiming()
+    token = _server_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _server_timing.reset(token)
+
+
+def observe_request_rows(rows: int) -> None:
+    """Records the number of housing units of the current prediction request.
+
+    Args:
+        rows: The number of housing units to predict.
+    """
+
+    REQUEST_ROWS.observe(rows)
+    timing = _server_timing.get()
+    if timing is not None:
+        timing.rows = rows
+
+
+@cache
+def _stage_metrics(stage: Stage) -> tuple[Any, Callable[[str], Any]]:
+    """Binds the metrics of a stage once, so that timing it does not look its labels up again."""
+    return STAGE_SECONDS.labels(stage), lambda error: STAGE_ERRORS.labels(stage, error)
+
+
+@contextmanager
+def time_stage(stage: Stage) -> Iterator[None]:
+    """Times a stage of a prediction request, counting the errors it raises, and traces it as a span.
+
+    Args:
+        stage: The stage being timed.
+    """
+
+    histogram, errors = _stage_metrics(stage)
+    started = time.perf_counter()
+    try:
+        with tracer.start_as_current_span(stage):
+            yield
+    except Exception as e:
+        errors(type(e).__name__).inc()
+        raise
+    finally:
+        ended = time.perf_counter()
+        histogram.observe(ended - started)
+        timing = _server_timing.get()
+        if timing is not None:
+            timing.record(stage, started, ended)
+
+
+def observe_stage_since_request_started(stage: Stage) -> None:
+    """Records the time elapsed since the current request was received as a stage, and its span, e.g. for the body
+    validation done by FastAPI before an endpoint is called.
+
+    Args:
+        stage: The stage that ran since the request was received.
+    """
+
+    started = _request_started.get()
+    if started is not None:
+        ended = time.perf_counter()
+        _stage_metrics(stage)[0].observe(ended - started)
+        tracer.start_span(stage, start_time=time.time_ns() - int((ended - started) * 1e9)).end()
+        timing = _server_timing.get()
+        if timing is not None:
+            timing.record(stage, started, ended)
+
+
+@contextmanager
+def count_model_calls() -> Iterator[ModelCalls]:
+    """Counts the model calls made on behalf of the current prediction, e.g. to tell answers from the prediction cache
+    apart from predictions of the model.
+
+    Yields:
+        The ModelCalls of the current prediction, counted until the context exits.
+    """
+
+    calls = ModelCalls()
+    token = _model_calls.set(calls)
+    try:
+        yield calls
+    finally:
+        _model_calls.reset(token)
+
+
+def observe_model_call() -> None:
+    """Counts a model call made on behalf of the current prediction, if its model calls are counted."""
+
+    calls = _model_calls.get()
+    if calls is not None:
+        calls.count += 1
+
+
+@contextmanager
+def track_model_call(rows: int) -> Iterator[None]:
+    """Tracks a model call, recording its number of rows and counting it as in flight until it returns.
+
+    Args:
+        rows: The number of rows sent to the model.
+    """
+
+    observe_model_call()
+    MODEL_CALL_ROWS.observe(rows)
+    MODEL_CALLS_IN_FLIGHT.inc()
+    try:
+        yield
+    finally:
+        MODEL_CALLS_IN_FLIGHT.dec()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording the duration, status code and concurrency of the requests served by the application.
+
+    Requests are labelled with the path template of their route, e.g. `/api/v1/price/predict`, and unmatched requests
+    share a single label, so that the number of label values stays bounded.
+
+    Args:
+        app: The ASGI application to instrument.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        token = _request_started.set(started)
+        status = 500
+
+        async def send_with_status(message: dict[str, Any]) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            _request_started.reset(token)
+            route = getattr(scope.get('route'), 'path', 'unmatched')
+            REQUEST_SECONDS.labels(route).observe(time.perf_counter() - started)
+            REQUESTS.labels(route, str(status)).inc()
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware reporting the durations of the stages of each request in a `Server-Timing` response header, so
+    that clients can attribute the latency of the orchestrator without access to its metrics.
+
+    Only responses of requests that ran a timed stage carry the header. The header is sent with the response status, so
+    stages running while a streamed response is sent are not reported.
+
+    Args:
+        app: The ASGI application to instrument.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with request_timing() as timing:
+
+            async def send_with_timing(message: dict[str, Any]) -> None:
+                if message['type'] == 'http.response.start':
+                    header = timing.header(time.perf_counter() - started)
+                    if header is not None:
+                        headers = [*message.get('headers', []), (b'server-timing', header.encode())]
+                        message = message | {'headers': headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
@@ -0,0 +1,194 @@
+import asyncio
+from collections import Counter
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Any, Callable, Optional, Sequence
+from shared.instrumentation import request_timing
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is being recorded."""
+
+
+class SamplingProfiler:
+    """Statistical profiler sampling the call stacks of every thread of the process at a fixed interval.
+
+    Profiles are returned in the folded stacks format, one `frame;frame;...;frame count` line per distinct stack, read
+    by flamegraph.pl, speedscope and most other flame graph tools. Only stacks running code from `include_paths` are
+    kept, e.g. the pricing service and model providers. As the event loop only runs one coroutine at a time, samples
+    show where CPU time is spent: a coroutine awaiting the model does not appear until the model responds.
+
+    Args:
+        interval_seconds: The number of seconds between two samples.
+        include_paths: Path prefixes of the source files whose stacks are kept, all stacks are kept if empty.
+    """
+
+    def __init__(self, interval_seconds: float = 0.005, include_paths: Sequence[str] = ()):
+        self.interval_seconds = interval_seconds
+        self.include_paths = tuple(include_paths)
+        self._running = False
+        self._requests_left: Optional[int] = None
+        self._requests_done: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether a profile is being recorded."""
+        return self._running
+
+    async def profile(self, seconds: float, requests: Optional[int] = None) -> str:
+        """Records a profile for `seconds`, or until `requests` requests finished if that happens first.
+
+        Args:
+            seconds: The maximum number of seconds to record the profile for.
+            requests: An optional number of finished requests after which the profile stops.
+
+        Returns:
+            The profile, in the folded stacks format, most sampled stacks first.
+
+        Raises:
+            ProfilerBusyError: If another profile is being recorded.
+        """
+
+        if self._running:
+            raise ProfilerBusyError('A profile is already being recorded.')
+
+        self._running = True
+        self._requests_left = requests
+        self._requests_done = asyncio.Event()
+        stacks: Counter[str] = Counter()
+        stop = threading.Event()
+        sampler = threading.Thread(target=self._sample, args=(stacks, stop), name='sampling-profiler', daemon=True)
+        sampler.start()
+        try:
+            await asyncio.wait_for(self._requests_done.wait(), seconds)
+        except TimeoutError:
+            pass
+        finally:
+            stop.set()
+            sampler.join()
+            self._running = False
+            self._requests_left = None
+            self._requests_done = None
+
+        return ''.join(f'{stack} {count}\n' for stack, count in stacks.most_common())
+
+    def request_finished(self) -> None:
+        """Counts a finished request towards the number of requests the current profile stops after, if any."""
+
+        if self._requests_left is None or self._requests_done is None:
+            return
+        self._requests_left -= 1
+        if self._requests_left <= 0:
+            self._requests_done.set()
+
+    def _sample(self, stacks: Counter[str], stop: threading.Event) -> None:
+        """Samples the stacks of the other threads every `interval_seconds` until stopped."""
+
+        sampler_id = threading.get_ident()
+        while not stop.wait(self.interval_seconds):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_id:
+                    continue
+                stack = self._fold(frame)
+                if stack is not None:
+                    stacks[stack] += 1
+
+    def _fold(self, frame: Optional[FrameType]) -> Optional[str]:
+        """Folds the stack ending at the given frame into a `;` separated line, root first, or returns None if it does
+        not run code from `include_paths`."""
+
+        names = []
+        included = not self.include_paths
+        while frame is not None:
+            code = frame.f_code
+            included = included or code.co_filename.startswith(self.include_paths)
+            names.append(f'{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+            frame = frame.f_back
+        return ';'.join(reversed(names)) if included else None
+
+
+class RequestProfilingMiddleware:
+    """ASGI middleware counting finished prediction requests for the sampling profiler and logging slow requests.
+
+    A request taking longer than `slow_request_seconds` is logged, for a `sample_ratio` of them, with its stage timings
+    and the shape of its payload: its content type, size and number of housing units, never its values.
+
+    Args:
+        app: The ASGI application to instrument.
+        profiler: An optional SamplingProfiler counting the finished requests.
+        slow_request_seconds: An optional number of seconds above which requests are logged.
+        sample_ratio: The ratio of slow requests that are logged.
+        rng: An optional random number generator sampling the slow requests to log.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        profiler: Optional[SamplingProfiler] = None,
+        slow_request_seconds: Optional[float] = None,
+        sample_ratio: float = 1.0,
+        rng: Optional[random.Random] = None,
+    ):
+        self.app = app
+        self.profiler = profiler
+        self.slow_request_seconds = slow_request_seconds
+        self.sample_ratio = sample_ratio
+        self.rng = rng or random.Random()
+
+    async def __call__(self, scope: dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        body_bytes = 0
+        status = 500
+
+        async def receive_counting_bytes() -> dict[str, Any]:
+            nonlocal body_bytes
+            message = await receive()
+            if message['type'] == 'http.request':
+                body_bytes += len(message.get('body', b''))
+            return message
+
+        async def send_with_status(message: dict[str, Any]) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        with request_timing() as timing:
+            try:
+                await self.app(scope, receive_counting_bytes, send_with_status)
+            finally:
+                elapsed = time.perf_counter() - started
+                if self.profiler is not None and timing.rows is not None:
+                    self.profiler.request_finished()
+                if (
+                    self.slow_request_seconds is not None
+                    and elapsed > self.slow_request_seconds
+                    and self.rng.random() < self.sample_ratio
+                ):
+                    headers = dict(scope['headers'])
+                    record = {
+                        'method': scope['method'],
+                        'route': getattr(scope.get('route'), 'path', None),
+                        'status': status,
+                        'duration_ms': round(elapsed * 1000, 3),
+                        'stages_ms': {name: round(ms, 3) for name, ms in timing.durations_ms().items()},
+                        'cache': timing.cache,
+                        'payload': {
+                            'content_type': headers.get(b'content-type', b'').decode('latin-1') or None,
+                            'bytes': body_bytes,
+                            'rows': timing.rows,
+                        },
+                    }
+                    logger.warning('Slow request: %s', json.dumps(record))
@@ -0,0 +1,153 @@
+import os
+from typing import TYPE_CHECKING, Any, Callable, Optional
+import httpx
+from opentelemetry import propagate, trace
+from opentelemetry.trace import SpanKind, StatusCode
+from shared.config.config_loader import TracingSettings
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SpanExporter
+
+TRACER_NAME = 'housing-price-orchestrator'
+
+tracer = trace.get_tracer(TRACER_NAME)
+"""Tracer of the orchestrator, a no-op until `configure_tracing` installs a tracer provider."""
+
+
+def _import_sdk() -> Any:
+    """Imports the OpenTelemetry SDK only when tracing is enabled.
+
+    Raises:
+        ImportError: If the OpenTelemetry SDK is not installed.
+    """
+
+    try:
+        import opentelemetry.sdk.trace
+    except ImportError as e:
+        raise ImportError('Tracing requires the OpenTelemetry SDK, install the "tracing" extra to use it.') from e
+    return opentelemetry.sdk
+
+
+def _build_exporter(settings: TracingSettings) -> 'SpanExporter':
+    """Builds the span exporter configured in the settings."""
+
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    if settings.exporter == 'console':
+        return ConsoleSpanExporter()
+    if settings.exporter == 'file':
+
+        class FileSpanExporter(ConsoleSpanExporter):
+            """Exporter appending one JSON span per line to a file, closed when the tracer provider shuts down."""
+
+            def shutdown(self) -> None:
+                self.out.close()
+
+        return FileSpanExporter(
+            out=open(settings.file_path, 'a'), formatter=lambda span: span.to_json(indent=None) + os.linesep
+        )
+
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError as e:
+        raise ImportError('The otlp exporter requires opentelemetry-exporter-otlp-proto-http.') from e
+    return OTLPSpanExporter(endpoint=settings.otlp_endpoint)
+
+
+def configure_tracing(
+    settings: TracingSettings, exporter: Optional['SpanExporter'] = None
+) -> Optional['TracerProvider']:
+    """Installs the tracer provider sampling and exporting the spans of the orchestrator, if tracing is enabled.
+
+    Requests are sampled with probability `sample_ratio`, unless the caller already decided to sample them. Spans of
+    unsampled requests are not recorded, so tracing costs little more than propagating their context.
+
+    Args:
+        settings: The tracing settings.
+        exporter: An optional span exporter replacing the configured one, e.g. an in-memory exporter in tests.
+
+    Returns:
+        The installed tracer provider, to shut down when the application stops, or None if tracing is disabled.
+    """
+
+    if not settings.enabled and exporter is None:
+        return None
+
+    sdk = _import_sdk()
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    provider = sdk.trace.TracerProvider(
+        resource=Resource.create({'service.name': settings.service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter or _build_exporter(settings)))
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+async def inject_trace_context(request: httpx.Request) -> None:
+    """HTTP client request hook propagating the current trace context to the model server in the request headers.
+
+    Args:
+        request: The request about to be sent.
+    """
+    propagate.inject(request.headers)
+
+
+def trace_context_metadata() -> Optional[tuple[tuple[str, str], ...]]:
+    """Returns the current trace context as gRPC metadata, or None outside of a trace."""
+
+    carrier: dict[str, str] = {}
+    propagate.inject(carrier)
+    return tuple(carrier.items()) or None
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span for each request, continuing the trace of the caller if it sent one.
+
+    Spans are named after the path template of their route, e.g. `POST /api/v1/price/predict`.
+
+    Args:
+        app: The ASGI application to trace.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {name.decode('latin-1'): value.decode('latin-1') for name, value in scope['headers']}
+        method = scope['method']
+        with tracer.start_as_current_span(
+            method, context=propagate.extract(carrier), kind=SpanKind.SERVER, record_exception=False
+        ) as span:
+            if not span.is_recording():
+                await self.app(scope, receive, send)
+                return
+
+            status = 500
+
+            async def send_with_status(message: dict[str, Any]) -> None:
+                nonlocal status
+                if message['type'] == 'http.response.start':
+                    status = message['status']
+                await send(message)
+
+            span.set_attribute('http.request.method', method)
+            span.set_attribute('url.path', scope['path'])
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = getattr(scope.get('route'), 'path', None)
+                if route is not None:
+                    span.update_name(f'{method} {route}')
+                    span.set_attribute('http.route', route)
+                span.set_attribute('http.response.status_code', status)
+                if status >= 500:
+                    span.set_status(StatusCode.ERROR)
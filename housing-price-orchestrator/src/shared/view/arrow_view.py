@@ -0,0 +1,87 @@
+import io
+from typing import Optional, Sequence
+import pyarrow as pa
+import pyarrow.parquet as pq
+from shared.dto.price_prediction import PricePrediction
+
+ARROW_STREAM_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+PARQUET_MEDIA_TYPE = 'application/vnd.apache.parquet'
+TABLE_MEDIA_TYPES = (ARROW_STREAM_MEDIA_TYPE, PARQUET_MEDIA_TYPE)
+
+PREDICTION_SCHEMA = pa.schema([('id', pa.int64()), ('predictedPrice', pa.float64())])
+"""Schema of predictions written as tables, using the same field names as the API responses."""
+
+
+def table_media_type(content_type: Optional[str]) -> Optional[str]:
+    """Finds the table format named by a Content-Type or Accept header.
+
+    Args:
+        content_type: The header value, possibly listing several media types with parameters.
+
+    Returns:
+        The first Arrow IPC stream or Parquet media type of the header, or None if it names neither.
+    """
+
+    for media_type in (content_type or '').split(','):
+        media_type = media_type.split(';', 1)[0].strip().lower()
+        if media_type in TABLE_MEDIA_TYPES:
+            return media_type
+    return None
+
+
+def read_table(body: bytes, media_type: str) -> pa.Table:
+    """Decodes an Arrow IPC stream or Parquet request body.
+
+    Args:
+        body: The request body.
+        media_type: The media type of the body, one of `TABLE_MEDIA_TYPES`.
+
+    Returns:
+        The decoded table.
+
+    Raises:
+        pyarrow.ArrowInvalid: If the body is not a valid table of the given format.
+    """
+
+    if media_type == ARROW_STREAM_MEDIA_TYPE:
+        return pa.ipc.open_stream(body).read_all()
+    return pq.read_table(io.BytesIO(body))
+
+
+def to_prediction_table(price_predictions: Sequence[PricePrediction]) -> pa.Table:
+    """Builds a table of predictions with one column per field.
+
+    Args:
+        price_predictions: The predictions to convert.
+
+    Returns:
+        A table with the `PREDICTION_SCHEMA` schema.
+    """
+
+    return pa.table(
+        {
+            'id': [pred.id for pred in price_predictions],
+            'predictedPrice': [pred.predicted_price for pred in price_predictions],
+        },
+        schema=PREDICTION_SCHEMA,
+    )
+
+
+def write_table(table: pa.Table, media_type: str) -> bytes:
+    """Encodes a table as an Arrow IPC stream or a Parquet file.
+
+    Args:
+        table: The table to encode.
+        media_type: The media type to encode the table as, one of `TABLE_MEDIA_TYPES`.
+
+    Returns:
+        The encoded table.
+    """
+
+    sink = io.BytesIO()
+    if media_type == ARROW_STREAM_MEDIA_TYPE:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        pq.write_table(table, sink)
+    return sink.getvalue()
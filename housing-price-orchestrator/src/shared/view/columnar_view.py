@@ -0,0 +1,270 @@
+from dataclasses import dataclass
+from functools import cache
+from typing import Any, Literal, Mapping, Optional, Sequence, Union, get_args, get_origin
+import annotated_types
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pydantic import BaseModel, ValidationError
+from pydantic_core import InitErrorDetails, PydanticCustomError
+from shared.view.mlflow_view import DataFrameSplit, _view_layout
+from shared.view.request_view import PricePredictionRequest
+
+ColumnValues = Union[Sequence[Any], pa.Array, pa.ChunkedArray]
+
+_ARROW_TYPES = {int: pa.int64(), float: pa.float64(), str: pa.string()}
+_INT64_MAX = 2**63 - 1
+
+
+@dataclass(frozen=True, slots=True)
+class _ColumnSpec:
+    """Constraints of a single view field, checked a whole column at a time."""
+
+    name: str
+    """Name of the view field."""
+
+    keys: tuple[str, ...]
+    """Accepted column names: the field name, its validation alias and its serialization alias."""
+
+    kind: type
+    """The scalar type of the field, one of int, float or str."""
+
+    optional: bool
+    """Whether the field accepts missing values."""
+
+    ge: Optional[float] = None
+    """Inclusive lower bound of numeric fields."""
+
+    le: Optional[float] = None
+    """Inclusive upper bound of numeric fields."""
+
+    choices: Optional[tuple[str, ...]] = None
+    """Allowed values of Literal fields."""
+
+
+@cache
+def _column_specs(view_type: type[BaseModel]) -> tuple[_ColumnSpec, ...]:
+    """Derives the column constraints of a view type from its field annotations and metadata."""
+
+    specs = []
+    for name, field in view_type.model_fields.items():
+        annotation, optional = field.annotation, False
+        if get_origin(annotation) is Union and type(None) in get_args(annotation):
+            annotation, optional = next(arg for arg in get_args(annotation) if arg is not type(None)), True
+
+        choices = None
+        if get_origin(annotation) is Literal:
+            annotation, choices = str, tuple(dict.fromkeys(get_args(annotation)))
+        if annotation not in _ARROW_TYPES:
+            raise TypeError(f'Field {name} of {view_type.__name__} cannot be validated column-wise.')
+
+        bounds = {
+            key: getattr(constraint, key)
+            for constraint in field.metadata
+            if isinstance(constraint, (annotated_types.Ge, annotated_types.Le))
+            for key in ('ge', 'le')
+            if hasattr(constraint, key)
+        }
+        keys = tuple(dict.fromkeys(key for key in (name, field.alias, field.serialization_alias) if key))
+        specs.append(
+            _ColumnSpec(
+                name=name,
+                keys=keys,
+                kind=annotation,
+                optional=optional or not field.is_required(),
+                choices=choices,
+                **bounds,
+            )
+        )
+    return tuple(specs)
+
+
+def _to_arrow(values: ColumnValues) -> Optional[pa.ChunkedArray]:
+    """Converts column values to an Arrow array, or None when they do not share a single type."""
+
+    if isinstance(values, pa.ChunkedArray):
+        return values
+    if isinstance(values, pa.Array):
+        return pa.chunked_array([values])
+    try:
+        return pa.chunked_array([pa.array(values)])
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+        return None
+
+
+def _check_column(
+    spec: _ColumnSpec, array: pa.ChunkedArray
+) -> tuple[Optional[pa.ChunkedArray], np.ndarray, np.ndarray]:
+    """Checks a column against the constraints of its field.
+
+    Returns:
+        The column cast to the type of its field, or None when its values cannot be checked column-wise, a mask of the
+        rows needing row-wise validation, and a mask of the rows holding integers too large for the 64-bit integers the
+        model takes. Rows outside of both masks are known to be valid.
+    """
+
+    none = np.zeros(len(array), dtype=bool)
+    if pa.types.is_dictionary(array.type):
+        array = array.cast(array.type.value_type)
+
+    if spec.kind is int and (pa.types.is_integer(array.type) or pa.types.is_floating(array.type)):
+        # Only floats and unsigned 64-bit integers can hold values out of the range of the model's 64-bit integers
+        out_of_range = None
+        if pa.types.is_floating(array.type):
+            # Integral floats, e.g. 2.0, are valid integers while other floats are reported by the row-wise validation
+            integral = pc.fill_null(pc.equal(pc.floor(array), array), True)
+            if not pc.all(integral).as_py():
+                return None, ~none, none
+            out_of_range = pc.or_(pc.greater_equal(array, 2.0**63), pc.less(array, -(2.0**63)))
+        elif pa.types.is_uint64(array.type):
+            out_of_range = pc.greater(array, pa.scalar(_INT64_MAX, pa.uint64()))
+
+        overflow = none
+        if out_of_range is not None and pc.any(out_of_range).as_py():
+            overflow = np.asarray(pc.fill_null(out_of_range, False).to_numpy(zero_copy_only=False), dtype=bool)
+            array = pc.if_else(out_of_range, None, array)
+        array = array.cast(pa.int64(), safe=False)
+    else:
+        overflow = none
+        if pa.types.is_null(array.type):
+            array = array.cast(_ARROW_TYPES[spec.kind])
+        elif spec.kind is str and pa.types.is_large_string(array.type):
+            array = array.cast(pa.string())
+        elif spec.kind is float and (pa.types.is_integer(array.type) or pa.types.is_floating(array.type)):
+            try:
+                array = array.cast(pa.float64())
+            except pa.ArrowInvalid:
+                # Integers a float64 cannot hold exactly, converted like the view would
+                return None, ~none, none
+        elif array.type != _ARROW_TYPES[spec.kind]:
+            return None, ~none, none
+
+    valid = pc.is_in(array, value_set=pa.array(spec.choices)) if spec.choices is not None else pc.is_valid(array)
+    if spec.ge is not None:
+        valid = pc.and_kleene(valid, pc.greater_equal(array, spec.ge))
+    if spec.le is not None:
+        valid = pc.and_kleene(valid, pc.less_equal(array, spec.le))
+    valid = pc.if_else(pc.is_null(array), spec.optional, valid)
+    return array, ~np.asarray(valid.to_numpy(zero_copy_only=False), dtype=bool) & ~overflow, overflow
+
+
+def validate_columns(
+    columns: Mapping[str, ColumnValues], view_type: type[BaseModel] = PricePredictionRequest
+) -> DataFrameSplit:
+    """Validates a batch given as one array per field and builds the model input from it, without a view per row.
+
+    Columns may be named after the field names, their aliases or their serialization aliases, unknown columns are
+    ignored. Range and set membership constraints are checked a whole column at a time. Only the rows failing these
+    checks, or columns whose values do not share a single type, go through the row-wise view validation, so errors and
+    lenient conversions are exactly those of a batch of views. Integers are also checked to fit the 64-bit integers
+    the model takes. The model input keeps the validated columns as Arrow arrays, rows are never built.
+
+    Args:
+        columns: The column arrays, as Python sequences or Arrow arrays.
+        view_type: The view type whose fields and constraints the columns must satisfy.
+
+    Returns:
+        A DataFrameSplit backed by an Arrow table with one row per array element, with the view's serialization aliases
+        as columns.
+
+    Raises:
+        ValidationError: If the columns have different lengths or any row is invalid. Row errors are located at
+            `('data', row, field)`, like the errors of a batch request.
+    """
+
+    specs = _column_specs(view_type)
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValidationError.from_exception_data(
+            view_type.__name__,
+            [
+                InitErrorDetails(
+                    type=PydanticCustomError('column_length', 'Column arrays should all have the same length'),
+                    loc=('data',),
+                    input=sorted(lengths),
+                )
+            ],
+        )
+    length = lengths.pop() if lengths else 0
+
+    column_keys: dict[str, str] = {}
+    arrays: list[Optional[pa.ChunkedArray]] = []
+    needs_validation = np.zeros(length, dtype=bool)
+    errors: list[InitErrorDetails] = []
+    for spec in specs:
+        key = next((key for key in spec.keys if key in columns), None)
+        array = _to_arrow(columns[key]) if key is not None else pa.chunked_array([pa.nulls(length)])
+        if array is not None:
+            checked, invalid, overflow = _check_column(spec, array)
+        else:
+            checked, invalid, overflow = None, np.ones(length, dtype=bool), np.zeros(length, dtype=bool)
+        if key is not None:
+            column_keys[spec.name] = key
+        arrays.append(checked)
+        needs_validation |= invalid
+        errors.extend(
+            _int64_range_error(index, spec.name, _value_at(columns[key], index))
+            for index in np.flatnonzero(overflow).tolist()
+        )
+
+    names = _view_layout(view_type)[0]
+    if not needs_validation.any():
+        if errors:
+            raise ValidationError.from_exception_data(view_type.__name__, errors)
+        return DataFrameSplit.from_table(pa.table(arrays, names=names))
+
+    # Validate the remaining rows like a batch of views would, keeping the lenient conversions of valid ones
+    _, getter = _view_layout(view_type)
+    indices = np.flatnonzero(needs_validation).tolist()
+    validated = []
+    for index in indices:
+        record = {name: _value_at(columns[key], index) for name, key in column_keys.items()}
+        try:
+            validated.append(getter(view_type.model_validate(record)))
+        except ValidationError as e:
+            errors.extend(
+                InitErrorDetails(type=error['type'], loc=('data', index, *error['loc']), input=error['input'])
+                | ({'ctx': error['ctx']} if 'ctx' in error else {})
+                for error in e.errors(include_url=False)
+            )
+    if errors:
+        raise ValidationError.from_exception_data(view_type.__name__, errors)
+
+    # Replace the validated rows of every column, columns that could not be checked were validated in full
+    mask = pa.array(needs_validation)
+    table_columns = []
+    for position, (spec, array) in enumerate(zip(specs, arrays)):
+        values = [row[position] for row in validated]
+        try:
+            replacement = pa.array(values, _ARROW_TYPES[spec.kind])
+        except (pa.ArrowInvalid, OverflowError):
+            errors.extend(
+                _int64_range_error(index, spec.name, value)
+                for index, value in zip(indices, values)
+                if value is not None and not -_INT64_MAX - 1 <= value <= _INT64_MAX
+            )
+            continue
+        table_columns.append(
+            replacement if array is None else pc.replace_with_mask(array.combine_chunks(), mask, replacement)
+        )
+    if errors:
+        raise ValidationError.from_exception_data(view_type.__name__, errors)
+    return DataFrameSplit.from_table(pa.table(table_columns, names=names))
+
+
+def _int64_range_error(index: int, name: str, value: Any) -> InitErrorDetails:
+    """Reports an integer too large for the 64-bit integers the model takes, at `('data', index, name)`."""
+
+    return InitErrorDetails(
+        type=PydanticCustomError('int64_range', 'Input should fit in a signed 64-bit integer'),
+        loc=('data', index, name),
+        input=value,
+    )
+
+
+def _value_at(values: ColumnValues, index: int) -> Any:
+    """Reads a single value of a column as a Python value."""
+
+    if isinstance(values, (pa.Array, pa.ChunkedArray)):
+        return values[index].as_py()
+    return values[index]
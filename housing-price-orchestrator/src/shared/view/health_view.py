@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import Literal, Optional
+from shared.data_model_base import ViewBase
+
+
+class ConnectionPoolView(ViewBase):
+    """View model for the connection pool of the HTTP client calling the pricing model."""
+
+    requests: int
+    """Number of requests that obtained a connection."""
+
+    new_connections: int
+    """Number of requests that had to open a new connection."""
+
+    reused_connections: int
+    """Number of requests sent on a connection kept alive by an earlier request."""
+
+    reuse_ratio: float
+    """Ratio of requests sent on a reused connection."""
+
+    mean_pool_wait_ms: float
+    """Average time requests waited for a connection from the pool, in milliseconds."""
+
+    max_pool_wait_ms: float
+    """Longest time a request waited for a connection from the pool, in milliseconds."""
+
+    pool_timeouts: int
+    """Number of requests that gave up waiting for a connection from the pool."""
+
+
+class HealthView(ViewBase):
+    """View model for the health of the housing price orchestrator and of the pricing model it calls."""
+
+    status: Literal['ok', 'unavailable']
+    """Whether the orchestrator can currently serve predictions."""
+
+    model_healthy: bool
+    """Whether the last health probe of the pricing model succeeded."""
+
+    checked_at: Optional[datetime] = None
+    """Time of the last health probe of the pricing model, None until the first probe completes."""
+
+    circuit_state: Optional[Literal['closed', 'open', 'half_open']] = None
+    """State of the circuit breaker around the pricing model, None when it is disabled."""
+
+    connection_pool: Optional[ConnectionPoolView] = None
+    """Usage of the connection pool of the HTTP client calling the pricing model."""
@@ -1,4 +1,13 @@
-from typing import Any
+from dataclasses import dataclass, field
+from functools import cache
+import json
+import math
+from operator import attrgetter
+from typing import Any, Callable, Iterator, Optional, Sequence, overload
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pydantic import BaseModel
 from shared.data_model_base import ViewBase
 
 
@@ -7,3 +16,187 @@ class MLFlowPredictionsView(ViewBase):
 
     predictions: list[Any]
     """List of predictions made by the model."""
+
+
+@cache
+def _view_layout(view_type: type[BaseModel]) -> tuple[list[str], Callable[[BaseModel], tuple[Any, ...]]]:
+    """Resolves the column names and a row getter for a view type, following its serialization aliases."""
+
+    field_names = list(view_type.model_fields)
+    columns = [view_type.model_fields[name].serialization_alias or name for name in field_names]
+    getter = attrgetter(*field_names)
+    if len(field_names) == 1:
+        return columns, lambda view: (getter(view),)
+    return columns, getter
+
+
+class ArrowRows(Sequence[tuple[Any, ...]]):
+    """The rows of an Arrow table, read lazily.
+
+    Inputs validated column-wise keep their columns as Arrow arrays, which are encoded for the model a whole column at a
+    time. Only consumers needing single rows, e.g. the prediction cache, pay for converting the columns to Python
+    values, once, and slices stay zero-copy views of the table.
+
+    Args:
+        table: The table holding the columns.
+    """
+
+    __slots__ = ('table', '_columns')
+
+    def __init__(self, table: pa.Table):
+        self.table = table
+        self._columns: Optional[list[list[Any]]] = None
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    @overload
+    def __getitem__(self, index: int) -> tuple[Any, ...]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'ArrowRows': ...
+
+    def __getitem__(self, index: int | slice) -> 'tuple[Any, ...] | ArrowRows':
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return ArrowRows(self.table.take(list(range(start, stop, step))))
+            return ArrowRows(self.table.slice(start, max(stop - start, 0)))
+        if self._columns is None:
+            self._columns = [column.to_pylist() for column in self.table.columns]
+        return tuple(column[index] for column in self._columns)
+
+    def __iter__(self) -> Iterator[tuple[Any, ...]]:
+        if self._columns is None:
+            self._columns = [column.to_pylist() for column in self.table.columns]
+        return zip(*self._columns) if self._columns else iter(())
+
+
+@dataclass(slots=True)
+class DataFrameSplit:
+    """The MLFlow `dataframe_split` input format, holding rows of already validated values.
+
+    This is a plain dataclass rather than a ViewBase since its rows come from views that have already been validated,
+    validating them a second time would defeat its purpose of keeping the encoding path cheap. Inputs validated
+    column-wise hold their rows as ArrowRows, and are encoded from the columns of their `table`.
+    """
+
+    columns: list[str]
+    """Names of the input columns, in model order."""
+
+    data: list[Sequence[Any]] = field(default_factory=list)
+    """Rows of input values, each aligned with `columns`."""
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def table(self) -> Optional[pa.Table]:
+        """The columns of the input as an Arrow table, when it was built column-wise, None otherwise."""
+        return self.data.table if isinstance(self.data, ArrowRows) else None
+
+    @classmethod
+    def from_table(cls, table: pa.Table) -> 'DataFrameSplit':
+        """Builds the model input from the columns of a table of validated values, without converting its rows.
+
+        Args:
+            table: The table, with one column per model input column.
+
+        Returns:
+            A DataFrameSplit reading its rows from the table.
+        """
+
+        return cls(columns=list(table.column_names), data=ArrowRows(table))
+
+    @classmethod
+    def from_views(cls, views: Sequence[BaseModel]) -> 'DataFrameSplit':
+        """Builds the model input directly from validated views, using their serialization aliases as columns.
+
+        Args:
+            views: The validated views, all of the same type.
+
+        Returns:
+            A DataFrameSplit with one row per view.
+        """
+
+        if not views:
+            return cls(columns=[])
+
+        columns, getter = _view_layout(type(views[0]))
+        return cls(columns=columns, data=[getter(view) for view in views])
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame) -> 'DataFrameSplit':
+        """Builds the model input from a DataFrame, replacing missing values with None.
+
+        Args:
+            data: The input data for the prediction.
+
+        Returns:
+            A DataFrameSplit with one row per DataFrame row.
+        """
+
+        rows = data.astype(object).where(data.notna(), None).to_numpy().tolist()
+        return cls(columns=[str(column) for column in data.columns], data=rows)
+
+    def to_json_bytes(self) -> bytes:
+        """Encodes the request body expected by the MLFlow `/invocations` endpoint in a single pass.
+
+        Returns:
+            The UTF-8 encoded JSON request body.
+        """
+
+        table = self.table
+        if table is not None:
+            header = json.dumps({'columns': self.columns}, separators=(',', ':'))[:-1]
+            return f'{{"dataframe_split":{header},"data":'.encode() + _json_rows(table) + b'}}'
+
+        payload = {'dataframe_split': {'columns': self.columns, 'data': self.data}}
+        return json.dumps(payload, separators=(',', ':'), default=_json_default).encode()
+
+
+_FLOAT_LITERALS = {'nan': 'NaN', 'inf': 'Infinity', '-inf': '-Infinity'}
+
+
+def _json_rows(table: pa.Table) -> bytes:
+    """Encodes the rows of a table as a JSON array of arrays, a whole column at a time."""
+
+    if table.num_rows == 0:
+        return b'[]'
+    cells = [_json_cells(column.combine_chunks()) for column in table.columns]
+    rows = pc.binary_join_element_wise(*cells, ',') if len(cells) > 1 else cells[0]
+    joined = pc.binary_join(pa.ListArray.from_arrays(pa.array([0, len(rows)], pa.int32()), rows), '],[')
+    return b'[[' + joined[0].as_buffer().to_pybytes() + b']]'
+
+
+def _json_cells(array: pa.Array) -> pa.Array:
+    """Encodes every value of a column as JSON text, like `json.dumps` does."""
+
+    if pa.types.is_null(array.type):
+        return pa.array(['null'] * len(array), pa.string())
+
+    if pa.types.is_integer(array.type):
+        text = array.cast(pa.string())
+    elif pa.types.is_boolean(array.type):
+        text = pc.if_else(array, 'true', 'false')
+    elif pa.types.is_floating(array.type):
+        text = array.cast(pa.float64()).cast(pa.string())
+        # Integral floats are written without a fraction by Arrow, keep them floats like Python does
+        text = pc.if_else(pc.match_substring_regex(text, r'^-?\d+$'), pc.binary_join_element_wise(text, '.0', ''), text)
+        for literal, json_literal in _FLOAT_LITERALS.items():
+            text = pc.if_else(pc.equal(text, literal), json_literal, text)
+    else:
+        # Strings are mostly categories: only their distinct values are encoded, by Python, then spread to every row
+        encoded = array if pa.types.is_dictionary(array.type) else pc.dictionary_encode(array)
+        values = [json.dumps(value, default=_json_default) for value in encoded.dictionary.to_pylist()]
+        text = pc.take(pa.array(values, pa.string()), encoded.indices)
+    return pc.fill_null(text, 'null')
+
+
+def _json_default(value: Any) -> Any:
+    """Converts NumPy scalars, which the standard JSON encoder does not know about, to Python values."""
+
+    if hasattr(value, 'item'):
+        item = value.item()
+        return None if isinstance(item, float) and math.isnan(item) else item
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
@@ -0,0 +1,79 @@
+import json
+from typing import Any, AsyncIterable, AsyncIterator
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """StreamingResponse of NDJSON lines whose content is produced while the request body is still being read.
+
+    The default StreamingResponse listens for client disconnects by consuming `receive` messages in the background,
+    which would swallow the request body chunks the content iterator is reading. A disconnect is instead detected by
+    the request body stream itself, or by the failed send once the body has been read.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+
+        if self.background is not None:
+            await self.background()
+
+
+class NDJSONLineTooLongError(ValueError):
+    """Raised when an NDJSON line exceeds the maximum allowed length."""
+
+
+async def iter_ndjson_lines(chunks: AsyncIterable[bytes], max_line_bytes: int) -> AsyncIterator[tuple[int, bytes]]:
+    """Splits a stream of bytes into NDJSON lines as they arrive, skipping blank lines.
+
+    Args:
+        chunks: The raw byte chunks, e.g. a request body stream.
+        max_line_bytes: The maximum length of a single line, which bounds the memory held for a partial line.
+
+    Returns:
+        An async iterator of (line number, line) pairs, numbered from 1.
+
+    Raises:
+        NDJSONLineTooLongError: If a line exceeds `max_line_bytes`.
+    """
+
+    buffer = b''
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            line_number += 1
+            if len(line) > max_line_bytes:
+                raise NDJSONLineTooLongError(f'Line {line_number} is longer than {max_line_bytes} bytes.')
+            if line.strip():
+                yield line_number, line
+        if len(buffer) > max_line_bytes:
+            raise NDJSONLineTooLongError(f'Line {line_number + 1} is longer than {max_line_bytes} bytes.')
+
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+def to_ndjson_line(value: BaseModel | dict[str, Any]) -> bytes:
+    """Encodes a view or a plain dictionary as a single NDJSON line.
+
+    Args:
+        value: The value to encode, views are encoded with their aliases.
+
+    Returns:
+        The encoded line, terminated by a newline.
+    """
+
+    if isinstance(value, BaseModel):
+        return value.model_dump_json(by_alias=True).encode() + b'\n'
+    return json.dumps(value, separators=(',', ':'), default=str).encode() + b'\n'
@@ -0,0 +1,148 @@
+from functools import cache
+from types import SimpleNamespace
+
+GRPC_SERVICE = 'inference.GRPCInferenceService'
+"""Name of the gRPC service of the Open Inference (V2) protocol."""
+
+CONTENTS_FIELDS = {
+    'BOOL': 'bool_contents',
+    'INT32': 'int_contents',
+    'INT64': 'int64_contents',
+    'FP32': 'fp32_contents',
+    'FP64': 'fp64_contents',
+    'BYTES': 'bytes_contents',
+}
+"""Field of InferTensorContents holding the elements of each datatype, when they are not sent as raw contents."""
+
+# (name, number, type, repeated, message type) of the fields of each message, following grpc_service.proto. Nested
+# messages are named after their parent, which is listed first. Fields that are never read, e.g. the tensor metadata of
+# ModelMetadataResponse, are left out and skipped when parsing
+_MESSAGE_FIELDS = {
+    'ServerReadyRequest': [],
+    'ServerReadyResponse': [('ready', 1, 'bool', False, None)],
+    'ModelMetadataRequest': [('name', 1, 'string', False, None), ('version', 2, 'string', False, None)],
+    'ModelMetadataResponse': [
+        ('name', 1, 'string', False, None),
+        ('versions', 2, 'string', True, None),
+        ('platform', 3, 'string', False, None),
+    ],
+    'InferParameter': [
+        ('bool_param', 1, 'bool', False, None),
+        ('int64_param', 2, 'int64', False, None),
+        ('string_param', 3, 'string', False, None),
+        ('double_param', 4, 'double', False, None),
+        ('uint64_param', 5, 'uint64', False, None),
+    ],
+    'InferTensorContents': [
+        ('bool_contents', 1, 'bool', True, None),
+        ('int_contents', 2, 'int32', True, None),
+        ('int64_contents', 3, 'int64', True, None),
+        ('uint_contents', 4, 'uint32', True, None),
+        ('uint64_contents', 5, 'uint64', True, None),
+        ('fp32_contents', 6, 'float', True, None),
+        ('fp64_contents', 7, 'double', True, None),
+        ('bytes_contents', 8, 'bytes', True, None),
+    ],
+    'ModelInferRequest': [
+        ('model_name', 1, 'string', False, None),
+        ('model_version', 2, 'string', False, None),
+        ('id', 3, 'string', False, None),
+        ('parameters', 4, 'map', True, None),
+        ('inputs', 5, 'message', True, 'ModelInferRequest.InferInputTensor'),
+        ('outputs', 6, 'message', True, 'ModelInferRequest.InferRequestedOutputTensor'),
+        ('raw_input_contents', 7, 'bytes', True, None),
+    ],
+    'ModelInferRequest.InferInputTensor': [
+        ('name', 1, 'string', False, None),
+        ('datatype', 2, 'string', False, None),
+        ('shape', 3, 'int64', True, None),
+        ('parameters', 4, 'map', True, None),
+        ('contents', 5, 'message', False, 'InferTensorContents'),
+    ],
+    'ModelInferRequest.InferRequestedOutputTensor': [
+        ('name', 1, 'string', False, None),
+        ('parameters', 2, 'map', True, None),
+    ],
+    'ModelInferResponse': [
+        ('model_name', 1, 'string', False, None),
+        ('model_version', 2, 'string', False, None),
+        ('id', 3, 'string', False, None),
+        ('parameters', 4, 'map', True, None),
+        ('outputs', 5, 'message', True, 'ModelInferResponse.InferOutputTensor'),
+        ('raw_output_contents', 6, 'bytes', True, None),
+    ],
+    'ModelInferResponse.InferOutputTensor': [
+        ('name', 1, 'string', False, None),
+        ('datatype', 2, 'string', False, None),
+        ('shape', 3, 'int64', True, None),
+        ('parameters', 4, 'map', True, None),
+        ('contents', 5, 'message', False, 'InferTensorContents'),
+    ],
+}
+
+
+@cache
+def grpc_messages() -> SimpleNamespace:
+    """Builds the message classes of the V2 gRPC protocol used to score models, probe them and read their versions.
+
+    The messages are described at runtime from the field numbers of the protocol's `grpc_service.proto`, in a private
+    descriptor pool, so no generated code has to be kept in sync and no symbol clashes with other V2 clients loaded in
+    the same process.
+
+    Returns:
+        A namespace with one message class per top level message, e.g. `ModelInferRequest`.
+
+    Raises:
+        ImportError: If protobuf is not installed.
+    """
+
+    try:
+        from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+    except ImportError as e:
+        raise ImportError(
+            'The V2 gRPC protocol requires grpcio and protobuf, install the "grpc" extra to use it.'
+        ) from e
+
+    field_types = descriptor_pb2.FieldDescriptorProto
+    file = descriptor_pb2.FileDescriptorProto(name='v2_grpc_view.proto', package='inference', syntax='proto3')
+    descriptors: dict[str, descriptor_pb2.DescriptorProto] = {}
+
+    for path, fields in _MESSAGE_FIELDS.items():
+        parent, _, name = path.rpartition('.')
+        message = (descriptors[parent].nested_type if parent else file.message_type).add(name=name)
+        descriptors[path] = message
+        for field_name, number, field_type, repeated, type_name in fields:
+            field = message.field.add(name=field_name, number=number)
+            field.label = field_types.LABEL_REPEATED if repeated else field_types.LABEL_OPTIONAL
+            if field_type == 'map':
+                # Parameter maps are repeated entries of a nested message flagged as a map entry
+                entry = message.nested_type.add(name='ParametersEntry')
+                entry.options.map_entry = True
+                entry.field.add(name='key', number=1, type=field_types.TYPE_STRING, label=field_types.LABEL_OPTIONAL)
+                entry.field.add(
+                    name='value',
+                    number=2,
+                    type=field_types.TYPE_MESSAGE,
+                    label=field_types.LABEL_OPTIONAL,
+                    type_name='.inference.InferParameter',
+                )
+                field.type, field.type_name = field_types.TYPE_MESSAGE, f'.inference.{path}.ParametersEntry'
+            elif field_type == 'message':
+                field.type, field.type_name = field_types.TYPE_MESSAGE, f'.inference.{type_name}'
+            else:
+                field.type = getattr(field_types, f'TYPE_{field_type.upper()}')
+
+        if path == 'InferParameter':
+            message.oneof_decl.add(name='parameter_choice')
+            for field in message.field:
+                field.oneof_index = 0
+
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(file)
+    return SimpleNamespace(
+        **{
+            path: message_factory.GetMessageClass(pool.FindMessageTypeByName(f'inference.{path}'))
+            for path in _MESSAGE_FIELDS
+            if '.' not in path
+        }
+    )
@@ -0,0 +1,284 @@
+from dataclasses import dataclass
+from typing import Any, Literal, Mapping, Optional, Union, get_args, get_origin
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pydantic import BaseModel
+from shared.data_model_base import ViewBase
+from shared.exceptions import UnsupportedInputError
+from shared.view.mlflow_view import DataFrameSplit
+
+V2Datatype = Literal['BOOL', 'INT32', 'INT64', 'FP32', 'FP64', 'BYTES']
+
+BINARY_HEADER_LENGTH = 'Inference-Header-Content-Length'
+"""Header of the binary tensor data extension holding the length of the JSON part of a body."""
+
+_NUMPY_DTYPES: dict[str, str] = {'BOOL': '?', 'INT32': '<i4', 'INT64': '<i8', 'FP32': '<f4', 'FP64': '<f8'}
+_PYTHON_DATATYPES: dict[type, V2Datatype] = {bool: 'BOOL', int: 'INT64', float: 'FP64', str: 'BYTES'}
+
+
+class V2TensorView(ViewBase):
+    """View model for an input or output tensor of the Open Inference (V2) REST protocol."""
+
+    name: str
+    """Name of the tensor."""
+
+    shape: list[int]
+    """Shape of the tensor."""
+
+    datatype: str
+    """Datatype of the tensor elements, e.g. `FP64`."""
+
+    parameters: Optional[dict[str, Any]] = None
+    """Optional tensor parameters, e.g. the `binary_data_size` of the binary tensor data extension."""
+
+    data: Optional[list[Any]] = None
+    """Flattened tensor elements, omitted when they are sent as binary data."""
+
+
+class V2RequestedOutputView(ViewBase):
+    """View model for an output requested from a V2 model."""
+
+    name: str
+    """Name of the output."""
+
+    parameters: Optional[dict[str, Any]] = None
+    """Optional output parameters, e.g. `binary_data` to receive it as binary data."""
+
+
+class V2InferenceRequestView(ViewBase):
+    """View model for a V2 REST inference request."""
+
+    inputs: list[V2TensorView]
+    """Input tensors, one per model input column."""
+
+    parameters: Optional[dict[str, Any]] = None
+    """Optional request parameters, e.g. the `content_type` used to decode the inputs."""
+
+    outputs: Optional[list[V2RequestedOutputView]] = None
+    """Optional outputs to return, all outputs are returned as JSON when omitted."""
+
+
+class V2InferenceResponseView(ViewBase):
+    """View model for a V2 REST inference response."""
+
+    outputs: list[V2TensorView]
+    """Output tensors of the model."""
+
+
+class V2ModelMetadataView(ViewBase):
+    """View model for the metadata of a model served with the V2 REST protocol, at `/v2/models/{model_name}`."""
+
+    name: str
+    """Name of the model."""
+
+    versions: Optional[list[str]] = None
+    """Versions of the model served under its name, empty when the server does not version it."""
+
+    platform: Optional[str] = None
+    """Framework or backend serving the model."""
+
+
+@dataclass(slots=True)
+class V2Tensor:
+    """A typed column of model input or output values, as exchanged with V2 model servers."""
+
+    name: str
+    """Name of the tensor."""
+
+    datatype: V2Datatype
+    """Datatype of the tensor elements."""
+
+    values: np.ndarray
+    """One dimensional tensor elements, a NumPy object array of bytes, or None for missing values, for BYTES tensors."""
+
+    @property
+    def has_nulls(self) -> bool:
+        """Whether the tensor holds missing BYTES elements, which only JSON tensor data can send, as nulls."""
+        return self.datatype == 'BYTES' and bool(np.equal(self.values, None).any())
+
+    def to_raw(self) -> bytes:
+        """Encodes the elements in the V2 raw binary format, little endian with length prefixed BYTES elements.
+
+        Raises:
+            UnsupportedInputError: If the tensor holds missing BYTES elements, which the raw format cannot hold.
+        """
+
+        if self.datatype == 'BYTES':
+            if self.has_nulls:
+                raise UnsupportedInputError(
+                    f'Missing values of {self.name} cannot be sent as raw binary tensor data, use JSON tensor data.'
+                )
+            return _to_raw_bytes(self.values)
+        return self.values.astype(_NUMPY_DTYPES[self.datatype], copy=False).tobytes()
+
+    @classmethod
+    def from_raw(cls, name: str, datatype: V2Datatype, raw: bytes) -> 'V2Tensor':
+        """Decodes elements from the V2 raw binary format.
+
+        Args:
+            name: The name of the tensor.
+            datatype: The datatype of the elements.
+            raw: The raw binary elements.
+
+        Returns:
+            The decoded tensor.
+        """
+
+        if datatype != 'BYTES':
+            return cls(name=name, datatype=datatype, values=np.frombuffer(raw, dtype=_NUMPY_DTYPES[datatype]))
+
+        values, offset, view = [], 0, memoryview(raw)
+        while offset < len(raw):
+            length = int.from_bytes(view[offset : offset + 4], 'little')
+            values.append(bytes(view[offset + 4 : offset + 4 + length]))
+            offset += 4 + length
+        return cls(name=name, datatype=datatype, values=np.array(values, dtype=object))
+
+    def to_json(self) -> list[Any]:
+        """Converts the elements to JSON values, decoding BYTES elements as UTF-8 strings and missing ones as nulls."""
+
+        if self.datatype == 'BYTES':
+            return [None if value is None else value.decode() for value in self.values]
+        if self.datatype in ('FP32', 'FP64'):
+            # JSON has no NaN, missing values are sent as nulls
+            return [None if np.isnan(value) else value for value in self.values.tolist()]
+        return self.values.tolist()
+
+    @classmethod
+    def from_json(cls, name: str, datatype: V2Datatype, data: list[Any]) -> 'V2Tensor':
+        """Converts JSON tensor elements, which may be nested for tensors of several dimensions.
+
+        Args:
+            name: The name of the tensor.
+            datatype: The datatype of the elements.
+            data: The JSON elements.
+
+        Returns:
+            The flattened tensor.
+        """
+
+        if datatype == 'BYTES':
+            values = [value.encode() if isinstance(value, str) else value for value in np.ravel(data).tolist()]
+            return cls(name=name, datatype=datatype, values=np.array(values, dtype=object))
+        values = np.asarray(data, dtype=_NUMPY_DTYPES[datatype] if datatype not in ('FP32', 'FP64') else float)
+        return cls(name=name, datatype=datatype, values=values.ravel())
+
+
+def _to_raw_bytes(values: np.ndarray) -> bytes:
+    """Encodes BYTES elements as length prefixed elements, interleaving the lengths and the concatenated elements."""
+
+    array = pa.array(values, type=pa.binary())
+    _, offsets_buffer, data_buffer = array.buffers()
+    offsets = np.frombuffer(offsets_buffer, dtype=np.int32)[: len(array) + 1]
+    data = np.frombuffer(data_buffer, dtype=np.uint8)[: offsets[-1]] if data_buffer else np.empty(0, np.uint8)
+
+    # The length of each element starts after the previous elements and their own 4 byte lengths
+    prefixes = (offsets[:-1] + 4 * np.arange(len(array)))[:, None] + np.arange(4)
+    raw = np.empty(len(data) + 4 * len(array), dtype=np.uint8)
+    is_data = np.ones(len(raw), dtype=bool)
+    is_data[prefixes.ravel()] = False
+    raw[prefixes.ravel()] = np.diff(offsets).astype('<u4').view(np.uint8)
+    raw[is_data] = data
+    return raw.tobytes()
+
+
+def v2_datatypes(view_type: type[BaseModel]) -> dict[str, V2Datatype]:
+    """Derives the V2 datatype of each model input column from the fields of a view, keyed by serialization alias.
+
+    Optional integers are sent as FP64 so that missing values can be sent as NaN, which models impute like missing
+    values of a DataFrame.
+
+    Args:
+        view_type: The view type whose validated values are sent to the model.
+
+    Returns:
+        The datatype of each column.
+    """
+
+    datatypes = {}
+    for name, field in view_type.model_fields.items():
+        annotation, optional = field.annotation, False
+        if get_origin(annotation) is Union and type(None) in get_args(annotation):
+            annotation, optional = next(arg for arg in get_args(annotation) if arg is not type(None)), True
+        if get_origin(annotation) is Literal:
+            annotation = type(get_args(annotation)[0])
+        datatype = _PYTHON_DATATYPES.get(annotation, 'BYTES')
+        datatypes[field.serialization_alias or name] = 'FP64' if optional and datatype == 'INT64' else datatype
+    return datatypes
+
+
+def to_v2_tensors(input_data: DataFrameSplit, datatypes: Optional[Mapping[str, V2Datatype]] = None) -> list[V2Tensor]:
+    """Converts the rows of a model input into one typed tensor per column.
+
+    Columns without a known datatype are typed from their values. Missing numeric values are sent as NaN and missing
+    strings as None, sent as JSON nulls, which the model decodes like the nulls of an MLflow `dataframe_split` and
+    imputes. An empty string would be scored as an unknown category instead.
+
+    Args:
+        input_data: The model input.
+        datatypes: An optional datatype per column name.
+
+    Returns:
+        One tensor per column, in column order.
+    """
+
+    datatypes = datatypes or {}
+    table = input_data.table
+    if table is not None:
+        # Inputs validated column-wise are converted a whole Arrow column at a time
+        return [
+            _arrow_to_v2_tensor(name, datatypes.get(name), column)
+            for name, column in zip(input_data.columns, table.columns)
+        ]
+
+    columns = list(zip(*input_data.data)) if input_data.data else [() for _ in input_data.columns]
+    return [_to_v2_tensor(name, datatypes.get(name), list(values)) for name, values in zip(input_data.columns, columns)]
+
+
+def _to_v2_tensor(name: str, datatype: Optional[V2Datatype], values: list[Any]) -> V2Tensor:
+    """Converts the values of a column to a tensor, typing them from their values when no datatype is given."""
+
+    if datatype is None:
+        try:
+            array_type = pa.array(values).type
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            array_type = pa.string()
+        if pa.types.is_boolean(array_type):
+            datatype = 'BOOL'
+        elif pa.types.is_integer(array_type) and None not in values:
+            datatype = 'INT64'
+        elif pa.types.is_integer(array_type) or pa.types.is_floating(array_type) or pa.types.is_null(array_type):
+            datatype = 'FP64'
+        else:
+            datatype = 'BYTES'
+
+    if datatype == 'BYTES':
+        encoded = [None if value is None else str(value).encode() for value in values]
+        return V2Tensor(name=name, datatype=datatype, values=np.array(encoded, dtype=object))
+    if datatype in ('FP32', 'FP64'):
+        return V2Tensor(name=name, datatype=datatype, values=np.array(values, dtype=float))
+    return V2Tensor(name=name, datatype=datatype, values=np.array(values, dtype=_NUMPY_DTYPES[datatype]))
+
+
+def _arrow_to_v2_tensor(name: str, datatype: Optional[V2Datatype], column: pa.ChunkedArray) -> V2Tensor:
+    """Converts an Arrow column to a tensor like `_to_v2_tensor` converts its values, without going through Python."""
+
+    if datatype is None:
+        if pa.types.is_boolean(column.type):
+            datatype = 'BOOL'
+        elif pa.types.is_integer(column.type) and column.null_count == 0:
+            datatype = 'INT64'
+        elif pa.types.is_integer(column.type) or pa.types.is_floating(column.type) or pa.types.is_null(column.type):
+            datatype = 'FP64'
+        else:
+            datatype = 'BYTES'
+
+    if datatype == 'BYTES':
+        encoded = column.cast(pa.string()).cast(pa.binary())
+        return V2Tensor(name=name, datatype=datatype, values=np.array(encoded.to_pylist(), dtype=object))
+    if datatype in ('FP32', 'FP64'):
+        values = pc.fill_null(column.cast(pa.float64()), float('nan'))
+        return V2Tensor(name=name, datatype=datatype, values=values.to_numpy())
+    values = column.cast(pa.bool_() if datatype == 'BOOL' else pa.int64()).to_numpy()
+    return V2Tensor(name=name, datatype=datatype, values=values.astype(_NUMPY_DTYPES[datatype], copy=False))
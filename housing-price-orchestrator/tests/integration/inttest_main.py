@@ -1,27 +1,27 @@
 from main import app
 from fastapi.testclient import TestClient
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 from pytest_mock import MockerFixture
 
-from service.pricing_service import PricingService
+from service.pricing_service import AsyncPricingService
 
 
 @pytest.fixture
-def pricing_service() -> PricingService:
+def pricing_service() -> AsyncPricingService:
     mock_model_provider = MagicMock()
-    mock_model_provider.predict.return_value = MagicMock(predictions=[123456.78, 234567.89])
-    return PricingService(mock_model_provider)
+    mock_model_provider.predict = AsyncMock(return_value=MagicMock(predictions=[123456.78, 234567.89]))
+    return AsyncPricingService(mock_model_provider)
 
 
 @pytest.fixture
-def pricing_service_empty() -> PricingService:
+def pricing_service_empty() -> AsyncPricingService:
     mock_model_provider = MagicMock()
-    mock_model_provider.predict.return_value = MagicMock(predictions=[])
-    return PricingService(mock_model_provider)
+    mock_model_provider.predict = AsyncMock(return_value=MagicMock(predictions=[]))
+    return AsyncPricingService(mock_model_provider)
 
 
-def test_predict_price_success(pricing_service: PricingService, mocker: MockerFixture) -> None:
+def test_predict_price_success(pricing_service: AsyncPricingService, mocker: MockerFixture) -> None:
     """Test the /api/v1/price/predict endpoint for a successful prediction."""
     # GIVEN
     client = TestClient(app)
@@ -98,7 +98,7 @@ def test_predict_price_success(pricing_service: PricingService, mocker: MockerFi
     assert response.json() == {'id': 1, 'predictedPrice': 123456.78}
 
 
-def test_predict_price_failure(pricing_service_empty: PricingService, mocker: MockerFixture) -> None:
+def test_predict_price_failure(pricing_service_empty: AsyncPricingService, mocker: MockerFixture) -> None:
     """Test the /api/v1/price/predict endpoint for a failure when no predictions are returned."""
     # GIVEN
     client = TestClient(app)
@@ -175,7 +175,7 @@ def test_predict_price_failure(pricing_service_empty: PricingService, mocker: Mo
     assert response.json() == {'detail': 'No results found.'}
 
 
-def test_batch_predict_success(pricing_service: PricingService, mocker: MockerFixture) -> None:
+def test_batch_predict_success(pricing_service: AsyncPricingService, mocker: MockerFixture) -> None:
     """Test the /api/v1/price/predict/batch endpoint for a successful batch prediction."""
     # GIVEN
     client = TestClient(app)
@@ -321,7 +321,7 @@ def test_batch_predict_success(pricing_service: PricingService, mocker: MockerFi
     }
 
 
-def test_batch_predict_failure(pricing_service_empty: PricingService, mocker: MockerFixture) -> None:
+def test_batch_predict_failure(pricing_service_empty: AsyncPricingService, mocker: MockerFixture) -> None:
     """Test the /api/v1/price/predict endpoint for a failure when no predictions are returned."""
     # GIVEN
     client = TestClient(app)
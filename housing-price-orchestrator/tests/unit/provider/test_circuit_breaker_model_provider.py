@@ -0,0 +1,199 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import httpx
+import pytest
+
+from provider.circuit_breaker_model_provider import AsyncCircuitBreakerModelProvider, CircuitOpenError
+from shared.view.mlflow_view import DataFrameSplit, MLFlowPredictionsView
+
+INPUT_DATA = DataFrameSplit(columns=['Id'], data=[(1,)])
+PREDICTIONS = MLFlowPredictionsView(predictions=[1.0])
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def mock_async_model_provider() -> MagicMock:
+    mock = MagicMock()
+    mock.predict = AsyncMock(return_value=PREDICTIONS)
+    mock.health = AsyncMock(return_value=True)
+    return mock
+
+
+async def _fail(breaker: AsyncCircuitBreakerModelProvider, count: int) -> None:
+    for _ in range(count):
+        with pytest.raises(httpx.ConnectError):
+            await breaker.predict(INPUT_DATA)
+
+
+@pytest.mark.asyncio
+async def test_predict_opens_after_failure_rate_threshold(mock_async_model_provider: MagicMock) -> None:
+    """Test the breaker opens once enough predictions failed, then rejects predictions without calling the model."""
+    # GIVEN
+    clock = FakeClock()
+    breaker = AsyncCircuitBreakerModelProvider(
+        mock_async_model_provider, failure_rate_threshold=0.5, min_calls=4, open_seconds=30, clock=clock
+    )
+    await breaker.predict(INPUT_DATA)
+    await breaker.predict(INPUT_DATA)
+    mock_async_model_provider.predict.side_effect = httpx.ConnectError('fail')
+    await _fail(breaker, 2)
+    clock.now = 10
+
+    # WHEN / THEN
+    assert breaker.state == 'open'
+    with pytest.raises(CircuitOpenError) as exc_info:
+        await breaker.predict(INPUT_DATA)
+    assert exc_info.value.retry_after == 20
+    assert mock_async_model_provider.predict.await_count == 4
+    assert breaker.opened == 1
+    assert breaker.rejected == 1
+    assert await breaker.health() is False
+
+
+@pytest.mark.asyncio
+async def test_predict_counts_slow_calls_as_failures(mock_async_model_provider: MagicMock) -> None:
+    """Test predictions slower than `slow_call_seconds` open the breaker like failed ones."""
+    # GIVEN
+    clock = FakeClock()
+
+    async def slow_predict(data: DataFrameSplit) -> MLFlowPredictionsView:
+        clock.now += 2
+        return PREDICTIONS
+
+    mock_async_model_provider.predict.side_effect = slow_predict
+    breaker = AsyncCircuitBreakerModelProvider(mock_async_model_provider, slow_call_seconds=1, min_calls=2, clock=clock)
+
+    # WHEN
+    results = [await breaker.predict(INPUT_DATA) for _ in range(2)]
+
+    # THEN
+    assert results == [PREDICTIONS, PREDICTIONS]
+    assert breaker.state == 'open'
+
+
+@pytest.mark.asyncio
+async def test_predict_ignores_client_errors(mock_async_model_provider: MagicMock) -> None:
+    """Test errors caused by the request do not open the breaker."""
+    # GIVEN
+    mock_async_model_provider.predict.side_effect = httpx.HTTPStatusError(
+        'fail', request=MagicMock(), response=MagicMock(status_code=422)
+    )
+    breaker = AsyncCircuitBreakerModelProvider(mock_async_model_provider, min_calls=1)
+
+    # WHEN
+    with pytest.raises(httpx.HTTPStatusError):
+        await breaker.predict(INPUT_DATA)
+
+    # THEN
+    assert breaker.state == 'closed'
+
+
+@pytest.mark.asyncio
+async def test_half_open_closes_after_successful_trials(mock_async_model_provider: MagicMock) -> None:
+    """Test the breaker closes once its trial predictions succeed after the open period."""
+    # GIVEN
+    clock = FakeClock()
+    breaker = AsyncCircuitBreakerModelProvider(
+        mock_async_model_provider, min_calls=1, open_seconds=30, half_open_max_calls=2, clock=clock
+    )
+    mock_async_model_provider.predict.side_effect = httpx.ConnectError('fail')
+    await _fail(breaker, 1)
+    mock_async_model_provider.predict.side_effect = None
+    clock.now = 30
+
+    # WHEN
+    assert breaker.state == 'half_open'
+    await breaker.predict(INPUT_DATA)
+    await breaker.predict(INPUT_DATA)
+
+    # THEN
+    assert breaker.state == 'closed'
+    assert breaker.failure_rate == 0.0
+
+
+@pytest.mark.asyncio
+async def test_half_open_reopens_on_failed_trial(mock_async_model_provider: MagicMock) -> None:
+    """Test a failed trial prediction opens the breaker again for a full open period."""
+    # GIVEN
+    clock = FakeClock()
+    breaker = AsyncCircuitBreakerModelProvider(mock_async_model_provider, min_calls=1, open_seconds=30, clock=clock)
+    mock_async_model_provider.predict.side_effect = httpx.ConnectError('fail')
+    await _fail(breaker, 1)
+    clock.now = 30
+
+    # WHEN
+    await _fail(breaker, 1)
+
+    # THEN
+    assert breaker.state == 'open'
+    assert breaker.opened == 2
+
+
+@pytest.mark.asyncio
+async def test_half_open_client_error_frees_trial_slot(mock_async_model_provider: MagicMock) -> None:
+    """Test a trial prediction rejected because of the request lets another trial through, which can close the
+    breaker."""
+    # GIVEN
+    clock = FakeClock()
+    breaker = AsyncCircuitBreakerModelProvider(
+        mock_async_model_provider, min_calls=1, open_seconds=30, half_open_max_calls=1, clock=clock
+    )
+    mock_async_model_provider.predict.side_effect = httpx.ConnectError('fail')
+    await _fail(breaker, 1)
+    clock.now = 30
+    mock_async_model_provider.predict.side_effect = httpx.HTTPStatusError(
+        'fail', request=MagicMock(), response=MagicMock(status_code=422)
+    )
+
+    # WHEN
+    with pytest.raises(httpx.HTTPStatusError):
+        await breaker.predict(INPUT_DATA)
+    state_after_client_error = breaker.state
+    mock_async_model_provider.predict.side_effect = None
+    await breaker.predict(INPUT_DATA)
+
+    # THEN
+    assert state_after_client_error == 'half_open'
+    assert breaker.state == 'closed'
+
+
+@pytest.mark.asyncio
+async def test_half_open_cancelled_trial_frees_trial_slot(mock_async_model_provider: MagicMock) -> None:
+    """Test a cancelled trial prediction gives its slot back, and predictions rejected meanwhile get a Retry-After."""
+    # GIVEN
+    clock = FakeClock()
+    breaker = AsyncCircuitBreakerModelProvider(
+        mock_async_model_provider, min_calls=1, open_seconds=30, half_open_max_calls=1, clock=clock
+    )
+    mock_async_model_provider.predict.side_effect = httpx.ConnectError('fail')
+    await _fail(breaker, 1)
+    clock.now = 30
+    release = asyncio.Event()
+
+    async def hanging_predict(data: DataFrameSplit) -> MLFlowPredictionsView:
+        await release.wait()
+        return PREDICTIONS
+
+    mock_async_model_provider.predict.side_effect = hanging_predict
+    trial = asyncio.create_task(breaker.predict(INPUT_DATA))
+    await asyncio.sleep(0)
+
+    # WHEN
+    with pytest.raises(CircuitOpenError) as rejected:
+        await breaker.predict(INPUT_DATA)
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+    mock_async_model_provider.predict.side_effect = None
+    await breaker.predict(INPUT_DATA)
+
+    # THEN
+    assert rejected.value.retry_after is not None
+    assert breaker.state == 'closed'
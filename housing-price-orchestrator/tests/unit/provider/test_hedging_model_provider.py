@@ -0,0 +1,154 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import httpx
+import pytest
+
+from provider.hedging_model_provider import AsyncHedgingModelProvider
+from shared.view.mlflow_view import DataFrameSplit, MLFlowPredictionsView
+
+INPUT_DATA = DataFrameSplit(columns=['Id'], data=[(1,)])
+
+
+def _provider(*delays: float | Exception) -> MagicMock:
+    """Builds a provider answering successive calls with their index after the given delays, or raising the errors."""
+
+    calls = iter(enumerate(delays))
+    cancelled = []
+
+    async def predict(data: DataFrameSplit) -> MLFlowPredictionsView:
+        index, delay = next(calls)
+        if isinstance(delay, Exception):
+            raise delay
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        return MLFlowPredictionsView(predictions=[float(index)])
+
+    provider = MagicMock(model_version='1')
+    provider.predict = AsyncMock(side_effect=predict)
+    provider.cancelled = cancelled
+    return provider
+
+
+async def _warm_up(hedging: AsyncHedgingModelProvider, count: int) -> None:
+    for _ in range(count):
+        await hedging.predict(INPUT_DATA)
+
+
+@pytest.mark.asyncio
+async def test_predict_does_not_hedge_before_min_samples() -> None:
+    """Test predictions are not hedged until enough latencies have been observed."""
+    # GIVEN
+    provider = _provider(0.05)
+    hedging = AsyncHedgingModelProvider(provider, min_samples=1, max_hedge_ratio=1)
+
+    # WHEN
+    result = await hedging.predict(INPUT_DATA)
+
+    # THEN
+    assert result.predictions == [0.0]
+    assert provider.predict.await_count == 1
+    assert hedging.hedges == 0
+    assert hedging.hedge_delay == pytest.approx(0.05, abs=0.04)
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_follows_the_latency_window() -> None:
+    """Test the hedging delay is the percentile of the latest latencies only, once older ones leave the window."""
+    # GIVEN
+    times = iter([0.0, 5.0, 10.0, 11.0, 20.0, 22.0, 30.0, 33.0])
+    hedging = AsyncHedgingModelProvider(
+        _provider(0, 0, 0, 0), percentile=100, min_samples=1, window_size=3, clock=lambda: next(times)
+    )
+
+    # WHEN
+    await _warm_up(hedging, 3)
+    delay_before_eviction = hedging.hedge_delay
+    await hedging.predict(INPUT_DATA)
+
+    # THEN
+    assert delay_before_eviction == 5.0
+    assert hedging.hedge_delay == 3.0
+
+
+@pytest.mark.asyncio
+async def test_predict_hedges_slow_call_and_cancels_the_loser() -> None:
+    """Test a call slower than the hedging delay is duplicated, the first response wins and the other is cancelled."""
+    # GIVEN
+    provider = _provider(0.01, 0.01, 1.0, 0.01)
+    hedging = AsyncHedgingModelProvider(provider, min_samples=2, max_hedge_ratio=1, max_hedge_burst=1)
+    await _warm_up(hedging, 2)
+
+    # WHEN
+    result = await hedging.predict(INPUT_DATA)
+    await asyncio.sleep(0)
+
+    # THEN
+    assert result.predictions == [3.0]
+    assert provider.cancelled == [2]
+    assert hedging.hedges == 1
+    assert hedging.hedge_rate == pytest.approx(1 / 3)
+    assert hedging.win_rate == 1.0
+
+
+@pytest.mark.asyncio
+async def test_predict_keeps_primary_when_it_returns_first() -> None:
+    """Test the primary call wins when it returns before the hedge, which is then cancelled."""
+    # GIVEN
+    provider = _provider(0.01, 0.01, 0.05, 1.0)
+    hedging = AsyncHedgingModelProvider(provider, min_samples=2, max_hedge_ratio=1, max_hedge_burst=1)
+    await _warm_up(hedging, 2)
+
+    # WHEN
+    result = await hedging.predict(INPUT_DATA)
+    await asyncio.sleep(0)
+
+    # THEN
+    assert result.predictions == [2.0]
+    assert provider.cancelled == [3]
+    assert hedging.hedges == 1
+    assert hedging.win_rate == 0.0
+
+
+@pytest.mark.asyncio
+async def test_predict_respects_hedge_budget() -> None:
+    """Test no more than `max_hedge_ratio` of the predictions are hedged."""
+    # GIVEN
+    provider = _provider(0.01, 0.01, 0.05, 0.01, 0.05)
+    hedging = AsyncHedgingModelProvider(provider, min_samples=2, max_hedge_ratio=0.4)
+    await _warm_up(hedging, 2)
+
+    # WHEN
+    result = await hedging.predict(INPUT_DATA)
+
+    # THEN the budget earned by the first three predictions only allows one hedge
+    assert result.predictions == [3.0]
+    assert hedging.hedges == 1
+    assert (await hedging.predict(INPUT_DATA)).predictions == [4.0]
+    assert hedging.hedges == 1
+
+
+@pytest.mark.asyncio
+async def test_predict_falls_back_to_the_other_call_on_failure() -> None:
+    """Test the response of the other call is returned when the first call to complete fails."""
+    # GIVEN
+    provider = _provider(0.01, 0.01, 0.1, httpx.ConnectError('fail'))
+    hedging = AsyncHedgingModelProvider(provider, min_samples=2, max_hedge_ratio=1, max_hedge_burst=1)
+    await _warm_up(hedging, 2)
+
+    # WHEN
+    result = await hedging.predict(INPUT_DATA)
+
+    # THEN
+    assert result.predictions == [2.0]
+    assert hedging.hedges == 1
+    assert hedging.win_rate == 0.0
+
+
+def test_rejects_hedge_ratio_above_one() -> None:
+    """Test hedging cannot be configured to more than double the load."""
+    # WHEN / THEN
+    with pytest.raises(ValueError):
+        AsyncHedgingModelProvider(MagicMock(), max_hedge_ratio=1.5)
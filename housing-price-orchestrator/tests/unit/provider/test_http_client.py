@@ -0,0 +1,75 @@
+import asyncio
+from typing import AsyncIterator
+import httpx
+import pytest
+import pytest_asyncio
+
+from provider.http_client import InstrumentedAsyncTransport
+
+
+@pytest_asyncio.fixture
+async def server_url() -> AsyncIterator[str]:
+    """Serves keep-alive HTTP/1.1 responses, each after a short delay, on a loopback port."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while await reader.readuntil(b'\r\n\r\n'):
+                await asyncio.sleep(0.05)
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok')
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        yield f'http://127.0.0.1:{port}'
+
+
+@pytest.mark.asyncio
+async def test_stats_count_new_and_reused_connections(server_url: str) -> None:
+    """Test sequential requests open one connection and reuse it."""
+    # GIVEN
+    transport = InstrumentedAsyncTransport()
+
+    # WHEN
+    async with httpx.AsyncClient(transport=transport) as client:
+        for _ in range(3):
+            (await client.get(server_url)).raise_for_status()
+
+    # THEN
+    assert transport.stats.requests == 3
+    assert transport.stats.new_connections == 1
+    assert transport.stats.reused_connections == 2
+    assert transport.stats.reuse_ratio == pytest.approx(2 / 3)
+
+
+@pytest.mark.asyncio
+async def test_stats_measure_pool_wait(server_url: str) -> None:
+    """Test a request waiting for the only connection of the pool records its wait."""
+    # GIVEN
+    transport = InstrumentedAsyncTransport(limits=httpx.Limits(max_connections=1))
+
+    # WHEN
+    async with httpx.AsyncClient(transport=transport) as client:
+        await asyncio.gather(client.get(server_url), client.get(server_url))
+
+    # THEN
+    assert transport.stats.requests == 2
+    assert transport.stats.max_pool_wait_seconds >= 0.04
+    assert transport.stats.mean_pool_wait_seconds < transport.stats.max_pool_wait_seconds
+
+
+@pytest.mark.asyncio
+async def test_stats_count_pool_timeouts(server_url: str) -> None:
+    """Test requests giving up on waiting for a connection are counted."""
+    # GIVEN
+    transport = InstrumentedAsyncTransport(limits=httpx.Limits(max_connections=1))
+
+    # WHEN
+    async with httpx.AsyncClient(transport=transport, timeout=httpx.Timeout(1.0, pool=0.01)) as client:
+        results = await asyncio.gather(client.get(server_url), client.get(server_url), return_exceptions=True)
+
+    # THEN
+    assert any(isinstance(result, httpx.PoolTimeout) for result in results)
+    assert transport.stats.pool_timeouts == 1
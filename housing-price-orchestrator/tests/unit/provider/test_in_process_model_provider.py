@@ -0,0 +1,91 @@
+import builtins
+from unittest.mock import MagicMock
+import numpy as np
+import pandas as pd
+import pytest
+from pytest_mock import MockerFixture
+
+from provider.in_process_model_provider import AsyncInProcessModelProvider, InProcessModelProvider
+from shared.view.mlflow_view import DataFrameSplit, MLFlowPredictionsView
+
+
+@pytest.fixture
+def mock_model() -> MagicMock:
+    mock = MagicMock()
+    mock.predict.return_value = np.array([123.45, 234.56])
+    return mock
+
+
+def test_health_success(mock_model: MagicMock) -> None:
+    """Test the health method returns True once the model is loaded."""
+    # GIVEN
+    provider = InProcessModelProvider(model_uri='models:/housing-price/1', model=mock_model)
+
+    # WHEN
+    result = provider.health()
+
+    # THEN
+    assert result is True
+
+
+def test_predict_dataframe_split(mock_model: MagicMock) -> None:
+    """Test the predict method scores a DataFrameSplit as a DataFrame with the same columns."""
+    # GIVEN
+    provider = InProcessModelProvider(model_uri='models:/housing-price/1', model=mock_model)
+    data = DataFrameSplit(columns=['a', 'b'], data=[(1, 2), (3, 4)])
+
+    # WHEN
+    result = provider.predict(data)
+
+    # THEN
+    assert isinstance(result, MLFlowPredictionsView)
+    assert result.predictions == [123.45, 234.56]
+    pd.testing.assert_frame_equal(mock_model.predict.call_args.args[0], pd.DataFrame({'a': [1, 3], 'b': [2, 4]}))
+
+
+def test_predict_dataframe(mock_model: MagicMock) -> None:
+    """Test the predict method passes DataFrames to the model unchanged."""
+    # GIVEN
+    provider = InProcessModelProvider(model_uri='models:/housing-price/1', model=mock_model)
+    df = pd.DataFrame([{'a': 1, 'b': 2}])
+
+    # WHEN
+    result = provider.predict(df)
+
+    # THEN
+    assert result.predictions == [123.45, 234.56]
+    mock_model.predict.assert_called_once_with(df)
+
+
+def test_load_model_without_mlflow(mocker: MockerFixture) -> None:
+    """Test a helpful ImportError is raised when MLFlow is not installed."""
+    # GIVEN
+    real_import = builtins.__import__
+
+    def fake_import(name, *args, **kwargs):
+        if name.startswith('mlflow'):
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    mocker.patch('builtins.__import__', side_effect=fake_import)
+
+    # WHEN / THEN
+    with pytest.raises(ImportError, match='in-process'):
+        InProcessModelProvider(model_uri='models:/housing-price/1')
+
+
+@pytest.mark.asyncio
+async def test_async_predict(mock_model: MagicMock) -> None:
+    """Test the async wrapper delegates predictions to the in-process provider."""
+    # GIVEN
+    provider = AsyncInProcessModelProvider(
+        InProcessModelProvider(model_uri='models:/housing-price/1', model=mock_model)
+    )
+
+    # WHEN
+    result = await provider.predict(DataFrameSplit(columns=['a', 'b'], data=[(1, 2)]))
+    healthy = await provider.health()
+
+    # THEN
+    assert result.predictions == [123.45, 234.56]
+    assert healthy is True
@@ -1,30 +1,35 @@
+import time
 import pandas as pd
 import httpx
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
-from provider.mlflow_model_provider import MLFlowModelProvider
-from shared.view.mlflow_view import MLFlowPredictionsView
+from provider.mlflow_model_provider import AsyncMLFlowModelProvider, MLFlowModelProvider
+from shared.view.mlflow_view import DataFrameSplit, MLFlowPredictionsView
+from v2_stub_server import ModelBehaviour, create_app, run_http_server
 
 
 def test_health_success(mocker):
     """Test the health method returns True when /ping returns 200."""
     # GIVEN
-    mocker.patch('httpx.get', return_value=MagicMock(status_code=200))
-    provider = MLFlowModelProvider(base_url='http://fake-url')
+    mock_client = MagicMock()
+    mock_client.get.return_value = MagicMock(status_code=200)
+    provider = MLFlowModelProvider(base_url='http://fake-url', client=mock_client)
 
     # WHEN
     result = provider.health()
 
     # THEN
     assert result is True
+    mock_client.get.assert_called_once_with('http://fake-url/ping')
 
 
 def test_health_failure(mocker):
     """Test the health method returns False when /ping raises an error."""
     # GIVEN
-    mocker.patch('httpx.get', side_effect=httpx.RequestError('fail'))
-    provider = MLFlowModelProvider(base_url='http://fake-url')
+    mock_client = MagicMock()
+    mock_client.get.side_effect = httpx.RequestError('fail')
+    provider = MLFlowModelProvider(base_url='http://fake-url', client=mock_client)
 
     # WHEN
     result = provider.health()
@@ -72,3 +77,126 @@ def test_predict_http_error(mocker):
     # WHEN / THEN
     with pytest.raises(httpx.HTTPStatusError):
         provider.predict(df)
+
+
+@pytest.mark.asyncio
+async def test_async_health_success() -> None:
+    """Test the async health method returns True when /ping returns 200."""
+    # GIVEN
+    mock_client = MagicMock()
+    mock_client.get = AsyncMock(return_value=MagicMock(status_code=200))
+    provider = AsyncMLFlowModelProvider(base_url='http://fake-url', client=mock_client)
+
+    # WHEN
+    result = await provider.health()
+
+    # THEN
+    assert result is True
+    mock_client.get.assert_awaited_once_with('http://fake-url/ping')
+
+
+@pytest.mark.asyncio
+async def test_async_health_failure() -> None:
+    """Test the async health method returns False when /ping raises an error."""
+    # GIVEN
+    mock_client = MagicMock()
+    mock_client.get = AsyncMock(side_effect=httpx.RequestError('fail'))
+    provider = AsyncMLFlowModelProvider(base_url='http://fake-url', client=mock_client)
+
+    # WHEN
+    result = await provider.health()
+
+    # THEN
+    assert result is False
+
+
+@pytest.mark.asyncio
+async def test_async_predict_success() -> None:
+    """Test the async predict method returns MLFlowPredictionsView on success."""
+    # GIVEN
+    mock_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.json.return_value = {'predictions': [123.45]}
+    mock_client.post = AsyncMock(return_value=mock_response)
+    provider = AsyncMLFlowModelProvider(base_url='http://fake-url', client=mock_client)
+    df = pd.DataFrame([{'a': 1, 'b': 2}])
+
+    # WHEN
+    result = await provider.predict(df)
+
+    # THEN
+    mock_client.post.assert_awaited_once_with(
+        'http://fake-url/invocations',
+        content=b'{"dataframe_split":{"columns":["a","b"],"data":[[1,2]]}}',
+        headers={'Content-Type': 'application/json'},
+    )
+    assert isinstance(result, MLFlowPredictionsView)
+    assert result.predictions == [123.45]
+
+
+@pytest.mark.asyncio
+async def test_async_predict_http_error() -> None:
+    """Test the async predict method raises if HTTP error occurs."""
+    # GIVEN
+    mock_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+        'fail', request=MagicMock(), response=MagicMock()
+    )
+    mock_client.post = AsyncMock(return_value=mock_response)
+    provider = AsyncMLFlowModelProvider(base_url='http://fake-url', client=mock_client)
+    df = pd.DataFrame([{'a': 1, 'b': 2}])
+
+    # WHEN / THEN
+    with pytest.raises(httpx.HTTPStatusError):
+        await provider.predict(df)
+
+
+@pytest.mark.asyncio
+async def test_async_predict_stub_server_latency() -> None:
+    """Test predictions against the stub model server take its fixed latency plus its per-row cost."""
+    # GIVEN
+    input_data = DataFrameSplit(columns=['Id', 'LotArea'], data=[[id, 100] for id in range(1, 11)])
+
+    async with run_http_server(behaviour=ModelBehaviour(latency_ms=20, per_row_ms=3)) as base_url:
+        async with httpx.AsyncClient() as client:
+            provider = AsyncMLFlowModelProvider(base_url=base_url, client=client)
+
+            # WHEN
+            started = time.perf_counter()
+            result = await provider.predict(input_data)
+            elapsed = time.perf_counter() - started
+
+    # THEN
+    assert result.predictions == [float(id + 100) for id in range(1, 11)]
+    assert elapsed >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_async_predict_stub_server_errors() -> None:
+    """Test the provider raises an HTTPStatusError when the stub model server fails a prediction."""
+    # GIVEN
+    input_data = DataFrameSplit(columns=['Id'], data=[[1]])
+    app = create_app(behaviour=ModelBehaviour(error_rate=1.0))
+    provider = AsyncMLFlowModelProvider(
+        base_url='http://stub', client=httpx.AsyncClient(transport=httpx.ASGITransport(app))
+    )
+
+    # WHEN / THEN
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        await provider.predict(input_data)
+    assert error.value.response.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_async_fetch_model_version_from_v2_metadata() -> None:
+    """Test the async provider reads the model version from the V2 metadata served beside `/invocations`, if named."""
+    # GIVEN
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(create_app(model_version='2')))
+    provider = AsyncMLFlowModelProvider('http://stub', client, model_version='1', model_name='mlflow-model')
+    unnamed = AsyncMLFlowModelProvider('http://stub', client, model_version='1')
+
+    # WHEN / THEN
+    assert await provider.fetch_model_version() == '2'
+    assert provider.model_version == '2'
+    assert await unnamed.fetch_model_version() == '1'
@@ -0,0 +1,120 @@
+import json
+import pathlib
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from provider.record_file_provider import PredictionFileWriter, infer_record_format, read_records
+from shared.dto.price_prediction import PricePrediction
+
+
+def test_infer_record_format() -> None:
+    """Test the record format is inferred from the file suffix."""
+    # WHEN / THEN
+    assert infer_record_format(pathlib.Path('a.ndjson')) == 'jsonl'
+    assert infer_record_format(pathlib.Path('a.CSV')) == 'csv'
+    assert infer_record_format(pathlib.Path('a.parquet')) == 'parquet'
+    with pytest.raises(ValueError):
+        infer_record_format(pathlib.Path('a.txt'))
+
+
+def test_read_records_jsonl(tmp_path: pathlib.Path) -> None:
+    """Test JSONL records are streamed line by line, skipping blank lines."""
+    # GIVEN
+    path = tmp_path / 'records.jsonl'
+    path.write_text('{"id": 1}\n\n{"id": 2}\n')
+
+    # WHEN
+    records = list(read_records(path))
+
+    # THEN
+    assert records == [{'id': 1}, {'id': 2}]
+
+
+def test_read_records_csv(tmp_path: pathlib.Path) -> None:
+    """Test CSV records are read with empty values as missing values."""
+    # GIVEN
+    path = tmp_path / 'records.csv'
+    path.write_text('Id,LotFrontage\n1,65\n2,\n')
+
+    # WHEN
+    records = list(read_records(path))
+
+    # THEN
+    assert records == [{'Id': '1', 'LotFrontage': '65'}, {'Id': '2', 'LotFrontage': None}]
+
+
+def test_read_records_csv_kaggle_missing_values(tmp_path: pathlib.Path) -> None:
+    """Test Kaggle CSV rows are read with NA values as missing values, like pandas reads them, unless configured."""
+    # GIVEN
+    path = tmp_path / 'test.csv'
+    path.write_text('Id,MSSubClass,MSZoning,LotFrontage,LotArea,Street,Alley\n1468,60,RL,NA,7980,Pave,NA\n')
+
+    # WHEN
+    records = list(read_records(path))
+    records_with_empty_nulls = list(read_records(path, null_values=['']))
+
+    # THEN
+    assert records == [
+        {
+            'Id': '1468',
+            'MSSubClass': '60',
+            'MSZoning': 'RL',
+            'LotFrontage': None,
+            'LotArea': '7980',
+            'Street': 'Pave',
+            'Alley': None,
+        }
+    ]
+    assert records_with_empty_nulls[0]['LotFrontage'] == 'NA'
+
+
+def test_read_records_parquet(tmp_path: pathlib.Path) -> None:
+    """Test Parquet records are streamed in batches."""
+    # GIVEN
+    path = tmp_path / 'records.parquet'
+    pq.write_table(pa.table({'Id': [1, 2, 3], 'LotArea': [10, 20, 30]}), path)
+
+    # WHEN
+    records = list(read_records(path, batch_size=2))
+
+    # THEN
+    assert records == [{'Id': 1, 'LotArea': 10}, {'Id': 2, 'LotArea': 20}, {'Id': 3, 'LotArea': 30}]
+
+
+def test_prediction_file_writer_jsonl(tmp_path: pathlib.Path) -> None:
+    """Test predictions are appended to JSONL files with the API response field names."""
+    # GIVEN
+    path = tmp_path / 'predictions.jsonl'
+
+    # WHEN
+    with PredictionFileWriter(path) as writer:
+        writer.write([PricePrediction(id=1, predicted_price=100.0)])
+        writer.write([PricePrediction(id=2, predicted_price=200.0)])
+
+    # THEN
+    assert [json.loads(line) for line in path.read_text().splitlines()] == [
+        {'id': 1, 'predictedPrice': 100.0},
+        {'id': 2, 'predictedPrice': 200.0},
+    ]
+
+
+def test_prediction_file_writer_parquet(tmp_path: pathlib.Path) -> None:
+    """Test predictions are appended to Parquet files."""
+    # GIVEN
+    path = tmp_path / 'predictions.parquet'
+
+    # WHEN
+    with PredictionFileWriter(path) as writer:
+        writer.write([PricePrediction(id=1, predicted_price=100.0)])
+        writer.write([PricePrediction(id=2, predicted_price=200.0)])
+
+    # THEN
+    assert pq.read_table(path).to_pylist() == [{'id': 1, 'predictedPrice': 100.0}, {'id': 2, 'predictedPrice': 200.0}]
+
+
+def test_prediction_file_writer_rejects_csv(tmp_path: pathlib.Path) -> None:
+    """Test predictions cannot be written to CSV files."""
+    # WHEN / THEN
+    with pytest.raises(ValueError):
+        PredictionFileWriter(tmp_path / 'predictions.csv')
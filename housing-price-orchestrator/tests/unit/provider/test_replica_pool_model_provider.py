@@ -0,0 +1,173 @@
+import asyncio
+import random
+from unittest.mock import AsyncMock, MagicMock
+import httpx
+import pytest
+
+from provider.replica_pool_model_provider import AsyncReplicaPoolModelProvider, NoHealthyReplicaError
+from shared.view.mlflow_view import DataFrameSplit, MLFlowPredictionsView
+
+INPUT_DATA = DataFrameSplit(columns=['Id'], data=[(1,)])
+
+
+def _replica(prediction: float) -> MagicMock:
+    replica = MagicMock()
+    replica.predict = AsyncMock(return_value=MLFlowPredictionsView(predictions=[prediction]))
+    replica.health = AsyncMock(return_value=True)
+    return replica
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_predict_prefers_the_replica_with_fewer_outstanding_predictions() -> None:
+    """Test concurrent predictions are spread across replicas instead of piling up on one."""
+    # GIVEN
+    release = asyncio.Event()
+    replicas = [_replica(1.0), _replica(2.0)]
+    for replica in replicas:
+        prediction = replica.predict.return_value
+
+        async def predict(
+            data: DataFrameSplit, prediction: MLFlowPredictionsView = prediction
+        ) -> MLFlowPredictionsView:
+            await release.wait()
+            return prediction
+
+        replica.predict.side_effect = predict
+    pool = AsyncReplicaPoolModelProvider(replicas, rng=random.Random(0))
+
+    # WHEN
+    tasks = [asyncio.create_task(pool.predict(INPUT_DATA)) for _ in range(4)]
+    await asyncio.sleep(0)
+    outstanding = [replica.outstanding for replica in pool.replicas]
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    # THEN
+    assert outstanding == [2, 2]
+    assert sorted(result.predictions[0] for result in results) == [1.0, 1.0, 2.0, 2.0]
+    assert [replica.outstanding for replica in pool.replicas] == [0, 0]
+
+
+@pytest.mark.asyncio
+async def test_predict_ejects_failing_replica_until_probe_succeeds() -> None:
+    """Test a replica failing repeatedly is ejected, then brought back once a health probe succeeds."""
+    # GIVEN
+    clock = FakeClock()
+    failing, healthy = _replica(1.0), _replica(2.0)
+    failing.predict.side_effect = httpx.ConnectError('fail')
+    # Pick replicas in pool order, so that ties go to the failing replica
+    rng = MagicMock(sample=lambda population, k: population[:k])
+    pool = AsyncReplicaPoolModelProvider([failing, healthy], max_failures=2, ejection_seconds=5, clock=clock, rng=rng)
+
+    # WHEN
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            await pool.predict(INPUT_DATA)
+
+    # THEN
+    assert pool.available == [healthy]
+    assert (await pool.predict(INPUT_DATA)).predictions == [2.0]
+
+    # WHEN the ejection period elapsed and the replica recovered
+    failing.predict.side_effect = None
+    clock.now = 5
+    await pool.predict(INPUT_DATA)
+    await asyncio.sleep(0)
+
+    # THEN
+    failing.health.assert_awaited_once()
+    assert pool.available == [failing, healthy]
+
+
+@pytest.mark.asyncio
+async def test_predict_does_not_eject_replica_on_client_errors() -> None:
+    """Test errors caused by the request, rather than by the replica, do not count as failures."""
+    # GIVEN
+    replica = _replica(1.0)
+    replica.predict.side_effect = httpx.HTTPStatusError(
+        'fail', request=MagicMock(), response=MagicMock(status_code=400)
+    )
+    pool = AsyncReplicaPoolModelProvider([replica], max_failures=1)
+
+    # WHEN
+    with pytest.raises(httpx.HTTPStatusError):
+        await pool.predict(INPUT_DATA)
+
+    # THEN
+    assert pool.available == [replica]
+
+
+@pytest.mark.asyncio
+async def test_predict_raises_when_every_replica_is_ejected() -> None:
+    """Test predictions are rejected with a retry delay once no replica is left in the pool."""
+    # GIVEN
+    clock = FakeClock()
+    replica = _replica(1.0)
+    replica.predict.side_effect = httpx.ConnectError('fail')
+    pool = AsyncReplicaPoolModelProvider([replica], max_failures=1, ejection_seconds=5, clock=clock)
+    with pytest.raises(httpx.ConnectError):
+        await pool.predict(INPUT_DATA)
+    clock.now = 2
+
+    # WHEN / THEN
+    with pytest.raises(NoHealthyReplicaError) as exc_info:
+        await pool.predict(INPUT_DATA)
+    assert exc_info.value.retry_after == 3
+
+
+@pytest.mark.asyncio
+async def test_health_ejects_and_restores_replicas() -> None:
+    """Test health probes every replica, and reports the pool healthy while one replica is."""
+    # GIVEN
+    first, second = _replica(1.0), _replica(2.0)
+    second.health.return_value = False
+    pool = AsyncReplicaPoolModelProvider([first, second])
+
+    # WHEN
+    healthy = await pool.health()
+
+    # THEN
+    assert healthy is True
+    assert pool.available == [first]
+
+    # WHEN
+    second.health.return_value = True
+    await pool.health()
+
+    # THEN
+    assert pool.available == [first, second]
+
+
+@pytest.mark.asyncio
+async def test_fetch_model_version_lists_the_versions_of_the_replicas() -> None:
+    """Test the pool reports every version its replicas serve, so a rolling deploy changes it as it starts and ends."""
+    # GIVEN
+    replicas = [_replica(1.0), _replica(2.0)]
+    replicas[0].fetch_model_version = AsyncMock(return_value='2')
+    replicas[1].fetch_model_version = AsyncMock(return_value='1')
+    pool = AsyncReplicaPoolModelProvider(replicas, model_version='1')
+
+    # WHEN
+    rolling = await pool.fetch_model_version()
+    replicas[1].fetch_model_version.return_value = '2'
+    deployed = await pool.fetch_model_version()
+
+    # THEN
+    assert rolling == '1,2'
+    assert deployed == '2'
+    assert pool.model_version == '2'
+
+
+def test_requires_a_replica() -> None:
+    """Test a pool cannot be built without replicas."""
+    # WHEN / THEN
+    with pytest.raises(ValueError):
+        AsyncReplicaPoolModelProvider([])
@@ -0,0 +1,158 @@
+import json
+from typing import AsyncIterator
+import httpx
+import pytest
+import pytest_asyncio
+
+from provider.v2_model_provider import AsyncV2GrpcModelProvider, AsyncV2ModelProvider
+from shared.exceptions import UnsupportedInputError
+from shared.view.mlflow_view import DataFrameSplit
+from shared.view.v2_view import BINARY_HEADER_LENGTH, V2InferenceRequestView
+from v2_stub_server import create_app, start_grpc_server
+
+INPUT_DATA = DataFrameSplit(
+    columns=['Id', 'LotArea', 'MSZoning', 'LotFrontage'], data=[[1, 100, 'RL', 2.5], [2, 200, None, None]]
+)
+COMPLETE_INPUT_DATA = DataFrameSplit(
+    columns=['Id', 'LotArea', 'MSZoning', 'LotFrontage'], data=[[1, 100, 'RL', 2.5], [2, 200, 'RM', None]]
+)
+
+
+@pytest.fixture
+def stub_client() -> httpx.AsyncClient:
+    """An HTTP client calling the stub model server in-process."""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app()))
+
+
+@pytest_asyncio.fixture
+async def grpc_provider() -> AsyncIterator[AsyncV2GrpcModelProvider]:
+    """A gRPC provider calling the stub model server on a free local port."""
+    server, port = await start_grpc_server()
+    provider = AsyncV2GrpcModelProvider(f'127.0.0.1:{port}', 'mlflow-model')
+    yield provider
+    await provider.close()
+    await server.stop(grace=None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('binary_data', [False, True])
+async def test_predict_rest(stub_client: httpx.AsyncClient, binary_data: bool) -> None:
+    """Test the REST provider sends typed tensors and decodes JSON and binary outputs."""
+    # GIVEN
+    provider = AsyncV2ModelProvider('http://stub', 'mlflow-model', stub_client, binary_data=binary_data)
+
+    # WHEN
+    result = await provider.predict(INPUT_DATA)
+
+    # THEN
+    assert result.predictions == [103.5, 202.0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('binary_data', [False, True])
+async def test_predict_rest_missing_strings_match_mlflow(binary_data: bool) -> None:
+    """Test missing categorical values reach the model as nulls, like in MLflow payloads, not as empty strings."""
+    # GIVEN
+    requests: list[httpx.Request] = []
+
+    async def record(request: httpx.Request) -> None:
+        requests.append(request)
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app()), event_hooks={'request': [record]})
+    provider = AsyncV2ModelProvider('http://stub', 'mlflow-model', client, binary_data=binary_data)
+
+    # WHEN
+    await provider.predict(INPUT_DATA)
+
+    # THEN
+    body = requests[0].content
+    header = body[: int(requests[0].headers.get(BINARY_HEADER_LENGTH, len(body)))]
+    inputs = {tensor.name: tensor for tensor in V2InferenceRequestView.model_validate_json(header).inputs}
+    mlflow_rows = json.loads(INPUT_DATA.to_json_bytes())['dataframe_split']['data']
+    assert inputs['MSZoning'].data == [row[2] for row in mlflow_rows] == ['RL', None]
+    assert (inputs['LotArea'].data is None) == binary_data
+
+
+@pytest.mark.asyncio
+async def test_predict_rest_http_error(stub_client: httpx.AsyncClient) -> None:
+    """Test the REST provider raises an HTTPStatusError for unknown models."""
+    # GIVEN
+    provider = AsyncV2ModelProvider('http://stub', 'unknown-model', stub_client)
+
+    # WHEN / THEN
+    with pytest.raises(httpx.HTTPStatusError):
+        await provider.predict(INPUT_DATA)
+
+
+@pytest.mark.asyncio
+async def test_health_rest(stub_client: httpx.AsyncClient) -> None:
+    """Test the REST provider reports the readiness of the model server."""
+    # GIVEN
+    provider = AsyncV2ModelProvider('http://stub', 'mlflow-model', stub_client)
+
+    # WHEN / THEN
+    assert await provider.health() is True
+
+
+@pytest.mark.asyncio
+async def test_fetch_model_version_rest() -> None:
+    """Test the REST provider keeps the version the model metadata reports, and its own when none is reported."""
+    # GIVEN
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(model_version='2')))
+    provider = AsyncV2ModelProvider('http://stub', 'mlflow-model', client, model_version='1')
+    unknown_model = AsyncV2ModelProvider('http://stub', 'unknown-model', client, model_version='1')
+
+    # WHEN / THEN
+    assert await provider.fetch_model_version() == '2'
+    assert provider.model_version == '2'
+    assert await unknown_model.fetch_model_version() == '1'
+
+
+@pytest.mark.asyncio
+async def test_fetch_model_version_grpc() -> None:
+    """Test the gRPC provider keeps the version the model metadata reports."""
+    # GIVEN
+    server, port = await start_grpc_server(model_version='2')
+    provider = AsyncV2GrpcModelProvider(f'127.0.0.1:{port}', 'mlflow-model', model_version='1')
+
+    # WHEN
+    version = await provider.fetch_model_version()
+
+    # THEN
+    assert version == '2'
+    assert provider.model_version == '2'
+    await provider.close()
+    await server.stop(grace=None)
+
+
+@pytest.mark.asyncio
+async def test_predict_grpc(grpc_provider: AsyncV2GrpcModelProvider) -> None:
+    """Test the gRPC provider sends raw tensors and decodes raw outputs."""
+    # WHEN
+    result = await grpc_provider.predict(COMPLETE_INPUT_DATA)
+
+    # THEN
+    assert result.predictions == [103.5, 202.0]
+    assert await grpc_provider.health() is True
+
+
+@pytest.mark.asyncio
+async def test_predict_grpc_rejects_missing_strings(grpc_provider: AsyncV2GrpcModelProvider) -> None:
+    """Test the gRPC provider rejects missing categorical values, which gRPC tensors cannot send."""
+    # WHEN / THEN
+    with pytest.raises(UnsupportedInputError):
+        await grpc_provider.predict(INPUT_DATA)
+
+
+@pytest.mark.asyncio
+async def test_health_grpc_unavailable() -> None:
+    """Test the gRPC provider reports an unreachable model server as unhealthy."""
+    # GIVEN
+    provider = AsyncV2GrpcModelProvider('127.0.0.1:1', 'mlflow-model')
+
+    # WHEN
+    result = await provider.health()
+
+    # THEN
+    assert result is False
+    await provider.close()
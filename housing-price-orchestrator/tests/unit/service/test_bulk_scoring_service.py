@@ -0,0 +1,148 @@
+from typing import Any
+from unittest.mock import MagicMock
+import pytest
+
+from service.bulk_scoring_service import BulkScoringService
+from service.pricing_service import PricingService
+from shared.dto.bulk_scoring_summary import BulkScoringSummary
+from shared.dto.price_prediction import PricePrediction
+from shared.view.request_view import PricePredictionBatchRequest
+
+RECORD = {
+    'id': 1,
+    'ms_sub_class': 20,
+    'ms_zoning': 'RL',
+    'lot_area': 8450,
+    'street': 'Pave',
+    'lot_shape': 'Reg',
+    'land_contour': 'Lvl',
+    'utilities': 'AllPub',
+    'lot_config': 'Inside',
+    'land_slope': 'Gtl',
+    'neighborhood': 'CollgCr',
+    'condition_1': 'Norm',
+    'condition_2': 'Norm',
+    'bldg_type': '1Fam',
+    'house_style': '2Story',
+    'overall_qual': 7,
+    'overall_cond': 5,
+    'year_built': 2003,
+    'year_remod_add': 2003,
+    'roof_style': 'Gable',
+    'roof_matl': 'CompShg',
+    'exterior_1st': 'VinylSd',
+    'exterior_2nd': 'VinylSd',
+    'exter_qual': 'Gd',
+    'exter_cond': 'TA',
+    'foundation': 'PConc',
+    'bsmt_fin_sf_1': 706,
+    'bsmt_fin_sf_2': 0,
+    'bsmt_unf_sf': 150,
+    'total_bsmt_sf': 856,
+    'heating': 'GasA',
+    'heating_qc': 'Ex',
+    'central_air': 'Y',
+    'first_flr_sf': 856,
+    'second_flr_sf': 854,
+    'low_qual_fin_sf': 0,
+    'gr_liv_area': 1710,
+    'bsmt_full_bath': 1,
+    'bsmt_half_bath': 0,
+    'full_bath': 2,
+    'half_bath': 1,
+    'bedroom_abv_gr': 3,
+    'kitchen_abv_gr': 1,
+    'kitchen_qual': 'Gd',
+    'tot_rms_abv_grd': 8,
+    'functional': 'Typ',
+    'fireplaces': 0,
+    'garage_cars': 2,
+    'garage_area': 548,
+    'paved_drive': 'Y',
+    'wood_deck_sf': 0,
+    'open_porch_sf': 61,
+    'enclosed_porch': 0,
+    'three_ssn_porch': 0,
+    'screen_porch': 0,
+    'pool_area': 0,
+    'misc_val': 0,
+    'mo_sold': 2,
+    'yr_sold': 2008,
+    'sale_type': 'WD',
+    'sale_condition': 'Normal',
+}
+
+
+@pytest.fixture
+def mock_pricing_service() -> MagicMock:
+    mock = MagicMock(PricingService)
+    mock.predict_price_batch.side_effect = lambda batch: [
+        PricePrediction(id=req.id, predicted_price=1000.0 * req.id) for req in batch.data
+    ]
+    return mock
+
+
+def _records(count: int) -> list[dict[str, Any]]:
+    return [{**RECORD, 'id': id} for id in range(1, count + 1)]
+
+
+def test_score_writes_predictions_in_order(mock_pricing_service: MagicMock) -> None:
+    """Test every record is scored in chunks and written in input order."""
+    # GIVEN
+    service = BulkScoringService(mock_pricing_service, chunk_size=3, workers=2)
+    written: list[PricePrediction] = []
+    progress: list[int] = []
+
+    # WHEN
+    summary = service.score(_records(10), written.extend, lambda s: progress.append(s.records_scored))
+
+    # THEN
+    assert [pred.id for pred in written] == list(range(1, 11))
+    assert mock_pricing_service.predict_price_batch.call_count == 4
+    assert progress == [3, 6, 9, 10]
+    assert isinstance(summary, BulkScoringSummary)
+    assert (summary.records_read, summary.records_scored, summary.records_invalid) == (10, 10, 0)
+
+
+def test_score_skips_invalid_records(mock_pricing_service: MagicMock) -> None:
+    """Test records failing validation are skipped and counted."""
+    # GIVEN
+    service = BulkScoringService(mock_pricing_service, chunk_size=2, workers=1)
+    records = _records(3)
+    records[1]['overall_qual'] = 42
+
+    # WHEN
+    written: list[PricePrediction] = []
+    summary = service.score(records, written.extend)
+
+    # THEN
+    assert [pred.id for pred in written] == [1, 3]
+    assert summary.records_invalid == 1
+
+
+def test_score_accepts_model_column_names(mock_pricing_service: MagicMock) -> None:
+    """Test records keyed by model column names, as in the training data files, are validated."""
+    # GIVEN
+    service = BulkScoringService(mock_pricing_service, chunk_size=10, workers=1)
+    record = {**RECORD}
+    record['Id'] = record.pop('id')
+    record['MSSubClass'] = record.pop('ms_sub_class')
+
+    # WHEN
+    summary = service.score([record], lambda predictions: None)
+
+    # THEN
+    assert summary.records_scored == 1
+    batch: PricePredictionBatchRequest = mock_pricing_service.predict_price_batch.call_args.args[0]
+    assert batch.data[0].ms_sub_class == 20
+
+
+def test_score_propagates_model_errors(mock_pricing_service: MagicMock) -> None:
+    """Test a failed chunk fails the run."""
+    # GIVEN
+    mock_pricing_service.predict_price_batch.side_effect = RuntimeError('model down')
+    service = BulkScoringService(mock_pricing_service, chunk_size=2, workers=2)
+
+    # WHEN / THEN
+    with pytest.raises(RuntimeError, match='model down'):
+        service.score(_records(5), lambda predictions: None)
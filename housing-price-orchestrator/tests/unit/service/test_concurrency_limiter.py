@@ -0,0 +1,178 @@
+import asyncio
+import httpx
+import pytest
+
+from service.concurrency_limiter import AdaptiveConcurrencyLimiter, ConcurrencyLimitExceededError
+from shared.exceptions import ServiceUnavailableError
+from shared.instrumentation import track_model_call
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _predict(limiter: AdaptiveConcurrencyLimiter, clock: FakeClock, seconds: float, rows: int = 1) -> None:
+    async with limiter.acquire(rows):
+        with track_model_call(rows):
+            clock.now += seconds
+
+
+@pytest.mark.asyncio
+async def test_limit_increases_while_in_use_and_fast() -> None:
+    """Test fast predictions using the whole limit increase it by about one slot per round."""
+    # GIVEN
+    clock = FakeClock()
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, clock=clock)
+
+    # WHEN
+    for _ in range(3):
+        await _predict(limiter, clock, 0.01)
+
+    # THEN
+    assert limiter.limit == 2
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limit_decreases_once_per_round_on_slow_predictions() -> None:
+    """Test predictions much slower than the fastest recent one decrease the limit, once for those started together."""
+    # GIVEN
+    clock = FakeClock()
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, backoff_ratio=0.5, clock=clock)
+    await _predict(limiter, clock, 0.01)
+    release = asyncio.Event()
+
+    async def slow_prediction() -> None:
+        async with limiter.acquire():
+            with track_model_call(1):
+                await release.wait()
+
+    tasks = [asyncio.create_task(slow_prediction()) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    # WHEN
+    clock.now += 1.0
+    release.set()
+    await asyncio.gather(*tasks)
+
+    # THEN
+    assert limiter.limit == 5
+
+
+@pytest.mark.asyncio
+async def test_latency_compared_with_predictions_of_similar_size() -> None:
+    """Test a large prediction is not compared with the latency of single rows."""
+    # GIVEN
+    clock = FakeClock()
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=4, backoff_ratio=0.5, clock=clock)
+    await _predict(limiter, clock, 0.01)
+
+    # WHEN
+    await _predict(limiter, clock, 1.0, rows=1000)
+
+    # THEN
+    assert limiter.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_limit_decreases_on_model_failures_only() -> None:
+    """Test failures of the model server decrease the limit, but predictions the model cannot make do not."""
+    # GIVEN
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, backoff_ratio=0.5, clock=FakeClock())
+
+    # WHEN
+    with pytest.raises(ValueError):
+        async with limiter.acquire():
+            raise ValueError('No predictions returned from the model.')
+    limit_after_value_error = limiter.limit
+    with pytest.raises(httpx.ReadTimeout):
+        async with limiter.acquire():
+            raise httpx.ReadTimeout('Timed out.')
+
+    # THEN
+    assert limit_after_value_error == 10
+    assert limiter.limit == 5
+
+
+@pytest.mark.asyncio
+async def test_latency_only_recorded_for_successful_model_calls() -> None:
+    """Test near instant cache hits and rejected predictions do not lower the latency the model calls compare with."""
+    # GIVEN
+    clock = FakeClock()
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=20, max_limit=20, backoff_ratio=0.5, clock=clock)
+    await _predict(limiter, clock, 0.05)
+
+    # WHEN
+    for _ in range(10):
+        async with limiter.acquire():
+            clock.now += 0.0001
+        with pytest.raises(ServiceUnavailableError):
+            async with limiter.acquire():
+                raise ServiceUnavailableError('The pricing model is unavailable, please retry later.')
+        with pytest.raises(ValueError):
+            async with limiter.acquire():
+                raise ValueError('No predictions returned from the model.')
+    await _predict(limiter, clock, 0.06)
+
+    # THEN
+    assert limiter.limit == 20
+
+
+@pytest.mark.asyncio
+async def test_queued_predictions_wait_for_a_slot_and_excess_is_shed() -> None:
+    """Test predictions beyond the limit wait in the queue, in order, and those beyond the queue are shed."""
+    # GIVEN
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_queue_size=2, clock=FakeClock())
+    order: list[int] = []
+    release = asyncio.Event()
+
+    async def prediction(index: int) -> None:
+        async with limiter.acquire():
+            order.append(index)
+            await release.wait()
+
+    tasks = [asyncio.create_task(prediction(index)) for index in range(3)]
+    await asyncio.sleep(0)
+
+    # WHEN
+    with pytest.raises(ConcurrencyLimitExceededError):
+        await prediction(3)
+    queued = limiter.queued
+    release.set()
+    await asyncio.gather(*tasks)
+
+    # THEN
+    assert queued == 2
+    assert order == [0, 1, 2]
+    assert limiter.shed == 1
+    assert (limiter.in_flight, limiter.queued) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_queued_prediction_shed_after_max_wait() -> None:
+    """Test a prediction waiting longer than the maximum queue wait is shed and leaves the queue."""
+    # GIVEN
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_queue_wait_ms=10, clock=FakeClock())
+    release = asyncio.Event()
+
+    async def held_prediction() -> None:
+        async with limiter.acquire():
+            await release.wait()
+
+    task = asyncio.create_task(held_prediction())
+    await asyncio.sleep(0)
+
+    # WHEN
+    with pytest.raises(ConcurrencyLimitExceededError):
+        async with limiter.acquire():
+            pass
+    release.set()
+    await task
+
+    # THEN
+    assert limiter.shed == 1
+    assert (limiter.in_flight, limiter.queued) == (0, 0)
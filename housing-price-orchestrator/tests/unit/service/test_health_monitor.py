@@ -0,0 +1,87 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+
+from service.health_monitor import HealthMonitor
+
+
+@pytest.fixture
+def mock_async_model_provider() -> MagicMock:
+    mock = MagicMock()
+    mock.health = AsyncMock(return_value=True)
+    mock.fetch_model_version = AsyncMock(return_value='1')
+    return mock
+
+
+@pytest.mark.asyncio
+async def test_probe_caches_health(mock_async_model_provider: MagicMock) -> None:
+    """Test a probe caches the health of the model and the time it was checked."""
+    # GIVEN
+    monitor = HealthMonitor(mock_async_model_provider)
+
+    # WHEN
+    healthy = await monitor.probe()
+
+    # THEN
+    assert healthy is True
+    assert monitor.healthy is True
+    assert monitor.checked_at is not None
+
+
+@pytest.mark.asyncio
+async def test_probe_reports_errors_and_timeouts_as_unhealthy(mock_async_model_provider: MagicMock) -> None:
+    """Test a probe failing or not answering in time marks the model unhealthy."""
+    # GIVEN
+    monitor = HealthMonitor(mock_async_model_provider, timeout_seconds=0.01)
+    mock_async_model_provider.health.side_effect = RuntimeError('fail')
+
+    # WHEN / THEN
+    assert await monitor.probe() is False
+
+    # GIVEN
+    async def slow_health() -> bool:
+        await asyncio.sleep(1)
+        return True
+
+    mock_async_model_provider.health.side_effect = slow_health
+
+    # WHEN / THEN
+    assert await monitor.probe() is False
+    assert monitor.healthy is False
+
+
+@pytest.mark.asyncio
+async def test_probe_reads_the_model_version_when_healthy(mock_async_model_provider: MagicMock) -> None:
+    """Test healthy probes read the model version again, and failing to read it does not make the model unhealthy."""
+    # GIVEN
+    monitor = HealthMonitor(mock_async_model_provider)
+    await monitor.probe()
+    mock_async_model_provider.fetch_model_version.side_effect = RuntimeError('fail')
+
+    # WHEN
+    healthy = await monitor.probe()
+    mock_async_model_provider.health.return_value = False
+    await monitor.probe()
+
+    # THEN
+    assert healthy is True
+    assert mock_async_model_provider.fetch_model_version.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_start_probes_in_the_background(mock_async_model_provider: MagicMock) -> None:
+    """Test the monitor probes the model periodically until stopped."""
+    # GIVEN
+    monitor = HealthMonitor(mock_async_model_provider, interval_seconds=0.01)
+
+    # WHEN
+    monitor.start()
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+    probes = mock_async_model_provider.health.await_count
+    await asyncio.sleep(0.02)
+
+    # THEN
+    assert probes >= 2
+    assert mock_async_model_provider.health.await_count == probes
+    assert monitor.healthy is True
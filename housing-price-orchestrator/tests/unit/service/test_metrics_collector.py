@@ -0,0 +1,77 @@
+from unittest.mock import MagicMock
+
+from provider.circuit_breaker_model_provider import AsyncCircuitBreakerModelProvider
+from provider.hedging_model_provider import AsyncHedgingModelProvider
+from provider.http_client import ConnectionPoolStats
+from provider.replica_pool_model_provider import AsyncReplicaPoolModelProvider
+from service.concurrency_limiter import AdaptiveConcurrencyLimiter
+from service.metrics_collector import OrchestratorCollector
+from service.prediction_cache import PredictionCache
+
+
+def _samples(collector: OrchestratorCollector) -> dict[tuple[str, tuple[str, ...]], float]:
+    return {
+        (sample.name, tuple(sample.labels.values())): sample.value
+        for metric in collector.collect()
+        for sample in metric.samples
+    }
+
+
+def test_collect_walks_provider_chain() -> None:
+    """Test the counters of every wrapper around the model provider are exported."""
+    # GIVEN
+    replica_pool = AsyncReplicaPoolModelProvider([MagicMock(), MagicMock()])
+    hedging = AsyncHedgingModelProvider(replica_pool)
+    hedging.requests, hedging.hedges, hedging.hedge_wins = 10, 2, 1
+    breaker = AsyncCircuitBreakerModelProvider(hedging)
+    breaker.opened, breaker.rejected = 1, 3
+    collector = OrchestratorCollector(breaker)
+
+    # WHEN
+    samples = _samples(collector)
+
+    # THEN
+    assert samples[('orchestrator_circuit_breaker_state', ('closed',))] == 1
+    assert samples[('orchestrator_circuit_breaker_state', ('open',))] == 0
+    assert samples[('orchestrator_circuit_breaker_opened_total', ())] == 1
+    assert samples[('orchestrator_circuit_breaker_rejected_total', ())] == 3
+    assert samples[('orchestrator_hedged_requests_total', ())] == 10
+    assert samples[('orchestrator_hedges_total', ())] == 2
+    assert samples[('orchestrator_hedge_wins_total', ())] == 1
+    assert samples[('orchestrator_model_replicas_available', ())] == 2
+
+
+def test_collect_connection_pool_and_cache() -> None:
+    """Test the connection pool and prediction cache counters are exported."""
+    # GIVEN
+    cache = PredictionCache()
+    cache.hits, cache.misses = 7, 3
+    stats = ConnectionPoolStats(requests=5, new_connections=1, reused_connections=4, pool_timeouts=2)
+    collector = OrchestratorCollector(MagicMock(spec=[]), stats, cache)
+
+    # WHEN
+    samples = _samples(collector)
+
+    # THEN
+    assert samples[('orchestrator_model_client_connections_total', ('new',))] == 1
+    assert samples[('orchestrator_model_client_connections_total', ('reused',))] == 4
+    assert samples[('orchestrator_model_client_pool_timeouts_total', ())] == 2
+    assert samples[('orchestrator_prediction_cache_lookups_total', ('hit',))] == 7
+    assert samples[('orchestrator_prediction_cache_lookups_total', ('miss',))] == 3
+
+
+def test_collect_concurrency_limiter() -> None:
+    """Test the limit, usage and shed predictions of the concurrency limiter are exported."""
+    # GIVEN
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+    limiter.shed = 4
+    collector = OrchestratorCollector(MagicMock(spec=[]), concurrency_limiter=limiter)
+
+    # WHEN
+    samples = _samples(collector)
+
+    # THEN
+    assert samples[('orchestrator_concurrency_limit', ())] == 8
+    assert samples[('orchestrator_concurrency_limit_in_flight', ())] == 0
+    assert samples[('orchestrator_concurrency_limit_queued', ())] == 0
+    assert samples[('orchestrator_concurrency_limit_shed_total', ())] == 4
@@ -0,0 +1,134 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+
+from service.micro_batcher import BatchQueueFullError, MicroBatcher
+from shared.view.mlflow_view import DataFrameSplit
+
+
+@pytest.fixture
+def mock_async_model_provider() -> MagicMock:
+    mock = MagicMock()
+    mock.predict = AsyncMock(side_effect=lambda split: MagicMock(predictions=[float(row[0]) for row in split.data]))
+    return mock
+
+
+def _row(id: int) -> DataFrameSplit:
+    return DataFrameSplit(columns=['Id'], data=[(id,)])
+
+
+@pytest.mark.asyncio
+async def test_submit_coalesces_concurrent_rows(mock_async_model_provider: MagicMock) -> None:
+    """Test concurrent submissions are sent to the model in one call and each caller gets its own row back."""
+    # GIVEN
+    batcher = MicroBatcher(mock_async_model_provider, max_batch_size=3, max_wait_ms=1000)
+
+    # WHEN
+    results = await asyncio.gather(*(batcher.submit(_row(i)) for i in range(1, 4)))
+
+    # THEN
+    assert results == [1.0, 2.0, 3.0]
+    mock_async_model_provider.predict.assert_awaited_once()
+    assert mock_async_model_provider.predict.await_args.args[0] == DataFrameSplit(
+        columns=['Id'], data=[(1,), (2,), (3,)]
+    )
+    assert batcher.outstanding == 0
+
+
+@pytest.mark.asyncio
+async def test_submit_flushes_after_max_wait(mock_async_model_provider: MagicMock) -> None:
+    """Test a partial batch is sent once the maximum wait has elapsed."""
+    # GIVEN
+    batcher = MicroBatcher(mock_async_model_provider, max_batch_size=64, max_wait_ms=1)
+
+    # WHEN
+    results = await asyncio.gather(batcher.submit(_row(1)), batcher.submit(_row(2)))
+
+    # THEN
+    assert results == [1.0, 2.0]
+    mock_async_model_provider.predict.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_submit_splits_rows_beyond_max_batch_size(mock_async_model_provider: MagicMock) -> None:
+    """Test rows beyond the maximum batch size are sent in a separate model call."""
+    # GIVEN
+    batcher = MicroBatcher(mock_async_model_provider, max_batch_size=2, max_wait_ms=1)
+
+    # WHEN
+    results = await asyncio.gather(*(batcher.submit(_row(i)) for i in range(1, 6)))
+
+    # THEN
+    assert results == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert mock_async_model_provider.predict.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_submit_rejects_when_queue_full(mock_async_model_provider: MagicMock) -> None:
+    """Test submissions beyond the maximum queue size are rejected."""
+    # GIVEN
+    batcher = MicroBatcher(mock_async_model_provider, max_batch_size=64, max_wait_ms=1, max_queue_size=1)
+    pending = asyncio.ensure_future(batcher.submit(_row(1)))
+    await asyncio.sleep(0)
+
+    # WHEN / THEN
+    with pytest.raises(BatchQueueFullError):
+        await batcher.submit(_row(2))
+    assert await pending == 1.0
+
+
+@pytest.mark.asyncio
+async def test_submit_propagates_model_errors(mock_async_model_provider: MagicMock) -> None:
+    """Test a failed model call fails every caller in the batch."""
+    # GIVEN
+    mock_async_model_provider.predict.side_effect = RuntimeError('model down')
+    batcher = MicroBatcher(mock_async_model_provider, max_batch_size=2, max_wait_ms=1000)
+
+    # WHEN
+    results = await asyncio.gather(batcher.submit(_row(1)), batcher.submit(_row(2)), return_exceptions=True)
+
+    # THEN
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert batcher.outstanding == 0
+
+
+@pytest.mark.asyncio
+async def test_submit_cancels_callers_of_cancelled_batch(mock_async_model_provider: MagicMock) -> None:
+    """Test cancelling a batch being scored cancels its callers rather than leaving them waiting forever."""
+    # GIVEN
+    started = asyncio.Event()
+
+    async def slow_predict(split: DataFrameSplit) -> MagicMock:
+        started.set()
+        await asyncio.sleep(60)
+        return MagicMock(predictions=[])
+
+    mock_async_model_provider.predict.side_effect = slow_predict
+    batcher = MicroBatcher(mock_async_model_provider, max_batch_size=2, max_wait_ms=1000)
+    callers = asyncio.gather(batcher.submit(_row(1)), batcher.submit(_row(2)), return_exceptions=True)
+    await started.wait()
+
+    # WHEN
+    for batch in list(batcher._batches):
+        batch.cancel()
+    results = await asyncio.wait_for(callers, timeout=1)
+
+    # THEN
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert batcher.outstanding == 0
+
+
+@pytest.mark.asyncio
+async def test_submit_missing_prediction(mock_async_model_provider: MagicMock) -> None:
+    """Test callers without a prediction in the model output receive a ValueError."""
+    # GIVEN
+    mock_async_model_provider.predict.side_effect = None
+    mock_async_model_provider.predict.return_value = MagicMock(predictions=[1.0])
+    batcher = MicroBatcher(mock_async_model_provider, max_batch_size=2, max_wait_ms=1000)
+
+    # WHEN
+    results = await asyncio.gather(batcher.submit(_row(1)), batcher.submit(_row(2)), return_exceptions=True)
+
+    # THEN
+    assert results[0] == 1.0
+    assert isinstance(results[1], ValueError)
@@ -0,0 +1,93 @@
+from service.prediction_cache import PredictionCache
+from shared.view.mlflow_view import DataFrameSplit
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_keys_for_excludes_id() -> None:
+    """Test rows that only differ by Id share a cache key."""
+    # GIVEN
+    cache = PredictionCache()
+    input_data = DataFrameSplit(columns=['Id', 'LotArea', 'Street'], data=[(1, 8450, 'Pave'), (2, 8450, 'Pave')])
+
+    # WHEN
+    keys = cache.keys_for(input_data)
+
+    # THEN
+    assert keys[0] == keys[1] == (8450, 'Pave')
+
+
+def test_get_counts_hits_and_misses() -> None:
+    """Test lookups are counted as hits or misses."""
+    # GIVEN
+    cache = PredictionCache()
+    cache.put(('a',), 1.0)
+
+    # WHEN
+    hit = cache.get(('a',))
+    miss = cache.get(('b',))
+
+    # THEN
+    assert (hit, miss) == (1.0, None)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_put_evicts_least_recently_used() -> None:
+    """Test the least recently used entry is evicted once the cache is full."""
+    # GIVEN
+    cache = PredictionCache(max_size=2)
+    cache.put(('a',), 1.0)
+    cache.put(('b',), 2.0)
+    cache.get(('a',))
+
+    # WHEN
+    cache.put(('c',), 3.0)
+
+    # THEN
+    assert len(cache) == 2
+    assert cache.get(('b',)) is None
+    assert cache.get(('a',)) == 1.0
+    assert cache.get(('c',)) == 3.0
+
+
+def test_get_expires_entries_after_ttl() -> None:
+    """Test entries older than the TTL are treated as misses and dropped."""
+    # GIVEN
+    clock = FakeClock()
+    cache = PredictionCache(ttl_seconds=10, clock=clock)
+    cache.put(('a',), 1.0)
+
+    # WHEN
+    clock.now = 5
+    before_expiry = cache.get(('a',))
+    clock.now = 11
+    after_expiry = cache.get(('a',))
+
+    # THEN
+    assert before_expiry == 1.0
+    assert after_expiry is None
+    assert len(cache) == 0
+
+
+def test_sync_model_version_invalidates_on_change() -> None:
+    """Test the cache is cleared when the model version changes, and only then."""
+    # GIVEN
+    cache = PredictionCache()
+    cache.sync_model_version('1')
+    cache.put(('a',), 1.0)
+
+    # WHEN
+    cache.sync_model_version('1')
+    unchanged = len(cache)
+    cache.sync_model_version('2')
+
+    # THEN
+    assert unchanged == 1
+    assert len(cache) == 0
+    assert cache.model_version == '2'
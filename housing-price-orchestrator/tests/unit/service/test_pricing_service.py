@@ -1,10 +1,14 @@
-from unittest.mock import MagicMock
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
 import pytest
 from pytest_mock import MockerFixture
 
-from service.pricing_service import PricingService
+from service.prediction_cache import PredictionCache
+from service.pricing_service import AsyncPricingService, PricingService
+from shared.instrumentation import ServerTiming
 from shared.view.request_view import PricePredictionRequest, PricePredictionBatchRequest
 from shared.dto.price_prediction import PricePrediction
+from shared.view.mlflow_view import DataFrameSplit
 
 
 @pytest.fixture
@@ -14,6 +18,80 @@ def mock_model_provider(mocker: MockerFixture) -> MagicMock:
     return mock
 
 
+@pytest.fixture
+def mock_async_model_provider(mocker: MockerFixture) -> MagicMock:
+    mock = mocker.MagicMock()
+    mock.predict = AsyncMock(return_value=MagicMock(predictions=[123456.78, 234567.89]))
+    return mock
+
+
+@pytest.fixture
+def price_prediction_request() -> PricePredictionRequest:
+    return PricePredictionRequest(
+        id=1,
+        ms_sub_class=20,
+        ms_zoning='RL',
+        lot_area=8450,
+        street='Pave',
+        lot_shape='Reg',
+        land_contour='Lvl',
+        utilities='AllPub',
+        lot_config='Inside',
+        land_slope='Gtl',
+        neighborhood='CollgCr',
+        condition_1='Norm',
+        condition_2='Norm',
+        bldg_type='1Fam',
+        house_style='2Story',
+        overall_qual=7,
+        overall_cond=5,
+        year_built=2003,
+        year_remod_add=2003,
+        roof_style='Gable',
+        roof_matl='CompShg',
+        exterior_1st='VinylSd',
+        exterior_2nd='VinylSd',
+        exter_qual='Gd',
+        exter_cond='TA',
+        foundation='PConc',
+        bsmt_fin_sf_1=706,
+        bsmt_fin_sf_2=0,
+        bsmt_unf_sf=150,
+        total_bsmt_sf=856,
+        heating='GasA',
+        heating_qc='Ex',
+        central_air='Y',
+        first_flr_sf=856,
+        second_flr_sf=854,
+        low_qual_fin_sf=0,
+        gr_liv_area=1710,
+        bsmt_full_bath=1,
+        bsmt_half_bath=0,
+        full_bath=2,
+        half_bath=1,
+        bedroom_abv_gr=3,
+        kitchen_abv_gr=1,
+        kitchen_qual='Gd',
+        tot_rms_abv_grd=8,
+        functional='Typ',
+        fireplaces=0,
+        garage_cars=2,
+        garage_area=548,
+        paved_drive='Y',
+        wood_deck_sf=0,
+        open_porch_sf=61,
+        enclosed_porch=0,
+        three_ssn_porch=0,
+        screen_porch=0,
+        pool_area=0,
+        misc_val=0,
+        mo_sold=2,
+        yr_sold=2008,
+        sale_type='WD',
+        sale_condition='Normal',
+    )
+
+
 def test_predict_price_success(mock_model_provider: MagicMock) -> None:
     """Test the predict_price method of the PricingService class."""
     # GIVEN
@@ -386,3 +464,241 @@ def test_predict_price_batch_no_predictions(mock_model_provider: MagicMock) -> N
     with pytest.raises(ValueError, match='No predictions returned from the model.'):
         service.predict_price_batch(batch_req)
     mock_model_provider.predict.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_async_predict_price_success(
+    mock_async_model_provider: MagicMock, price_prediction_request: PricePredictionRequest
+) -> None:
+    """Test the predict_price method of the AsyncPricingService class."""
+    # GIVEN
+    service = AsyncPricingService(mock_async_model_provider)
+
+    # WHEN
+    result = await service.predict_price(price_prediction_request)
+
+    # THEN
+    assert isinstance(result, PricePrediction)
+    assert result.id == 1
+    assert result.predicted_price == 123456.78
+    mock_async_model_provider.predict.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_async_predict_price_no_prediction(
+    mock_async_model_provider: MagicMock, price_prediction_request: PricePredictionRequest
+) -> None:
+    """Test the async predict_price method when no predictions are returned."""
+    # GIVEN
+    service = AsyncPricingService(mock_async_model_provider)
+    mock_async_model_provider.predict.return_value = MagicMock(predictions=[])
+
+    # WHEN / THEN
+    with pytest.raises(ValueError, match='No predictions returned from the model.'):
+        await service.predict_price(price_prediction_request)
+
+
+@pytest.mark.asyncio
+async def test_async_predict_price_batch_success(
+    mock_async_model_provider: MagicMock, price_prediction_request: PricePredictionRequest
+) -> None:
+    """Test the predict_price_batch method of the AsyncPricingService class."""
+    # GIVEN
+    service = AsyncPricingService(mock_async_model_provider)
+    second_request = price_prediction_request.model_copy(update={'id': 2})
+    batch_req = PricePredictionBatchRequest(data=[price_prediction_request, second_request])
+
+    # WHEN
+    result = await service.predict_price_batch(batch_req)
+
+    # THEN
+    assert [(pred.id, pred.predicted_price) for pred in result] == [(1, 123456.78), (2, 234567.89)]
+    mock_async_model_provider.predict.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_async_predict_price_batch_no_predictions(
+    mock_async_model_provider: MagicMock, price_prediction_request: PricePredictionRequest
+) -> None:
+    """Test the async predict_price_batch method when no predictions are returned."""
+    # GIVEN
+    service = AsyncPricingService(mock_async_model_provider)
+    mock_async_model_provider.predict.return_value = MagicMock(predictions=[])
+    batch_req = PricePredictionBatchRequest(data=[price_prediction_request])
+
+    # WHEN / THEN
+    with pytest.raises(ValueError, match='No predictions returned from the model.'):
+        await service.predict_price_batch(batch_req)
+
+
+@pytest.mark.asyncio
+async def test_async_predict_price_columnar_success(
+    mock_async_model_provider: MagicMock, price_prediction_request: PricePredictionRequest
+) -> None:
+    """Test the predict_price_columnar method maps predictions to the Id column."""
+    # GIVEN
+    service = AsyncPricingService(mock_async_model_provider)
+    input_data = DataFrameSplit.from_views(
+        [price_prediction_request.model_copy(update={'id': 7}), price_prediction_request]
+    )
+
+    # WHEN
+    result = await service.predict_price_columnar(input_data)
+
+    # THEN
+    assert [(pred.id, pred.predicted_price) for pred in result] == [(7, 123456.78), (1, 234567.89)]
+    mock_async_model_provider.predict.assert_awaited_once_with(input_data)
+
+
+@pytest.mark.asyncio
+async def test_async_predict_price_uses_micro_batcher(
+    mock_async_model_provider: MagicMock, price_prediction_request: PricePredictionRequest
+) -> None:
+    """Test the async predict_price method routes single predictions through the micro-batcher when enabled."""
+    # GIVEN
+    micro_batcher = MagicMock()
+    micro_batcher.submit = AsyncMock(return_value=345678.9)
+    service = AsyncPricingService(mock_async_model_provider, micro_batcher)
+
+    # WHEN
+    result = await service.predict_price(price_prediction_request)
+
+    # THEN
+    assert result.id == 1
+    assert result.predicted_price == 345678.9
+    micro_batcher.submit.assert_awaited_once_with(DataFrameSplit.from_views([price_prediction_request]))
+    mock_async_model_provider.predict.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_async_predict_price_cache_hit(
+    mock_async_model_provider: MagicMock, price_prediction_request: PricePredictionRequest
+) -> None:
+    """Test a repeated single prediction with new id is answered from the prediction cache."""
+    # GIVEN
+    service = AsyncPricingService(mock_async_model_provider, prediction_cache=PredictionCache())
+    await service.predict_price(price_prediction_request)
+
+    # WHEN
+    result = await service.predict_price(price_prediction_request.model_copy(update={'id': 2}))
+
+    # THEN
+    assert result.id == 2
+    assert result.predicted_price == 123456.78
+    mock_async_model_provider.predict.assert_awaited_once()
+    assert (service.prediction_cache.hits, service.prediction_cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_async_predict_price_reports_cache_status(
+    mock_async_model_provider: MagicMock, price_prediction_request: PricePredictionRequest, mocker: MockerFixture
+) -> None:
+    """Test whether a prediction was answered from the prediction cache is reported in the Server-Timing header."""
+    # GIVEN
+    timing = ServerTiming()
+    mocker.patch('service.pricing_service.current_server_timing', return_value=timing)
+    service = AsyncPricingService(mock_async_model_provider, prediction_cache=PredictionCache())
+
+    # WHEN
+    await service.predict_price(price_prediction_request)
+    first_status = timing.cache
+    await service.predict_price(price_prediction_request.model_copy(update={'id': 2}))
+
+    # THEN
+    assert first_status == 'miss'
+    assert timing.cache == 'hit'
+
+
+@pytest.mark.asyncio
+async def test_async_predict_price_batch_only_scores_misses(
+    mock_async_model_provider: MagicMock, price_prediction_request: PricePredictionRequest
+) -> None:
+    """Test only the rows missing from the prediction cache are sent to the model, once per distinct row."""
+    # GIVEN
+    cache = PredictionCache()
+    service = AsyncPricingService(mock_async_model_provider, prediction_cache=cache)
+    mock_async_model_provider.predict.return_value = MagicMock(predictions=[111111.11])
+    await service.predict_price(price_prediction_request)
+    other_request = price_prediction_request.model_copy(update={'id': 3, 'lot_area': 9600})
+    batch_req = PricePredictionBatchRequest(
+        data=[
+            price_prediction_request.model_copy(update={'id': 2}),
+            other_request,
+            other_request.model_copy(update={'id': 4}),
+        ]
+    )
+    mock_async_model_provider.predict.return_value = MagicMock(predictions=[222222.22])
+
+    # WHEN
+    result = await service.predict_price_batch(batch_req)
+
+    # THEN
+    assert [(pred.id, pred.predicted_price) for pred in result] == [(2, 111111.11), (3, 222222.22), (4, 222222.22)]
+    sent = mock_async_model_provider.predict.await_args.args[0]
+    assert sent == DataFrameSplit.from_views([other_request])
+
+
+@pytest.mark.asyncio
+async def test_async_predict_price_batch_cache_invalidated_on_model_version_change(
+    mock_async_model_provider: MagicMock, price_prediction_request: PricePredictionRequest
+) -> None:
+    """Test cached predictions are not reused once the model version changes."""
+    # GIVEN
+    mock_async_model_provider.model_version = '1'
+    service = AsyncPricingService(mock_async_model_provider, prediction_cache=PredictionCache())
+    await service.predict_price(price_prediction_request)
+
+    # WHEN
+    mock_async_model_provider.model_version = '2'
+    await service.predict_price(price_prediction_request)
+
+    # THEN
+    assert mock_async_model_provider.predict.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_async_predict_price_batch_fans_out_chunks(price_prediction_request: PricePredictionRequest) -> None:
+    """Test large batches are split into chunks scored with bounded parallelism and reassembled in order."""
+    # GIVEN
+    in_flight = 0
+    max_in_flight = 0
+
+    async def predict(chunk: DataFrameSplit) -> MagicMock:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return MagicMock(predictions=[float(row[0]) for row in chunk.data])
+
+    provider = MagicMock()
+    provider.predict = AsyncMock(side_effect=predict)
+    service = AsyncPricingService(provider, batch_chunk_size=2, batch_max_concurrency=2)
+    batch_req = PricePredictionBatchRequest(
+        data=[price_prediction_request.model_copy(update={'id': id}) for id in range(1, 8)]
+    )
+
+    # WHEN
+    result = await service.predict_price_batch(batch_req)
+
+    # THEN
+    assert [(pred.id, pred.predicted_price) for pred in result] == [(id, float(id)) for id in range(1, 8)]
+    assert provider.predict.await_count == 4
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_async_predict_price_batch_chunk_missing_predictions(
+    mock_async_model_provider: MagicMock, price_prediction_request: PricePredictionRequest
+) -> None:
+    """Test a chunk returning fewer predictions than rows fails the whole batch."""
+    # GIVEN
+    mock_async_model_provider.predict.return_value = MagicMock(predictions=[123456.78])
+    service = AsyncPricingService(mock_async_model_provider, batch_chunk_size=2, batch_max_concurrency=2)
+    batch_req = PricePredictionBatchRequest(
+        data=[price_prediction_request.model_copy(update={'id': id}) for id in range(1, 4)]
+    )
+
+    # WHEN / THEN
+    with pytest.raises(ValueError, match='No predictions returned from the model.'):
+        await service.predict_price_batch(batch_req)
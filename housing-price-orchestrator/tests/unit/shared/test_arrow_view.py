@@ -0,0 +1,51 @@
+import pyarrow as pa
+import pytest
+
+from shared.dto.price_prediction import PricePrediction
+from shared.view.arrow_view import (
+    ARROW_STREAM_MEDIA_TYPE,
+    PARQUET_MEDIA_TYPE,
+    PREDICTION_SCHEMA,
+    read_table,
+    table_media_type,
+    to_prediction_table,
+    write_table,
+)
+
+
+@pytest.mark.parametrize(
+    'header, expected',
+    [
+        (None, None),
+        ('application/json', None),
+        ('application/vnd.apache.arrow.stream', ARROW_STREAM_MEDIA_TYPE),
+        ('text/html, application/vnd.apache.parquet;q=0.9', PARQUET_MEDIA_TYPE),
+    ],
+)
+def test_table_media_type(header: str | None, expected: str | None) -> None:
+    """Test table formats are found in Content-Type and Accept headers."""
+    # WHEN / THEN
+    assert table_media_type(header) == expected
+
+
+@pytest.mark.parametrize('media_type', [ARROW_STREAM_MEDIA_TYPE, PARQUET_MEDIA_TYPE])
+def test_write_and_read_table(media_type: str) -> None:
+    """Test prediction tables survive a round trip through both formats."""
+    # GIVEN
+    table = to_prediction_table(
+        [PricePrediction(id=1, predicted_price=1.5), PricePrediction(id=2, predicted_price=2.5)]
+    )
+
+    # WHEN
+    result = read_table(write_table(table, media_type), media_type)
+
+    # THEN
+    assert result.schema == PREDICTION_SCHEMA
+    assert result.to_pydict() == {'id': [1, 2], 'predictedPrice': [1.5, 2.5]}
+
+
+def test_read_table_invalid() -> None:
+    """Test invalid bodies raise an ArrowInvalid error."""
+    # WHEN / THEN
+    with pytest.raises(pa.ArrowInvalid):
+        read_table(b'not a table', ARROW_STREAM_MEDIA_TYPE)
@@ -0,0 +1,170 @@
+import pyarrow as pa
+from pydantic import ValidationError
+import pytest
+
+from shared.view.columnar_view import validate_columns
+from shared.view.mlflow_view import DataFrameSplit
+from shared.view.request_view import PricePredictionBatchRequest, PricePredictionRequest
+
+RECORD = {
+    'id': 1,
+    'ms_sub_class': 20,
+    'ms_zoning': 'RL',
+    'lot_area': 8450,
+    'street': 'Pave',
+    'lot_shape': 'Reg',
+    'land_contour': 'Lvl',
+    'utilities': 'AllPub',
+    'lot_config': 'Inside',
+    'land_slope': 'Gtl',
+    'neighborhood': 'CollgCr',
+    'condition_1': 'Norm',
+    'condition_2': 'Norm',
+    'bldg_type': '1Fam',
+    'house_style': '2Story',
+    'overall_qual': 7,
+    'overall_cond': 5,
+    'year_built': 2003,
+    'year_remod_add': 2003,
+    'roof_style': 'Gable',
+    'roof_matl': 'CompShg',
+    'exterior_1st': 'VinylSd',
+    'exterior_2nd': 'VinylSd',
+    'exter_qual': 'Gd',
+    'exter_cond': 'TA',
+    'foundation': 'PConc',
+    'bsmt_fin_sf_1': 706,
+    'bsmt_fin_sf_2': 0,
+    'bsmt_unf_sf': 150,
+    'total_bsmt_sf': 856,
+    'heating': 'GasA',
+    'heating_qc': 'Ex',
+    'central_air': 'Y',
+    'first_flr_sf': 856,
+    'second_flr_sf': 854,
+    'low_qual_fin_sf': 0,
+    'gr_liv_area': 1710,
+    'bsmt_full_bath': 1,
+    'bsmt_half_bath': 0,
+    'full_bath': 2,
+    'half_bath': 1,
+    'bedroom_abv_gr': 3,
+    'kitchen_abv_gr': 1,
+    'kitchen_qual': 'Gd',
+    'tot_rms_abv_grd': 8,
+    'functional': 'Typ',
+    'fireplaces': 0,
+    'garage_cars': 2,
+    'garage_area': 548,
+    'paved_drive': 'Y',
+    'wood_deck_sf': 0,
+    'open_porch_sf': 61,
+    'enclosed_porch': 0,
+    'three_ssn_porch': 0,
+    'screen_porch': 0,
+    'pool_area': 0,
+    'misc_val': 0,
+    'mo_sold': 2,
+    'yr_sold': 2008,
+    'sale_type': 'WD',
+    'sale_condition': 'Normal',
+}
+
+
+def _columns(*records: dict) -> dict[str, list]:
+    return {name: [record.get(name) for record in records] for name in PricePredictionRequest.model_fields}
+
+
+def test_validate_columns_matches_views() -> None:
+    """Test valid columns produce the same model input as a batch of views."""
+    # GIVEN
+    records = [RECORD, {**RECORD, 'id': 2, 'lot_frontage': 65.0, 'overall_qual': 9}]
+
+    # WHEN
+    input_data = validate_columns(_columns(*records))
+
+    # THEN
+    expected = DataFrameSplit.from_views(PricePredictionBatchRequest.model_validate({'data': records}).data)
+    assert input_data.table is not None
+    assert input_data.columns == expected.columns
+    assert [list(row) for row in input_data.data] == [list(row) for row in expected.data]
+    assert input_data.to_json_bytes() == expected.to_json_bytes()
+
+
+def test_validate_columns_arrow_and_aliases() -> None:
+    """Test Arrow arrays keyed by serialization aliases are accepted and converted like views would."""
+    # GIVEN
+    columns = {
+        PricePredictionRequest.model_fields[name].serialization_alias: pa.array(values)
+        for name, values in _columns(RECORD, {**RECORD, 'id': 2}).items()
+    }
+    columns['YearBuilt'] = pa.array([2003.0, 1999.0])
+    columns['Neighborhood'] = pa.array(['CollgCr', 'NAmes']).dictionary_encode()
+
+    # WHEN
+    input_data = validate_columns(columns)
+
+    # THEN
+    row = dict(zip(input_data.columns, input_data.data[1]))
+    assert row['Id'] == 2
+    assert row['YearBuilt'] == 1999 and isinstance(row['YearBuilt'], int)
+    assert row['Neighborhood'] == 'NAmes'
+    assert row['LotFrontage'] is None
+
+
+def test_validate_columns_errors_match_views() -> None:
+    """Test invalid rows are reported with the same errors as a batch of views."""
+    # GIVEN
+    records = [
+        RECORD,
+        {**RECORD, 'id': 2, 'overall_qual': 42},
+        {**RECORD, 'id': 3, 'ms_zoning': 'X', 'garage_yr_blt': 2.5},
+        {**RECORD, 'id': 4, 'lot_area': None},
+    ]
+    with pytest.raises(ValidationError) as expected:
+        PricePredictionBatchRequest.model_validate({'data': records})
+
+    # WHEN / THEN
+    with pytest.raises(ValidationError) as e:
+        validate_columns(_columns(*records))
+    assert e.value.errors(include_url=False) == expected.value.errors(include_url=False)
+
+
+def test_validate_columns_lenient_conversions() -> None:
+    """Test columns of mixed types fall back to the view's lenient conversions."""
+    # GIVEN
+    columns = _columns(RECORD, {**RECORD, 'id': 2})
+    columns['overall_qual'] = ['7', 8]
+
+    # WHEN
+    input_data = validate_columns(columns)
+
+    # THEN
+    index = input_data.columns.index('OverallQual')
+    assert [row[index] for row in input_data.data] == [7, 8]
+
+
+def test_validate_columns_different_lengths() -> None:
+    """Test columns of different lengths are rejected."""
+    # GIVEN
+    columns = _columns(RECORD)
+    columns['id'] = [1, 2]
+
+    # WHEN / THEN
+    with pytest.raises(ValidationError) as e:
+        validate_columns(columns)
+    assert e.value.errors(include_url=False)[0]['type'] == 'column_length'
+
+
+def test_validate_columns_integer_overflow() -> None:
+    """Test integers too large for the model's 64-bit integers are rejected instead of failing the cast."""
+    # GIVEN
+    columns = _columns(RECORD, {**RECORD, 'id': 2})
+    columns['id'] = pa.array([1, 2**64 - 1], pa.uint64())
+
+    # WHEN / THEN
+    with pytest.raises(ValidationError) as e:
+        validate_columns(columns)
+    assert [(error['type'], error['loc']) for error in e.value.errors(include_url=False)] == [
+        ('int64_range', ('data', 1, 'id'))
+    ]
@@ -0,0 +1,118 @@
+from typing import Optional
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+import pytest
+
+from shared.instrumentation import (
+    ServerTiming,
+    ServerTimingMiddleware,
+    observe_stage_since_request_started,
+    time_stage,
+    track_model_call,
+)
+
+
+def _sample(name: str, **labels: str) -> float:
+    value: Optional[float] = REGISTRY.get_sample_value(name, labels)
+    return value or 0.0
+
+
+def test_time_stage_observes_duration() -> None:
+    """Test a timed stage is recorded in the stage histogram."""
+    # GIVEN
+    count = _sample('orchestrator_stage_duration_seconds_count', stage='encode')
+
+    # WHEN
+    with time_stage('encode'):
+        pass
+
+    # THEN
+    assert _sample('orchestrator_stage_duration_seconds_count', stage='encode') == count + 1
+
+
+def test_time_stage_counts_errors() -> None:
+    """Test an error raised by a stage is counted by type and still timed."""
+    # GIVEN
+    count = _sample('orchestrator_stage_duration_seconds_count', stage='decode')
+    errors = _sample('orchestrator_stage_errors_total', stage='decode', error='ValueError')
+
+    # WHEN
+    with pytest.raises(ValueError):
+        with time_stage('decode'):
+            raise ValueError('bad response')
+
+    # THEN
+    assert _sample('orchestrator_stage_duration_seconds_count', stage='decode') == count + 1
+    assert _sample('orchestrator_stage_errors_total', stage='decode', error='ValueError') == errors + 1
+
+
+def test_observe_stage_since_request_started_outside_request() -> None:
+    """Test nothing is recorded for a stage observed outside of a request."""
+    # GIVEN
+    count = _sample('orchestrator_stage_duration_seconds_count', stage='validation')
+
+    # WHEN
+    observe_stage_since_request_started('validation')
+
+    # THEN
+    assert _sample('orchestrator_stage_duration_seconds_count', stage='validation') == count
+
+
+def test_track_model_call() -> None:
+    """Test a model call is counted as in flight until it returns and its rows are recorded."""
+    # GIVEN
+    rows = _sample('orchestrator_model_call_rows_sum')
+
+    # WHEN
+    with track_model_call(25):
+        in_flight = _sample('orchestrator_model_calls_in_flight')
+
+    # THEN
+    assert in_flight == 1
+    assert _sample('orchestrator_model_calls_in_flight') == 0
+    assert _sample('orchestrator_model_call_rows_sum') == rows + 25
+
+
+def test_server_timing_header_merges_concurrent_runs() -> None:
+    """Test concurrent runs of a stage are reported for the wall time they cover."""
+    # GIVEN
+    timing = ServerTiming()
+    timing.record('model_input', 0.0, 0.001)
+    timing.record('model', 0.001, 0.004)
+    timing.record('model', 0.002, 0.005)
+    timing.record('model', 0.006, 0.007)
+    timing.cache = 'partial'
+
+    # WHEN
+    header = timing.header(0.008)
+
+    # THEN
+    assert header == 'model_input;dur=1.000, model;dur=5.000, cache;desc=partial, total;dur=8.000'
+
+
+def test_server_timing_middleware() -> None:
+    """Test responses carry a Server-Timing header only when their request ran a timed stage."""
+    # GIVEN
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+
+    @app.get('/timed')
+    async def timed() -> dict[str, str]:
+        with time_stage('response'):
+            return {}
+
+    @app.get('/untimed')
+    async def untimed() -> dict[str, str]:
+        return {}
+
+    client = TestClient(app)
+
+    # WHEN
+    timed_response = client.get('/timed')
+    untimed_response = client.get('/untimed')
+
+    # THEN
+    metrics = [metric.split(';')[0] for metric in timed_response.headers['Server-Timing'].split(', ')]
+    assert metrics == ['response', 'total']
+    assert 'Server-Timing' not in untimed_response.headers
@@ -0,0 +1,149 @@
+import json
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from shared.view.mlflow_view import DataFrameSplit
+from shared.view.request_view import PricePredictionRequest
+
+
+def _price_prediction_request(id: int) -> PricePredictionRequest:
+    return PricePredictionRequest(
+        id=id,
+        ms_sub_class=20,
+        ms_zoning='RL',
+        lot_area=8450,
+        street='Pave',
+        lot_shape='Reg',
+        land_contour='Lvl',
+        utilities='AllPub',
+        lot_config='Inside',
+        land_slope='Gtl',
+        neighborhood='CollgCr',
+        condition_1='Norm',
+        condition_2='Norm',
+        bldg_type='1Fam',
+        house_style='2Story',
+        overall_qual=7,
+        overall_cond=5,
+        year_built=2003,
+        year_remod_add=2003,
+        roof_style='Gable',
+        roof_matl='CompShg',
+        exterior_1st='VinylSd',
+        exterior_2nd='VinylSd',
+        exter_qual='Gd',
+        exter_cond='TA',
+        foundation='PConc',
+        bsmt_fin_sf_1=706,
+        bsmt_fin_sf_2=0,
+        bsmt_unf_sf=150,
+        total_bsmt_sf=856,
+        heating='GasA',
+        heating_qc='Ex',
+        central_air='Y',
+        first_flr_sf=856,
+        second_flr_sf=854,
+        low_qual_fin_sf=0,
+        gr_liv_area=1710,
+        bsmt_full_bath=1,
+        bsmt_half_bath=0,
+        full_bath=2,
+        half_bath=1,
+        bedroom_abv_gr=3,
+        kitchen_abv_gr=1,
+        kitchen_qual='Gd',
+        tot_rms_abv_grd=8,
+        functional='Typ',
+        fireplaces=0,
+        garage_cars=2,
+        garage_area=548,
+        paved_drive='Y',
+        wood_deck_sf=0,
+        open_porch_sf=61,
+        enclosed_porch=0,
+        three_ssn_porch=0,
+        screen_porch=0,
+        pool_area=0,
+        misc_val=0,
+        mo_sold=2,
+        yr_sold=2008,
+        sale_type='WD',
+        sale_condition='Normal',
+    )
+
+
+def test_from_views_matches_model_dump() -> None:
+    """Test rows built from views match the aliased model_dump the model input used to be built from."""
+    # GIVEN
+    requests = [_price_prediction_request(1), _price_prediction_request(2)]
+
+    # WHEN
+    result = DataFrameSplit.from_views(requests)
+
+    # THEN
+    expected = [req.model_dump(by_alias=True) for req in requests]
+    assert result.columns == list(expected[0])
+    assert [dict(zip(result.columns, row)) for row in result.data] == expected
+    assert len(result) == 2
+
+
+def test_from_views_empty() -> None:
+    """Test an empty list of views yields an empty DataFrameSplit."""
+    # WHEN
+    result = DataFrameSplit.from_views([])
+
+    # THEN
+    assert result == DataFrameSplit(columns=[], data=[])
+
+
+def test_from_frame_replaces_missing_values() -> None:
+    """Test missing DataFrame values are encoded as null."""
+    # GIVEN
+    df = pd.DataFrame({'a': [1, 2], 'b': [1.5, np.nan], 'c': ['x', None]})
+
+    # WHEN
+    result = DataFrameSplit.from_frame(df)
+
+    # THEN
+    assert json.loads(result.to_json_bytes()) == {
+        'dataframe_split': {'columns': ['a', 'b', 'c'], 'data': [[1, 1.5, 'x'], [2, None, None]]}
+    }
+
+
+def test_to_json_bytes_matches_pandas_split_payload() -> None:
+    """Test the encoded body carries the same columns and data as the pandas based encoding it replaces."""
+    # GIVEN
+    requests = [_price_prediction_request(1)]
+    df = pd.DataFrame([req.model_dump(by_alias=True) for req in requests])
+
+    # WHEN
+    result = json.loads(DataFrameSplit.from_views(requests).to_json_bytes())
+
+    # THEN
+    expected = json.loads(df.to_json(orient='split'))
+    assert result['dataframe_split']['columns'] == expected['columns']
+    assert result['dataframe_split']['data'] == expected['data']
+
+
+def test_from_table_encodes_columns_like_rows() -> None:
+    """Test an input built from an Arrow table is encoded a column at a time into the same body as its rows."""
+    # GIVEN
+    table = pa.table(
+        {
+            'a': [1, None, 3],
+            'b': [65.0, None, 1e-7],
+            'c': ['x"y\\z\n', 'Pave', None],
+            'd': pa.array(['RL', 'RM', 'RL']).dictionary_encode(),
+            'e': pa.nulls(3),
+        }
+    )
+
+    # WHEN
+    result = DataFrameSplit.from_table(table)
+
+    # THEN
+    rows = DataFrameSplit(columns=result.columns, data=list(result.data))
+    assert json.loads(result.to_json_bytes()) == json.loads(rows.to_json_bytes())
+    assert result.data[1:].table.num_rows == 2
+    assert result.data[2] == (3, 1e-7, None, 'RL', None)
@@ -0,0 +1,36 @@
+from typing import AsyncIterator
+import pytest
+
+from shared.view.ndjson_view import NDJSONLineTooLongError, iter_ndjson_lines, to_ndjson_line
+from shared.view.response_view import PricePredictionResponseView
+
+
+async def _chunks(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_lines_across_chunks() -> None:
+    """Test lines split across chunks are reassembled and blank lines are skipped."""
+    # WHEN
+    lines = [line async for line in iter_ndjson_lines(_chunks(b'{"a":', b'1}\n\n{"a"', b':2}'), max_line_bytes=100)]
+
+    # THEN
+    assert lines == [(1, b'{"a":1}'), (3, b'{"a":2}')]
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_lines_too_long() -> None:
+    """Test a line longer than the maximum is rejected before it is fully buffered."""
+    # WHEN / THEN
+    with pytest.raises(NDJSONLineTooLongError, match='Line 2'):
+        async for _ in iter_ndjson_lines(_chunks(b'{}\n', b'x' * 8, b'x' * 8), max_line_bytes=10):
+            pass
+
+
+def test_to_ndjson_line() -> None:
+    """Test views are encoded with their aliases and dictionaries as compact JSON."""
+    # WHEN / THEN
+    assert to_ndjson_line(PricePredictionResponseView(id=1, predicted_price=2.5)) == b'{"id":1,"predictedPrice":2.5}\n'
+    assert to_ndjson_line({'line': 1, 'detail': 'x'}) == b'{"line":1,"detail":"x"}\n'
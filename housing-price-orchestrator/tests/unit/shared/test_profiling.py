@@ -0,0 +1,114 @@
+import asyncio
+import json
+import logging
+import threading
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from shared.instrumentation import observe_request_rows, time_stage
+from shared.profiling import ProfilerBusyError, RequestProfilingMiddleware, SamplingProfiler
+
+
+def _busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.mark.asyncio
+async def test_profile_returns_folded_stacks() -> None:
+    """Test a profile only keeps the stacks running code from the included paths, in the folded format."""
+    # GIVEN
+    profiler = SamplingProfiler(interval_seconds=0.001, include_paths=[__file__])
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_loop, args=(stop,))
+    worker.start()
+
+    # WHEN
+    try:
+        folded = await profiler.profile(seconds=0.1)
+    finally:
+        stop.set()
+        worker.join()
+
+    # THEN
+    stacks = dict(line.rsplit(' ', 1) for line in folded.splitlines())
+    assert any(stack.endswith('_busy_loop (test_profiling.py:13)') for stack in stacks)
+    assert all('(test_profiling.py:' in stack and int(count) > 0 for stack, count in stacks.items())
+    assert not profiler.running
+
+
+@pytest.mark.asyncio
+async def test_profile_stops_after_requests() -> None:
+    """Test a profile stops once the requested number of requests finished, and only one profile runs at a time."""
+    # GIVEN
+    profiler = SamplingProfiler(include_paths=[__file__])
+    task = asyncio.create_task(profiler.profile(seconds=10, requests=2))
+    await asyncio.sleep(0)
+
+    # WHEN
+    with pytest.raises(ProfilerBusyError):
+        await profiler.profile(seconds=1)
+    profiler.request_finished()
+    profiler.request_finished()
+
+    # THEN
+    assert await asyncio.wait_for(task, 1) == ''
+
+
+@pytest.mark.asyncio
+async def test_middleware_counts_prediction_requests() -> None:
+    """Test only requests that ran a prediction count towards the profiled requests."""
+    # GIVEN
+    profiler = SamplingProfiler(include_paths=[__file__])
+    app = FastAPI()
+    app.add_middleware(RequestProfilingMiddleware, profiler=profiler)
+
+    @app.get('/predict')
+    async def predict() -> dict[str, str]:
+        observe_request_rows(1)
+        return {}
+
+    @app.get('/health')
+    async def health() -> dict[str, str]:
+        return {}
+
+    task = asyncio.create_task(profiler.profile(seconds=10, requests=1))
+    await asyncio.sleep(0)
+
+    # WHEN
+    await asyncio.to_thread(TestClient(app).get, '/health')
+    health_done = task.done()
+    await asyncio.to_thread(TestClient(app).get, '/predict')
+
+    # THEN
+    assert not health_done
+    assert await asyncio.wait_for(task, 1) == ''
+
+
+def test_middleware_logs_slow_requests(caplog: pytest.LogCaptureFixture) -> None:
+    """Test a slow request is logged with its stage timings and the shape of its payload."""
+    # GIVEN
+    app = FastAPI()
+    app.add_middleware(RequestProfilingMiddleware, slow_request_seconds=0)
+
+    @app.post('/predict')
+    async def predict(body: list[int]) -> dict[str, str]:
+        observe_request_rows(len(body))
+        with time_stage('model'):
+            pass
+        return {}
+
+    client = TestClient(app)
+
+    # WHEN
+    with caplog.at_level(logging.WARNING, logger='shared.profiling'):
+        client.post('/predict', json=[1, 2, 3])
+
+    # THEN
+    (message,) = [record.getMessage() for record in caplog.records]
+    logged = json.loads(message.removeprefix('Slow request: '))
+    assert logged['route'] == '/predict'
+    assert logged['status'] == 200
+    assert list(logged['stages_ms']) == ['model']
+    assert logged['payload'] == {'content_type': 'application/json', 'bytes': 7, 'rows': 3}
@@ -0,0 +1,170 @@
+from typing import Iterator
+import json
+import pathlib
+from fastapi.testclient import TestClient
+import httpx
+import pytest
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from pytest_mock import MockerFixture
+from unittest.mock import MagicMock
+
+from main import app
+from provider.mlflow_model_provider import AsyncMLFlowModelProvider
+from provider.v2_model_provider import AsyncV2GrpcModelProvider
+from shared.config.config_loader import TracingSettings
+from shared.instrumentation import time_stage
+from shared.tracing import TRACER_NAME, _build_exporter, configure_tracing, inject_trace_context, tracer
+from shared.view.mlflow_view import DataFrameSplit
+from v2_stub_server import start_grpc_server
+
+TRACE_ID = '0af7651916cd43dd8448eb211c80319c'
+PARENT_SPAN_ID = 'b7ad6b7169203331'
+
+
+@pytest.fixture(scope='module')
+def tracing() -> Iterator[tuple[TracerProvider, InMemorySpanExporter]]:
+    exporter = InMemorySpanExporter()
+    provider = configure_tracing(TracingSettings(enabled=True, sample_ratio=1.0), exporter)
+    assert provider is not None
+    yield provider, exporter
+    provider.shutdown()
+
+
+def _orchestrator_spans(exporter: InMemorySpanExporter) -> list[ReadableSpan]:
+    return [span for span in exporter.get_finished_spans() if span.instrumentation_scope.name == TRACER_NAME]
+
+
+@pytest.fixture
+def spans(tracing: tuple[TracerProvider, InMemorySpanExporter]) -> Iterator[InMemorySpanExporter]:
+    provider, exporter = tracing
+    exporter.clear()
+    yield exporter
+    provider.force_flush()
+
+
+def test_configure_tracing_disabled() -> None:
+    """Test no tracer provider is installed when tracing is disabled."""
+    # WHEN
+    provider = configure_tracing(TracingSettings())
+
+    # THEN
+    assert provider is None
+
+
+def test_file_exporter_requires_file_path() -> None:
+    """Test the file exporter cannot be configured without a file path."""
+    with pytest.raises(ValueError):
+        TracingSettings(exporter='file')
+
+
+def test_file_exporter_closes_file_on_shutdown(tmp_path: pathlib.Path) -> None:
+    """Test the file exporter writes one span per line and closes its file when its tracer provider shuts down."""
+    # GIVEN
+    file_path = tmp_path / 'spans.jsonl'
+    exporter = _build_exporter(TracingSettings(enabled=True, exporter='file', file_path=str(file_path)))
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    provider.get_tracer('test').start_span('span').end()
+
+    # WHEN
+    provider.shutdown()
+
+    # THEN
+    assert exporter.out.closed
+    assert [json.loads(line)['name'] for line in file_path.read_text().splitlines()] == ['span']
+
+
+def test_request_span_continues_caller_trace(
+    tracing: tuple[TracerProvider, InMemorySpanExporter], spans: InMemorySpanExporter, mocker: MockerFixture
+) -> None:
+    """Test a request opens a server span named after its route, in the trace of the caller."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.health_monitor', MagicMock(healthy=True, checked_at=None))
+
+    # WHEN
+    client.get('/health', headers={'traceparent': f'00-{TRACE_ID}-{PARENT_SPAN_ID}-01'})
+    tracing[0].force_flush()
+
+    # THEN
+    (span,) = _orchestrator_spans(spans)
+    assert span.name == 'GET /health'
+    assert format(span.context.trace_id, '032x') == TRACE_ID
+    assert format(span.parent.span_id, '016x') == PARENT_SPAN_ID
+    assert span.attributes['http.route'] == '/health'
+    assert span.attributes['http.response.status_code'] == 200
+
+
+def test_request_span_follows_caller_sampling(
+    tracing: tuple[TracerProvider, InMemorySpanExporter], spans: InMemorySpanExporter, mocker: MockerFixture
+) -> None:
+    """Test no span is recorded for a request the caller decided not to sample."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.health_monitor', MagicMock(healthy=True, checked_at=None))
+
+    # WHEN
+    client.get('/health', headers={'traceparent': f'00-{TRACE_ID}-{PARENT_SPAN_ID}-00'})
+    tracing[0].force_flush()
+
+    # THEN
+    assert _orchestrator_spans(spans) == []
+
+
+@pytest.mark.asyncio
+async def test_model_call_propagates_trace_context(
+    tracing: tuple[TracerProvider, InMemorySpanExporter], spans: InMemorySpanExporter
+) -> None:
+    """Test the stages of a model call are traced and the trace context is sent to the model server."""
+    # GIVEN
+    sent_headers: dict[str, str] = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent_headers.update(request.headers)
+        return httpx.Response(200, json={'predictions': [1.0]})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), event_hooks={'request': [inject_trace_context]})
+    provider = AsyncMLFlowModelProvider(base_url='http://fake-url', client=client)
+
+    # WHEN
+    with tracer.start_as_current_span('request'):
+        with time_stage('model_input'):
+            pass
+        await provider.predict(DataFrameSplit(columns=['Id'], data=[(1,)]))
+    tracing[0].force_flush()
+
+    # THEN
+    finished = {span.name: span for span in _orchestrator_spans(spans)}
+    assert list(finished) == ['model_input', 'encode', 'model', 'decode', 'request']
+    assert {span.parent.span_id for name, span in finished.items() if name != 'request'} == {
+        finished['request'].context.span_id
+    }
+    model_span = finished['model'].context
+    assert sent_headers['traceparent'].startswith(f'00-{model_span.trace_id:032x}-{model_span.span_id:016x}-')
+
+
+@pytest.mark.asyncio
+async def test_grpc_model_call_traces_stages(
+    tracing: tuple[TracerProvider, InMemorySpanExporter], spans: InMemorySpanExporter
+) -> None:
+    """Test the encoding and decoding of gRPC model calls are traced as stages, like those of REST model calls."""
+    # GIVEN
+    server, port = await start_grpc_server()
+    provider = AsyncV2GrpcModelProvider(f'127.0.0.1:{port}', 'mlflow-model')
+
+    # WHEN
+    try:
+        with tracer.start_as_current_span('request'):
+            with time_stage('model_input'):
+                pass
+            await provider.predict(DataFrameSplit(columns=['Id', 'LotArea'], data=[(1, 100)]))
+    finally:
+        await provider.close()
+        await server.stop(grace=None)
+    tracing[0].force_flush()
+
+    # THEN
+    finished = {span.name: span for span in _orchestrator_spans(spans)}
+    assert list(finished) == ['model_input', 'encode', 'model', 'decode', 'request']
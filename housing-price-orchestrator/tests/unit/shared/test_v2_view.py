@@ -0,0 +1,86 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from shared.exceptions import UnsupportedInputError
+from shared.view.mlflow_view import DataFrameSplit
+from shared.view.request_view import PricePredictionRequest
+from shared.view.v2_view import V2Tensor, to_v2_tensors, v2_datatypes
+
+
+def test_v2_datatypes() -> None:
+    """Test column datatypes are derived from the view fields, with optional integers sent as floats."""
+    # WHEN
+    datatypes = v2_datatypes(PricePredictionRequest)
+
+    # THEN
+    assert datatypes['Id'] == 'INT64'
+    assert datatypes['LotFrontage'] == 'FP64'
+    assert datatypes['GarageYrBlt'] == 'FP64'
+    assert datatypes['MSZoning'] == 'BYTES'
+    assert datatypes['BsmtQual'] == 'BYTES'
+
+
+def test_to_v2_tensors() -> None:
+    """Test rows are converted to one tensor per column, with missing numbers as NaN and missing strings as nulls."""
+    # GIVEN
+    input_data = DataFrameSplit(columns=['a', 'b', 'c', 'd'], data=[[1, 1.5, 'x', 2], [2, None, None, None]])
+
+    # WHEN
+    tensors = to_v2_tensors(input_data, {'d': 'FP64'})
+
+    # THEN
+    assert [(tensor.name, tensor.datatype) for tensor in tensors] == [
+        ('a', 'INT64'),
+        ('b', 'FP64'),
+        ('c', 'BYTES'),
+        ('d', 'FP64'),
+    ]
+    assert tensors[1].to_json() == [1.5, None]
+    assert tensors[2].to_json() == ['x', None]
+    assert tensors[2].has_nulls
+    assert np.isnan(tensors[3].values[1])
+
+
+def test_to_v2_tensors_from_table() -> None:
+    """Test an input built from an Arrow table is converted to the same tensors as its rows."""
+    # GIVEN
+    input_data = DataFrameSplit.from_table(
+        pa.table({'a': [1, 2], 'b': [1.5, None], 'c': ['x', None], 'd': pa.array([2, None], pa.int64())})
+    )
+    rows = DataFrameSplit(columns=input_data.columns, data=list(input_data.data))
+
+    # WHEN
+    tensors = to_v2_tensors(input_data, {'d': 'FP64'})
+
+    # THEN
+    expected = to_v2_tensors(rows, {'d': 'FP64'})
+    assert [(tensor.name, tensor.datatype, tensor.to_json()) for tensor in tensors] == [
+        (tensor.name, tensor.datatype, tensor.to_json()) for tensor in expected
+    ]
+    assert tensors[1].to_raw() == expected[1].to_raw()
+
+
+def test_v2_tensor_raw_round_trip() -> None:
+    """Test tensors survive a round trip through the raw binary format."""
+    # GIVEN
+    numbers = V2Tensor(name='a', datatype='FP64', values=np.array([1.5, np.nan]))
+    strings = V2Tensor(name='b', datatype='BYTES', values=np.array([b'x', b'', b'yz'], dtype=object))
+
+    # WHEN
+    decoded_numbers = V2Tensor.from_raw('a', 'FP64', numbers.to_raw())
+    decoded_strings = V2Tensor.from_raw('b', 'BYTES', strings.to_raw())
+
+    # THEN
+    assert decoded_numbers.to_json() == [1.5, None]
+    assert decoded_strings.to_json() == ['x', '', 'yz']
+
+
+def test_v2_tensor_raw_rejects_missing_strings() -> None:
+    """Test missing strings are not sent as raw binary data, where they would be read as empty strings."""
+    # GIVEN
+    strings = V2Tensor(name='MSZoning', datatype='BYTES', values=np.array([b'RL', None], dtype=object))
+
+    # WHEN / THEN
+    with pytest.raises(UnsupportedInputError):
+        strings.to_raw()
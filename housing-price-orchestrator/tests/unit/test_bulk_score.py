@@ -0,0 +1,93 @@
+import json
+import pathlib
+from unittest.mock import MagicMock
+from pytest_mock import MockerFixture
+
+from bulk_score import main
+
+RECORD = {
+    'id': 1,
+    'ms_sub_class': 20,
+    'ms_zoning': 'RL',
+    'lot_area': 8450,
+    'street': 'Pave',
+    'lot_shape': 'Reg',
+    'land_contour': 'Lvl',
+    'utilities': 'AllPub',
+    'lot_config': 'Inside',
+    'land_slope': 'Gtl',
+    'neighborhood': 'CollgCr',
+    'condition_1': 'Norm',
+    'condition_2': 'Norm',
+    'bldg_type': '1Fam',
+    'house_style': '2Story',
+    'overall_qual': 7,
+    'overall_cond': 5,
+    'year_built': 2003,
+    'year_remod_add': 2003,
+    'roof_style': 'Gable',
+    'roof_matl': 'CompShg',
+    'exterior_1st': 'VinylSd',
+    'exterior_2nd': 'VinylSd',
+    'exter_qual': 'Gd',
+    'exter_cond': 'TA',
+    'foundation': 'PConc',
+    'bsmt_fin_sf_1': 706,
+    'bsmt_fin_sf_2': 0,
+    'bsmt_unf_sf': 150,
+    'total_bsmt_sf': 856,
+    'heating': 'GasA',
+    'heating_qc': 'Ex',
+    'central_air': 'Y',
+    'first_flr_sf': 856,
+    'second_flr_sf': 854,
+    'low_qual_fin_sf': 0,
+    'gr_liv_area': 1710,
+    'bsmt_full_bath': 1,
+    'bsmt_half_bath': 0,
+    'full_bath': 2,
+    'half_bath': 1,
+    'bedroom_abv_gr': 3,
+    'kitchen_abv_gr': 1,
+    'kitchen_qual': 'Gd',
+    'tot_rms_abv_grd': 8,
+    'functional': 'Typ',
+    'fireplaces': 0,
+    'garage_cars': 2,
+    'garage_area': 548,
+    'paved_drive': 'Y',
+    'wood_deck_sf': 0,
+    'open_porch_sf': 61,
+    'enclosed_porch': 0,
+    'three_ssn_porch': 0,
+    'screen_porch': 0,
+    'pool_area': 0,
+    'misc_val': 0,
+    'mo_sold': 2,
+    'yr_sold': 2008,
+    'sale_type': 'WD',
+    'sale_condition': 'Normal',
+}
+
+
+def test_main_scores_file(tmp_path: pathlib.Path, mocker: MockerFixture) -> None:
+    """Test the bulk scoring command scores an input file and writes the predictions."""
+    # GIVEN
+    input_path = tmp_path / 'records.jsonl'
+    input_path.write_text('\n'.join(json.dumps({**RECORD, 'id': id}) for id in (1, 2, 3)))
+    output_path = tmp_path / 'predictions.jsonl'
+    provider = MagicMock()
+    provider.predict.side_effect = lambda data: MagicMock(predictions=[1000.0 * row[0] for row in data.data])
+    mocker.patch('bulk_score.build_pricing_model_provider', return_value=provider)
+
+    # WHEN
+    exit_code = main([str(input_path), str(output_path), '--chunk-size', '2', '--workers', '2'])
+
+    # THEN
+    assert exit_code == 0
+    assert [json.loads(line) for line in output_path.read_text().splitlines()] == [
+        {'id': 1, 'predictedPrice': 1000.0},
+        {'id': 2, 'predictedPrice': 2000.0},
+        {'id': 3, 'predictedPrice': 3000.0},
+    ]
+    assert provider.predict.call_count == 2
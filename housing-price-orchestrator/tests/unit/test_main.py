@@ -1,16 +1,40 @@
+from typing import Any
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
+import httpx
+import json
+import pyarrow as pa
 import pytest
 from pytest_mock import MockerFixture
 
-from main import app
-from service.pricing_service import PricingService
+from main import app, build_http_client, build_http_transport, build_pricing_model_provider
+from provider.circuit_breaker_model_provider import AsyncCircuitBreakerModelProvider, CircuitOpenError
+from provider.hedging_model_provider import AsyncHedgingModelProvider
+from provider.http_client import ConnectionPoolStats
+from provider.in_process_model_provider import AsyncInProcessModelProvider
+from provider.mlflow_model_provider import AsyncMLFlowModelProvider
+from provider.replica_pool_model_provider import AsyncReplicaPoolModelProvider
+from provider.v2_model_provider import AsyncV2GrpcModelProvider, AsyncV2ModelProvider
+from shared.config.config_loader import (
+    CircuitBreakerSettings,
+    HedgingSettings,
+    HttpClientSettings,
+    LoadBalancingSettings,
+    Settings,
+    V2ProtocolSettings,
+)
+from service.concurrency_limiter import AdaptiveConcurrencyLimiter, ConcurrencyLimitExceededError
+from service.pricing_service import AsyncPricingService
+from shared.exceptions import ServiceUnavailableError
+from shared.dto.price_prediction import PricePrediction
+from shared.view.arrow_view import ARROW_STREAM_MEDIA_TYPE, PARQUET_MEDIA_TYPE, read_table, write_table
+from shared.view.request_view import PricePredictionRequest
 
 
 @pytest.fixture
 def mock_pricing_service(mocker: MockerFixture) -> MagicMock:
-    """Mock the PricingService class."""
-    mock = MagicMock(PricingService)
+    """Mock the AsyncPricingService class."""
+    mock = MagicMock(AsyncPricingService)
     mock.predict_price.return_value = MagicMock(id=1, predicted_price=123456.78)
     mock.predict_price_batch.return_value = [
         MagicMock(id=1, predicted_price=123456.78),
@@ -403,3 +427,688 @@ def test_batch_predict_not_found(mock_pricing_service: MagicMock, mocker: Mocker
     # THEN
     assert response.status_code == 404
     assert response.json() == {'detail': 'No results found.'}
+
+
+def test_predict_price_service_unavailable(mock_pricing_service: MagicMock, mocker: MockerFixture) -> None:
+    """Test the /api/v1/price/predict endpoint returns 503 with Retry-After when the service sheds the request."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.pricing_service', mock_pricing_service)
+    mock_pricing_service.predict_price.side_effect = ServiceUnavailableError('Busy.', retry_after=1.5)
+    payload = {
+        'id': 1,
+        'ms_sub_class': 20,
+        'ms_zoning': 'RL',
+        'lot_area': 8450,
+        'street': 'Pave',
+        'lot_shape': 'Reg',
+        'land_contour': 'Lvl',
+        'utilities': 'AllPub',
+        'lot_config': 'Inside',
+        'land_slope': 'Gtl',
+        'neighborhood': 'CollgCr',
+        'condition_1': 'Norm',
+        'condition_2': 'Norm',
+        'bldg_type': '1Fam',
+        'house_style': '2Story',
+        'overall_qual': 7,
+        'overall_cond': 5,
+        'year_built': 2003,
+        'year_remod_add': 2003,
+        'roof_style': 'Gable',
+        'roof_matl': 'CompShg',
+        'exterior_1st': 'VinylSd',
+        'exterior_2nd': 'VinylSd',
+        'exter_qual': 'Gd',
+        'exter_cond': 'TA',
+        'foundation': 'PConc',
+        'bsmt_fin_sf_1': 706,
+        'bsmt_fin_sf_2': 0,
+        'bsmt_unf_sf': 150,
+        'total_bsmt_sf': 856,
+        'heating': 'GasA',
+        'heating_qc': 'Ex',
+        'central_air': 'Y',
+        'first_flr_sf': 856,
+        'second_flr_sf': 854,
+        'low_qual_fin_sf': 0,
+        'gr_liv_area': 1710,
+        'bsmt_full_bath': 1,
+        'bsmt_half_bath': 0,
+        'full_bath': 2,
+        'half_bath': 1,
+        'bedroom_abv_gr': 3,
+        'kitchen_abv_gr': 1,
+        'kitchen_qual': 'Gd',
+        'tot_rms_abv_grd': 8,
+        'functional': 'Typ',
+        'fireplaces': 0,
+        'garage_cars': 2,
+        'garage_area': 548,
+        'paved_drive': 'Y',
+        'wood_deck_sf': 0,
+        'open_porch_sf': 61,
+        'enclosed_porch': 0,
+        'three_ssn_porch': 0,
+        'screen_porch': 0,
+        'pool_area': 0,
+        'misc_val': 0,
+        'mo_sold': 2,
+        'yr_sold': 2008,
+        'sale_type': 'WD',
+        'sale_condition': 'Normal',
+    }
+
+    # WHEN
+    response = client.post('/api/v1/price/predict', json=payload)
+
+    # THEN
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '2'
+    assert response.json() == {'detail': 'Busy.'}
+
+
+def test_health_and_ready_answer_from_last_probe(mocker: MockerFixture) -> None:
+    """Test /health always answers and /ready answers 503 until the model is known to be healthy."""
+    # GIVEN
+    client = TestClient(app)
+    monitor = mocker.patch('main.health_monitor', MagicMock(healthy=False, checked_at=None))
+    mocker.patch('main.http_transport.stats', ConnectionPoolStats(requests=4, reused_connections=3, new_connections=1))
+
+    # WHEN
+    health_response = client.get('/health')
+    unready_response = client.get('/ready')
+    monitor.healthy = True
+    ready_response = client.get('/ready')
+
+    # THEN
+    assert health_response.status_code == 200
+    assert health_response.json() == {
+        'status': 'unavailable',
+        'modelHealthy': False,
+        'checkedAt': None,
+        'circuitState': None,
+        'connectionPool': {
+            'requests': 4,
+            'newConnections': 1,
+            'reusedConnections': 3,
+            'reuseRatio': 0.75,
+            'meanPoolWaitMs': 0.0,
+            'maxPoolWaitMs': 0.0,
+            'poolTimeouts': 0,
+        },
+    }
+    assert unready_response.status_code == 503
+    assert ready_response.status_code == 200
+    assert ready_response.json()['status'] == 'ok'
+
+
+def test_ready_reports_open_circuit(mocker: MockerFixture) -> None:
+    """Test /ready answers 503 while the circuit breaker around the model is open."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.health_monitor', MagicMock(healthy=True, checked_at=None))
+    breaker = MagicMock(AsyncCircuitBreakerModelProvider, state='open')
+    mocker.patch('main.pricing_model_provider', breaker)
+
+    # WHEN
+    response = client.get('/ready')
+
+    # THEN
+    assert response.status_code == 503
+    assert response.json()['circuitState'] == 'open'
+
+
+def test_metrics(mocker: MockerFixture) -> None:
+    """Test /metrics serves the request and stage metrics in the Prometheus text format."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.health_monitor', MagicMock(healthy=True, checked_at=None))
+    client.get('/health')
+
+    # WHEN
+    response = client.get('/metrics')
+
+    # THEN
+    assert response.status_code == 200
+    assert response.headers['Content-Type'].startswith('text/plain')
+    assert 'orchestrator_requests_total{route="/health",status="200"}' in response.text
+    assert 'orchestrator_stage_duration_seconds_bucket' in response.text
+    assert 'orchestrator_model_client_connections_total' in response.text
+
+
+def test_profile_requires_admin_token(mocker: MockerFixture) -> None:
+    """Test the profiling endpoint is hidden while profiling is disabled, and rejects callers without the token."""
+    # GIVEN
+    client = TestClient(app)
+    disabled_response = client.post('/admin/profile')
+    mocker.patch('main.app_settings.profiling.enabled', True)
+    mocker.patch('main.admin_token', 'secret')
+    mocker.patch('main.profiler.profile', AsyncMock(return_value='main;predict 3\n'))
+
+    # WHEN
+    forbidden_response = client.post('/admin/profile', headers={'X-Admin-Token': 'wrong'})
+    response = client.post('/admin/profile?seconds=5&requests=10', headers={'X-Admin-Token': 'secret'})
+
+    # THEN
+    assert disabled_response.status_code == 404
+    assert forbidden_response.status_code == 403
+    assert response.status_code == 200
+    assert response.text == 'main;predict 3\n'
+
+
+def test_build_pricing_model_provider_http() -> None:
+    """Test the HTTP provider is built by default."""
+    # GIVEN
+    settings = Settings(pricing_model_url='http://fake-url')
+
+    # WHEN
+    provider = build_pricing_model_provider(settings, MagicMock())
+
+    # THEN
+    assert isinstance(provider, AsyncMLFlowModelProvider)
+    assert provider.base_url == 'http://fake-url'
+
+
+def test_build_pricing_model_provider_in_process(mocker: MockerFixture) -> None:
+    """Test the in-process provider is built when selected in the settings."""
+    # GIVEN
+    load_model = mocker.patch('provider.in_process_model_provider._load_model', return_value=MagicMock())
+    settings = Settings(
+        pricing_model_url='http://fake-url',
+        pricing_model_provider='in_process',
+        pricing_model_uri='models:/housing-price/1',
+    )
+
+    # WHEN
+    provider = build_pricing_model_provider(settings, MagicMock())
+
+    # THEN
+    assert isinstance(provider, AsyncInProcessModelProvider)
+    load_model.assert_called_once_with('models:/housing-price/1')
+
+
+def test_build_pricing_model_provider_v2() -> None:
+    """Test the V2 providers are built for the configured transport, with datatypes derived from the request view."""
+    # GIVEN
+    grpc_settings = Settings(pricing_model_url='http://fake-url', pricing_model_provider='v2')
+    rest_settings = Settings(
+        pricing_model_url='http://fake-url',
+        pricing_model_provider='v2',
+        v2_protocol=V2ProtocolSettings(transport='rest', binary_data=True),
+    )
+
+    # WHEN
+    grpc_provider = build_pricing_model_provider(grpc_settings, MagicMock())
+    rest_provider = build_pricing_model_provider(rest_settings, MagicMock())
+
+    # THEN
+    assert isinstance(grpc_provider, AsyncV2GrpcModelProvider)
+    assert grpc_provider.target == 'housing-price-model:8081'
+    assert grpc_provider.datatypes['MSZoning'] == 'BYTES'
+    assert isinstance(rest_provider, AsyncV2ModelProvider)
+    assert rest_provider.base_url == 'http://fake-url'
+    assert rest_provider.binary_data is True
+
+
+def test_build_pricing_model_provider_replica_pool() -> None:
+    """Test predictions are balanced across replicas when several model server URLs are configured."""
+    # GIVEN
+    settings = Settings(
+        pricing_model_url=['http://replica-1', 'http://replica-2'],
+        load_balancing=LoadBalancingSettings(max_failures=5),
+    )
+
+    # WHEN
+    provider = build_pricing_model_provider(settings, MagicMock())
+
+    # THEN
+    assert isinstance(provider, AsyncReplicaPoolModelProvider)
+    assert [replica.base_url for replica in provider.available] == ['http://replica-1', 'http://replica-2']
+    assert provider.max_failures == 5
+
+
+def test_build_pricing_model_provider_hedging() -> None:
+    """Test model calls are hedged when enabled in the settings."""
+    # GIVEN
+    settings = Settings(pricing_model_url='http://fake-url', hedging=HedgingSettings(enabled=True, percentile=99))
+
+    # WHEN
+    provider = build_pricing_model_provider(settings, MagicMock())
+
+    # THEN
+    assert isinstance(provider, AsyncHedgingModelProvider)
+    assert isinstance(provider.pricing_model_provider, AsyncMLFlowModelProvider)
+    assert provider.percentile == 99
+
+
+def test_build_pricing_model_provider_circuit_breaker() -> None:
+    """Test the circuit breaker wraps the hedged model calls when both are enabled."""
+    # GIVEN
+    settings = Settings(
+        pricing_model_url='http://fake-url',
+        hedging=HedgingSettings(enabled=True),
+        circuit_breaker=CircuitBreakerSettings(enabled=True, open_seconds=5),
+    )
+
+    # WHEN
+    provider = build_pricing_model_provider(settings, MagicMock())
+
+    # THEN
+    assert isinstance(provider, AsyncCircuitBreakerModelProvider)
+    assert isinstance(provider.pricing_model_provider, AsyncHedgingModelProvider)
+    assert provider.open_seconds == 5
+
+
+def test_build_http_client() -> None:
+    """Test the HTTP client calling the model is configured from the settings."""
+    # GIVEN
+    settings = HttpClientSettings(max_connections=8, max_keepalive_connections=4, read_timeout=30, pool_timeout=None)
+
+    # WHEN
+    transport = build_http_transport(settings)
+    client = build_http_client(settings, transport)
+
+    # THEN
+    assert client.timeout == httpx.Timeout(connect=5.0, read=30.0, write=5.0, pool=None)
+    assert transport._pool._max_connections == 8
+    assert transport._pool._max_keepalive_connections == 4
+
+
+def test_settings_in_process_requires_model_uri() -> None:
+    """Test the in-process provider cannot be selected without a model URI."""
+    # WHEN / THEN
+    with pytest.raises(ValueError, match='pricing_model_uri'):
+        Settings(pricing_model_url='http://fake-url', pricing_model_provider='in_process')
+
+
+STREAM_RECORD = {
+    'id': 1,
+    'ms_sub_class': 20,
+    'ms_zoning': 'RL',
+    'lot_area': 8450,
+    'street': 'Pave',
+    'lot_shape': 'Reg',
+    'land_contour': 'Lvl',
+    'utilities': 'AllPub',
+    'lot_config': 'Inside',
+    'land_slope': 'Gtl',
+    'neighborhood': 'CollgCr',
+    'condition_1': 'Norm',
+    'condition_2': 'Norm',
+    'bldg_type': '1Fam',
+    'house_style': '2Story',
+    'overall_qual': 7,
+    'overall_cond': 5,
+    'year_built': 2003,
+    'year_remod_add': 2003,
+    'roof_style': 'Gable',
+    'roof_matl': 'CompShg',
+    'exterior_1st': 'VinylSd',
+    'exterior_2nd': 'VinylSd',
+    'exter_qual': 'Gd',
+    'exter_cond': 'TA',
+    'foundation': 'PConc',
+    'bsmt_fin_sf_1': 706,
+    'bsmt_fin_sf_2': 0,
+    'bsmt_unf_sf': 150,
+    'total_bsmt_sf': 856,
+    'heating': 'GasA',
+    'heating_qc': 'Ex',
+    'central_air': 'Y',
+    'first_flr_sf': 856,
+    'second_flr_sf': 854,
+    'low_qual_fin_sf': 0,
+    'gr_liv_area': 1710,
+    'bsmt_full_bath': 1,
+    'bsmt_half_bath': 0,
+    'full_bath': 2,
+    'half_bath': 1,
+    'bedroom_abv_gr': 3,
+    'kitchen_abv_gr': 1,
+    'kitchen_qual': 'Gd',
+    'tot_rms_abv_grd': 8,
+    'functional': 'Typ',
+    'fireplaces': 0,
+    'garage_cars': 2,
+    'garage_area': 548,
+    'paved_drive': 'Y',
+    'wood_deck_sf': 0,
+    'open_porch_sf': 61,
+    'enclosed_porch': 0,
+    'three_ssn_porch': 0,
+    'screen_porch': 0,
+    'pool_area': 0,
+    'misc_val': 0,
+    'mo_sold': 2,
+    'yr_sold': 2008,
+    'sale_type': 'WD',
+    'sale_condition': 'Normal',
+}
+
+
+def test_stream_predict_success(mock_pricing_service: MagicMock, mocker: MockerFixture) -> None:
+    """Test the /api/v1/price/predict/stream endpoint streams one prediction per valid line and inline errors."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.pricing_service', mock_pricing_service)
+    mock_pricing_service.predict_price_batch.side_effect = lambda batch: [
+        PricePrediction(id=req.id, predicted_price=1000.0 * req.id) for req in batch.data
+    ]
+    lines = [
+        json.dumps({**STREAM_RECORD, 'id': 1}),
+        json.dumps({**STREAM_RECORD, 'id': 2, 'overall_qual': 42}),
+        json.dumps({**STREAM_RECORD, 'id': 3}),
+    ]
+
+    # WHEN
+    response = client.post(
+        '/api/v1/price/predict/stream',
+        content='\n'.join(lines).encode(),
+        headers={'Content-Type': 'application/x-ndjson'},
+    )
+
+    # THEN
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    outputs = [json.loads(line) for line in response.text.splitlines()]
+    assert outputs[0]['line'] == 2
+    assert outputs[0]['detail'][0]['loc'] == ['overall_qual']
+    assert outputs[1:] == [{'id': 1, 'predictedPrice': 1000.0}, {'id': 3, 'predictedPrice': 3000.0}]
+
+
+def test_stream_predict_not_found(mock_pricing_service: MagicMock, mocker: MockerFixture) -> None:
+    """Test the /api/v1/price/predict/stream endpoint reports chunks the model could not score inline."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.pricing_service', mock_pricing_service)
+    mock_pricing_service.predict_price_batch.side_effect = ValueError('No results found.')
+
+    # WHEN
+    response = client.post(
+        '/api/v1/price/predict/stream',
+        content=json.dumps(STREAM_RECORD).encode(),
+        headers={'Content-Type': 'application/x-ndjson'},
+    )
+
+    # THEN
+    assert response.status_code == 200
+    assert [json.loads(line) for line in response.text.splitlines()] == [{'line': 1, 'detail': 'No results found.'}]
+
+
+def test_stream_predict_shed(mock_pricing_service: MagicMock, mocker: MockerFixture) -> None:
+    """Test the /api/v1/price/predict/stream endpoint reports chunks shed by the concurrency limiter inline."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.pricing_service', mock_pricing_service)
+    mock_pricing_service.predict_price_batch.side_effect = ConcurrencyLimitExceededError('Busy.')
+
+    # WHEN
+    response = client.post(
+        '/api/v1/price/predict/stream',
+        content=json.dumps(STREAM_RECORD).encode(),
+        headers={'Content-Type': 'application/x-ndjson'},
+    )
+
+    # THEN
+    assert response.status_code == 200
+    assert [json.loads(line) for line in response.text.splitlines()] == [{'line': 1, 'detail': 'Busy.'}]
+
+
+@pytest.mark.parametrize(
+    'error, detail',
+    [
+        (CircuitOpenError('Circuit open.', 30.0), 'Circuit open.'),
+        (
+            httpx.ConnectError('Connection refused.'),
+            'The pricing model failed to score these lines, please retry later.',
+        ),
+    ],
+)
+def test_stream_predict_model_unavailable(
+    mock_pricing_service: MagicMock, mocker: MockerFixture, error: Exception, detail: str
+) -> None:
+    """Test the /api/v1/price/predict/stream endpoint reports chunks rejected by an open circuit, or failing to reach
+    the model, inline instead of ending the stream with an empty body."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.pricing_service', mock_pricing_service)
+    mock_pricing_service.predict_price_batch.side_effect = error
+
+    # WHEN
+    response = client.post(
+        '/api/v1/price/predict/stream',
+        content=json.dumps(STREAM_RECORD).encode(),
+        headers={'Content-Type': 'application/x-ndjson'},
+    )
+
+    # THEN
+    assert response.status_code == 200
+    assert [json.loads(line) for line in response.text.splitlines()] == [{'line': 1, 'detail': detail}]
+
+
+def test_stream_predict_model_error_mid_stream(mock_pricing_service: MagicMock, mocker: MockerFixture) -> None:
+    """Test the /api/v1/price/predict/stream endpoint reports a chunk failing with an error of a non-HTTP model, e.g.
+    a gRPC or in-process one, inline after the chunks already streamed."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.pricing_service', mock_pricing_service)
+    mocker.patch('main.app_settings.streaming.chunk_size', 1)
+    mock_pricing_service.predict_price_batch.side_effect = [
+        [PricePrediction(id=1, predicted_price=1.0)],
+        RuntimeError('StatusCode.UNAVAILABLE: failed to connect to all addresses'),
+    ]
+    lines = [json.dumps(STREAM_RECORD | {'id': id}) for id in (1, 2)]
+
+    # WHEN
+    response = client.post(
+        '/api/v1/price/predict/stream',
+        content='\n'.join(lines).encode(),
+        headers={'Content-Type': 'application/x-ndjson'},
+    )
+
+    # THEN
+    assert response.status_code == 200
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {'id': 1, 'predictedPrice': 1.0},
+        {'line': 2, 'detail': 'The pricing model failed to score these lines, please retry later.'},
+    ]
+
+
+def test_columnar_predict_limits_concurrency(mock_pricing_service: MagicMock, mocker: MockerFixture) -> None:
+    """Test the /api/v1/price/predict/columnar endpoint holds a slot of the concurrency limiter while predicting, and
+    answers 503 once the limit and its queue are full."""
+    # GIVEN
+    client = TestClient(app)
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1, max_queue_size=0)
+    mocker.patch('main.pricing_service', mock_pricing_service)
+    mocker.patch('main.concurrency_limiter', limiter)
+    in_flight: list[int] = []
+
+    async def predict_price_columnar(input_data: Any) -> list[PricePrediction]:
+        in_flight.append(limiter.in_flight)
+        return [PricePrediction(id=1, predicted_price=1.0)]
+
+    mock_pricing_service.predict_price_columnar.side_effect = predict_price_columnar
+    columns = {key: [value] for key, value in STREAM_RECORD.items()}
+
+    # WHEN
+    admitted = client.post('/api/v1/price/predict/columnar', json=columns)
+    limiter._in_flight = 1
+    shed = client.post('/api/v1/price/predict/columnar', json=columns)
+
+    # THEN
+    assert admitted.status_code == 200
+    assert in_flight == [1]
+    assert shed.status_code == 503
+    assert limiter.shed == 1
+
+
+def test_columnar_predict_success(mock_pricing_service: MagicMock, mocker: MockerFixture) -> None:
+    """Test the /api/v1/price/predict/columnar endpoint for a successful prediction."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.pricing_service', mock_pricing_service)
+    mock_pricing_service.predict_price_columnar.return_value = mock_pricing_service.predict_price_batch.return_value
+    columns = {key: [value, value] for key, value in STREAM_RECORD.items()}
+    columns['id'] = [1, 2]
+
+    # WHEN
+    response = client.post('/api/v1/price/predict/columnar', json=columns)
+
+    # THEN
+    assert response.status_code == 200
+    assert response.json() == {
+        'predictions': [{'id': 1, 'predictedPrice': 123456.78}, {'id': 2, 'predictedPrice': 234567.89}]
+    }
+    input_data = mock_pricing_service.predict_price_columnar.call_args.args[0]
+    assert len(input_data) == 2
+    assert input_data.columns[0] == 'Id'
+
+
+def test_columnar_predict_invalid(mock_pricing_service: MagicMock, mocker: MockerFixture) -> None:
+    """Test the /api/v1/price/predict/columnar endpoint reports invalid rows like the batch endpoint."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.pricing_service', mock_pricing_service)
+    columns = {key: [value, value] for key, value in STREAM_RECORD.items()}
+    columns['overall_qual'] = [7, 42]
+
+    # WHEN
+    response = client.post('/api/v1/price/predict/columnar', json=columns)
+
+    # THEN
+    assert response.status_code == 422
+    assert response.json()['detail'][0]['loc'] == ['body', 'data', 1, 'overall_qual']
+    mock_pricing_service.predict_price_columnar.assert_not_called()
+
+
+def test_columnar_predict_integer_overflow(mock_pricing_service: MagicMock, mocker: MockerFixture) -> None:
+    """Test the /api/v1/price/predict/columnar endpoint answers 422 to integers too large for the model."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.pricing_service', mock_pricing_service)
+    columns = {key: [value, value] for key, value in STREAM_RECORD.items()}
+    columns['id'] = [1, 2**64 - 1]
+
+    # WHEN
+    response = client.post('/api/v1/price/predict/columnar', json=columns)
+
+    # THEN
+    assert response.status_code == 422
+    assert response.json()['detail'][0]['loc'] == ['body', 'data', 1, 'id']
+    mock_pricing_service.predict_price_columnar.assert_not_called()
+
+
+def _record_table(*ids: int) -> pa.Table:
+    return pa.table(
+        {
+            PricePredictionRequest.model_fields[name].serialization_alias: [
+                id if name == 'id' else STREAM_RECORD.get(name) for id in ids
+            ]
+            for name in PricePredictionRequest.model_fields
+        }
+    )
+
+
+def test_batch_predict_arrow(mock_pricing_service: MagicMock, mocker: MockerFixture) -> None:
+    """Test the /api/v1/price/predict/batch endpoint with an Arrow IPC stream body and response."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.pricing_service', mock_pricing_service)
+    mock_pricing_service.predict_price_columnar.return_value = mock_pricing_service.predict_price_batch.return_value
+
+    # WHEN
+    response = client.post(
+        '/api/v1/price/predict/batch',
+        content=write_table(_record_table(1, 2), ARROW_STREAM_MEDIA_TYPE),
+        headers={'Content-Type': ARROW_STREAM_MEDIA_TYPE, 'Accept': ARROW_STREAM_MEDIA_TYPE},
+    )
+
+    # THEN
+    assert response.status_code == 200
+    assert response.headers['content-type'] == ARROW_STREAM_MEDIA_TYPE
+    assert read_table(response.content, ARROW_STREAM_MEDIA_TYPE).to_pydict() == {
+        'id': [1, 2],
+        'predictedPrice': [123456.78, 234567.89],
+    }
+    input_data = mock_pricing_service.predict_price_columnar.call_args.args[0]
+    assert [row[0] for row in input_data.data] == [1, 2]
+    mock_pricing_service.predict_price_batch.assert_not_called()
+
+
+def test_batch_predict_parquet_json_response(mock_pricing_service: MagicMock, mocker: MockerFixture) -> None:
+    """Test the /api/v1/price/predict/batch endpoint with a Parquet body and a JSON response."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.pricing_service', mock_pricing_service)
+    mock_pricing_service.predict_price_columnar.return_value = mock_pricing_service.predict_price_batch.return_value
+
+    # WHEN
+    response = client.post(
+        '/api/v1/price/predict/batch',
+        content=write_table(_record_table(1, 2), PARQUET_MEDIA_TYPE),
+        headers={'Content-Type': PARQUET_MEDIA_TYPE},
+    )
+
+    # THEN
+    assert response.status_code == 200
+    assert response.json() == {
+        'predictions': [{'id': 1, 'predictedPrice': 123456.78}, {'id': 2, 'predictedPrice': 234567.89}]
+    }
+
+
+def test_batch_predict_arrow_invalid(mock_pricing_service: MagicMock, mocker: MockerFixture) -> None:
+    """Test the /api/v1/price/predict/batch endpoint rejects invalid tables and table bodies."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.pricing_service', mock_pricing_service)
+    table = _record_table(1, 2)
+    table = table.set_column(table.column_names.index('OverallQual'), 'OverallQual', pa.array([7, 42]))
+    headers = {'Content-Type': ARROW_STREAM_MEDIA_TYPE}
+
+    # WHEN
+    invalid_row = client.post(
+        '/api/v1/price/predict/batch', content=write_table(table, ARROW_STREAM_MEDIA_TYPE), headers=headers
+    )
+    invalid_body = client.post('/api/v1/price/predict/batch', content=b'not a table', headers=headers)
+
+    # THEN
+    assert invalid_row.status_code == 422
+    assert invalid_row.json()['detail'][0]['loc'] == ['body', 'data', 1, 'overall_qual']
+    assert invalid_body.status_code == 400
+    mock_pricing_service.predict_price_columnar.assert_not_called()
+
+
+def test_batch_predict_arrow_type_error(mock_pricing_service: MagicMock, mocker: MockerFixture) -> None:
+    """Test the /api/v1/price/predict/batch endpoint answers 400 to tables whose columns Arrow cannot convert."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.pricing_service', mock_pricing_service)
+    mocker.patch('main.validate_columns', side_effect=pa.ArrowTypeError('Unsupported cast from struct to int64'))
+
+    # WHEN
+    response = client.post(
+        '/api/v1/price/predict/batch',
+        content=write_table(_record_table(1, 2), ARROW_STREAM_MEDIA_TYPE),
+        headers={'Content-Type': ARROW_STREAM_MEDIA_TYPE},
+    )
+
+    # THEN
+    assert response.status_code == 400
+    assert response.json()['detail'].endswith('Unsupported cast from struct to int64')
+    mock_pricing_service.predict_price_columnar.assert_not_called()
+
+
+def test_batch_predict_invalid_json(mock_pricing_service: MagicMock, mocker: MockerFixture) -> None:
+    """Test the /api/v1/price/predict/batch endpoint reports JSON validation errors in the body."""
+    # GIVEN
+    client = TestClient(app)
+    mocker.patch('main.pricing_service', mock_pricing_service)
+
+    # WHEN
+    response = client.post('/api/v1/price/predict/batch', json={'data': [{**STREAM_RECORD, 'overall_qual': 42}]})
+
+    # THEN
+    assert response.status_code == 422
+    assert response.json()['detail'][0]['loc'] == ['body', 'data', 0, 'overall_qual']
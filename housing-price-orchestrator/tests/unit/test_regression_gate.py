@@ -0,0 +1,83 @@
+import pathlib
+import pytest
+from pytest_mock import MockerFixture
+
+from regression_gate import ScenarioResult, compare, main, mann_whitney_p_value, read_baseline, write_baseline
+
+
+def test_compare_flags_significant_slowdowns_of_the_median_above_the_baseline_noise() -> None:
+    """Test a scenario only regresses when its median round is slower than the baseline one beyond the baseline spread
+    and its rounds are significantly slower."""
+    # GIVEN
+    baseline = [
+        ScenarioResult('predict_price', 1, [1.0, 0.9, 1.1, 1.0, 1.0]),
+        ScenarioResult('predict_price_batch', 100, [1.0, 0.9, 1.1, 1.0, 1.0]),
+        ScenarioResult('mlflow_provider', 100, [1.0, 0.9, 1.1, 1.0, 1.0]),
+        ScenarioResult('mlflow_provider', 1000, [1.0, 0.9, 1.1, 1.0, 1.0]),
+    ]
+    current = [
+        ScenarioResult('predict_price', 1, [1.4, 1.5, 1.4, 1.45, 1.4]),
+        ScenarioResult('predict_price_batch', 100, [1.0, 1.0, 3.0, 3.0, 1.1]),
+        ScenarioResult('mlflow_provider', 100, [1.15, 1.15, 1.15, 1.15, 1.15]),
+        ScenarioResult('mlflow_provider', 1000, [0.9, 1.3, 1.3, 1.3, 0.9]),
+        ScenarioResult('mlflow_provider', 10000, [9.0, 9.0, 9.0, 9.0, 9.0]),
+    ]
+
+    # WHEN
+    comparisons = compare(baseline, current, min_effect=0.1, alpha=0.01)
+
+    # THEN
+    assert [(comparison.name, comparison.rows, comparison.regressed) for comparison in comparisons] == [
+        ('predict_price', 1, True),
+        ('predict_price_batch', 100, False),
+        ('mlflow_provider', 100, False),
+        ('mlflow_provider', 1000, False),
+    ]
+    assert comparisons[0].threshold == pytest.approx(0.2)
+
+
+def test_mann_whitney_p_value() -> None:
+    """Test the exact p-value is the share of orderings of the rounds at least as slow as the observed one."""
+    # GIVEN
+    baseline = [1.0, 3.0, 5.0]
+
+    # WHEN
+    p_values = [
+        mann_whitney_p_value(baseline, [6.0, 7.0, 8.0]),
+        mann_whitney_p_value(baseline, [2.0, 4.0, 6.0]),
+        mann_whitney_p_value(baseline, [1.0, 3.0, 5.0]),
+        mann_whitney_p_value(baseline, [0.0, 0.5, 0.7]),
+    ]
+
+    # THEN
+    assert p_values == pytest.approx([1 / 20, 7 / 20, 0.5, 1.0])
+
+
+def test_baseline_round_trip(tmp_path: pathlib.Path) -> None:
+    """Test the round medians of every scenario are read back from a baseline file."""
+    # GIVEN
+    baseline = tmp_path / 'baseline.json'
+    results = [ScenarioResult('predict_price', 10, [1.5, 1.25, 2.0])]
+
+    # WHEN
+    write_baseline(baseline, results)
+
+    # THEN
+    assert read_baseline(baseline) == results
+
+
+def test_check_exits_with_error_on_regression(tmp_path: pathlib.Path, mocker: MockerFixture) -> None:
+    """Test the check command returns 1 when a scenario regressed against the stored baseline."""
+    # GIVEN
+    baseline = tmp_path / 'baseline.json'
+    write_baseline(baseline, [ScenarioResult('predict_price_batch', 100, [1.0, 1.1, 1.0, 0.9, 1.0])])
+    mocker.patch(
+        'regression_gate.run_with_stub_server',
+        return_value=[ScenarioResult('predict_price_batch', 100, [1.5, 1.6, 1.5, 1.4, 1.5])],
+    )
+
+    # WHEN
+    status = main(['check', '--baseline', str(baseline)])
+
+    # THEN
+    assert status == 1